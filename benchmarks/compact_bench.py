@@ -0,0 +1,126 @@
+import argparse
+import logging
+import os
+import pickle
+import statistics
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import fixtures  # noqa: E402
+import streamlit as st  # noqa: E402
+from macro_bot.compute import backtest, indicators  # noqa: E402
+from macro_bot.data import compact, macro_generator  # noqa: E402
+
+# So sánh trước/sau của cách lưu bảng lịch sử dài dùng chung giữa các phiên:
+#   trước: DataFrame float64, trang đọc qua @st.cache_data (băm cả bảng đầu vào, pickle + sao chép mỗi lần trúng)
+#   sau:   CompactFrame (float32, chỉ mục int64, mảng chỉ đọc), @st.cache_resource theo phiên bản dữ liệu,
+#          frame() dựng DataFrame trỏ thẳng vào mảng
+# Đo: bộ nhớ bản chụp, kích thước/thời gian đọc qua bộ nhớ đệm dùng chung giữa worker (pickle),
+# độ trễ một lần trúng cache và bộ nhớ cấp thêm khi nhiều phiên cùng giữ kết quả.
+#   python benchmarks/compact_bench.py --scale 1 10 --sessions 50
+
+logging.getLogger("streamlit").setLevel(logging.ERROR)
+
+
+def best_of(fn, repeat):
+    times = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - started)
+    return min(times), statistics.median(times)
+
+
+def retained(fn, sessions):
+    # Bộ nhớ cấp thêm khi `sessions` phiên cùng giữ kết quả của một lần trúng cache
+    fn()
+    tracemalloc.start()
+    held = [fn() for _ in range(sessions)]
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del held
+    return current
+
+
+def frame_bytes(df):
+    return int(df.memory_usage(index=True, deep=True).sum())
+
+
+def cases(scale):
+    fx = fixtures.load_fixtures(scale)
+    gold = indicators.gold_dxy_frame(fx["closes"])
+    # Trang Vĩ mô VN: cùng số dòng gấp `scale` lần như bộ đo chính
+    macro_freq = "ME" if scale == 1 else f"{max(1, int(24 * 30.44 / scale))}h"
+    macro = macro_generator.generate_macro_frame(start="2005-01-01", end="2026-01-01", freq=macro_freq)
+    return [("gold_dxy.get_advanced_data", gold, True), ("vn_macro.fetch_comprehensive_data", macro, False)]
+
+
+def measure(name, df, with_grid, repeat, sessions):
+    packed = compact.CompactFrame.from_frame(df)
+    version = time.time()
+
+    # Trước: cache_data trả bản sao mỗi lần; trang Gold&DXY còn băm cả bảng để tra lưới backtest
+    @st.cache_data
+    def old_read(data):
+        return data
+
+    @st.cache_data
+    def old_grid(data):
+        return backtest.sweep(data)
+
+    # Sau: một bản dùng chung, khóa theo phiên bản dữ liệu (không băm bảng)
+    @st.cache_resource
+    def new_read(key, _data):
+        return _data
+
+    @st.cache_resource
+    def new_grid(key, _data):
+        return backtest.sweep(_data.frame())
+
+    def old_hit():
+        data = old_read(df)
+        return (old_grid(data), data) if with_grid else data
+
+    def new_hit():
+        data = new_read(version, packed).frame()
+        return (new_grid(version, packed), data) if with_grid else data
+
+    blob_old = pickle.dumps(df, protocol=pickle.HIGHEST_PROTOCOL)
+    blob_new = pickle.dumps(packed, protocol=pickle.HIGHEST_PROTOCOL)
+    rows = [
+        ("bản chụp (KB)", frame_bytes(df) / 1024, packed.nbytes / 1024),
+        ("pickle giữa worker (KB)", len(blob_old) / 1024, len(blob_new) / 1024),
+        ("đọc pickle (ms)", best_of(lambda: pickle.loads(blob_old), repeat)[0] * 1e3,
+         best_of(lambda: pickle.loads(blob_new), repeat)[0] * 1e3),
+        ("trúng cache (ms)", best_of(old_hit, repeat)[0] * 1e3, best_of(new_hit, repeat)[0] * 1e3),
+        (f"{sessions} phiên giữ kết quả (KB)", retained(old_hit, sessions) / 1024,
+         retained(new_hit, sessions) / 1024),
+    ]
+    print(f"\n{name}: {len(df):,} dòng × {len(df.columns)} cột")
+    print(f"  {'':<30}{'trước':>12}{'sau':>12}{'giảm':>8}")
+    for label, before, after in rows:
+        print(f"  {label:<30}{before:>12.2f}{after:>12.2f}{before / after if after else float('inf'):>7.1f}x")
+
+    # Sai số do float32 so với float64 gốc
+    restored = packed.frame()
+    error = ((restored - df).abs() / df.abs().where(df.abs() > 0)).max().max()
+    print(f"  sai số tương đối lớn nhất của float32: {error:.1e}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Trước/sau của cách lưu bảng lịch sử gọn (float32, chỉ đọc)")
+    parser.add_argument("--scale", type=int, nargs="*", default=[1, 10])
+    parser.add_argument("--sessions", type=int, default=50)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args(argv)
+    for scale in args.scale:
+        print(f"\n=== lịch sử {scale}x ===")
+        for name, df, with_grid in cases(scale):
+            measure(name, df, with_grid, args.repeat, args.sessions)
+
+
+if __name__ == "__main__":
+    main()
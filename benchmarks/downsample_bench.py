@@ -0,0 +1,48 @@
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from macro_bot.compute import downsample  # noqa: E402
+
+# So sánh kích thước dữ liệu gửi trình duyệt và thời gian dựng + tuần tự hóa biểu đồ
+# trước/sau khi giảm điểm, trên 50 năm dữ liệu ngày (Vàng, MA200, DXY).
+
+
+def make_history(years=50, seed=0):
+    rng = np.random.default_rng(seed)
+    idx = pd.bdate_range(end=pd.Timestamp.today().normalize(), periods=years * 252)
+    gold = pd.Series(300 * np.exp(np.cumsum(rng.normal(0, 0.01, len(idx)))), index=idx)
+    dxy = pd.Series(100 * np.exp(np.cumsum(rng.normal(0, 0.004, len(idx)))), index=idx)
+    return pd.DataFrame({"Gold": gold, "MA200": gold.rolling(200).mean(), "DXY": dxy})
+
+
+def build_payload(df, reduce):
+    fig = go.Figure()
+    for col in df.columns:
+        series = downsample.downsample(df[col], method=reduce) if reduce else df[col]
+        fig.add_trace(go.Scatter(x=series.index, y=series, name=col))
+    fig.update_layout(xaxis=dict(rangeslider=dict(visible=True)))
+    return fig.to_json()
+
+
+def main(repeat=5):
+    df = make_history()
+    print(f"{'mode':<10}{'points':>10}{'payload KB':>14}{'build+json ms':>16}")
+    for reduce in (None, "lttb", "minmax"):
+        timings = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            payload = build_payload(df, reduce)
+            timings.append(time.perf_counter() - started)
+        points = sum(len(downsample.downsample(df[c], method=reduce)) if reduce else df[c].notna().sum()
+                     for c in df.columns)
+        print(f"{reduce or 'full':<10}{points:>10}{len(payload) / 1024:>14.1f}{min(timings) * 1000:>16.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from macro_bot.view import figures  # noqa: E402
+from matplotlib import _pylab_helpers  # noqa: E402
+
+# Mô phỏng hàng nghìn lần rerun của trang Vàng SJC (view/pages/gold_sjc.py) (kéo thanh trượt lãi suất/lạm phát)
+# và đo bộ nhớ tiến trình (RSS) + số hình matplotlib còn sống. Bộ nhớ phải đi ngang.
+
+DF_HIST = pd.DataFrame({
+    "Năm": [2008, 2011, 2012, 2015, 2020, 2022, 2023, 2024, 2025],
+    "Lạm phát (%)": [19.8, 18.1, 9.2, 0.6, 3.2, 3.1, 3.2, 3.5, 4.0],
+})
+
+
+def rss_mb():
+    with open("/proc/self/status") as f:
+        for line in f:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1]) / 1024
+    return float("nan")
+
+
+def make_series(seed=0):
+    rng = np.random.default_rng(seed)
+    idx = pd.bdate_range("2023-01-01", periods=800)
+    gold = pd.Series(1900 * np.exp(np.cumsum(rng.normal(0, 0.01, len(idx)))), index=idx)
+    stock = pd.Series(4000 * np.exp(np.cumsum(rng.normal(0, 0.01, len(idx)))), index=idx)
+    return gold, stock
+
+
+def rerun(cache, gold, stock, rng):
+    # Người dùng kéo qua lại quanh vùng mặc định, bước 0.1 như trên Dashboard
+    cpi = round(rng.uniform(3.0, 6.0), 1)
+    ir = round(rng.uniform(6.0, 9.0), 1)
+    version = figures.data_version(gold, stock)
+    figures.gold_projection(cache, version, gold, stock, ir - cpi)
+    figures.inflation_history(cache, DF_HIST, cpi)
+
+
+def main(reruns=2000, checkpoint=250):
+    gold, stock = make_series()
+    cache = figures.FigureCache(max_entries=128)
+    rng = np.random.default_rng(1)
+
+    started = time.perf_counter()
+    print(f"{'reruns':>8}{'RSS MB':>12}{'cached imgs':>13}{'live figs':>11}{'hit %':>8}")
+    for i in range(1, reruns + 1):
+        rerun(cache, gold, stock, rng)
+        if i % checkpoint == 0:
+            hit_pct = cache.hits / (cache.hits + cache.misses) * 100
+            print(f"{i:>8}{rss_mb():>12.1f}{len(cache):>13}"
+                  f"{len(_pylab_helpers.Gcf.figs):>11}{hit_pct:>8.1f}", flush=True)
+    print(f"tổng thời gian: {time.perf_counter() - started:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
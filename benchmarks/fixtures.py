@@ -0,0 +1,186 @@
+import argparse
+import gzip
+import hashlib
+import io
+import json
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from macro_bot.config import DATA_DIR  # noqa: E402
+from macro_bot.data import fred_fetcher, sources  # noqa: E402
+
+# Dữ liệu cố định cho bộ đo hiệu năng, không cần mạng. benchmarks/fixtures/ là một bản ghi replay
+# (cùng định dạng MACRO_BOT_SOURCE=replay: prices/<mã>.1d.parquet, fred/<mã>.csv.gz) kèm manifest.json
+# ghi nguồn gốc và mã băm nội dung. Bản trong repo được sinh một lần từ bộ sinh cố định theo seed
+# (python benchmarks/fixtures.py --generate); thay bằng dữ liệu thật từ kho cục bộ MACRO_BOT_DATA_DIR
+# bằng python benchmarks/fixtures.py --record. Thiếu file nào thì dừng hẳn, không đổi nguồn lặng lẽ.
+# Cùng thư mục chạy được Dashboard không mạng: MACRO_BOT_SOURCE=replay MACRO_BOT_REPLAY_DIR=benchmarks/fixtures
+
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+TICKERS = ["GC=F", "^GSPC", "VND=X", "DX-Y.NYB"]
+FRED_IDS = [sid for symbols in fred_fetcher.RATE_SERIES.values() for sid in symbols.values()]
+
+# Dữ liệu giả lập: (giá đầu, biến động ngày) và (ngày bắt đầu, tần suất, mức đầu) của chuỗi FRED
+SYNTHETIC_PRICES = {"GC=F": (300.0, 0.011), "^GSPC": (400.0, 0.012), "VND=X": (11000.0, 0.002),
+                    "DX-Y.NYB": (90.0, 0.005)}
+SYNTHETIC_DAYS = 25 * 252
+SYNTHETIC_RATES = {
+    "DGS10": ("1962-01-02", "B", 4.0), "DGS2": ("1976-06-01", "B", 7.0),
+    "IRLTLT01EZM156N": ("1970-01-01", "MS", 8.0), "IRLTLT01JPM156N": ("1989-01-01", "MS", 5.0),
+    "IRLTLT01GBM156N": ("1960-01-01", "MS", 6.0), "CHNYLD10Y": ("2010-01-01", "MS", 3.5),
+    "IRT3TR01EZM156N": ("1994-01-01", "MS", 5.0), "IR3TIB01JPM156N": ("2002-01-01", "MS", 0.5),
+    "IRT3TR01GBM156N": ("1980-01-01", "MS", 9.0), "CHNRYLD2Y": ("2012-01-01", "MS", 3.0),
+}
+SYNTHETIC_END = "2026-01-01"
+
+
+def synthetic_closes(seed=0):
+    rng = np.random.default_rng(seed)
+    idx = pd.bdate_range(end=SYNTHETIC_END, periods=SYNTHETIC_DAYS)
+    closes = pd.DataFrame(index=idx)
+    for ticker, (start, vol) in SYNTHETIC_PRICES.items():
+        closes[ticker] = start * np.exp(np.cumsum(rng.normal(0.0002, vol, len(idx))))
+        # Các mã nghỉ lễ khác ngày nhau: một ít phiên trống như dữ liệu thật
+        closes.loc[rng.random(len(idx)) < 0.02, ticker] = np.nan
+    return closes
+
+
+def synthetic_rates(seed=0):
+    rng = np.random.default_rng(seed + 1)
+    frames = {}
+    for sid, (start, freq, level) in SYNTHETIC_RATES.items():
+        idx = pd.date_range(start, SYNTHETIC_END, freq=freq)
+        vol = 0.05 if freq == "B" else 0.2
+        values = np.clip(level + np.cumsum(rng.normal(0, vol, len(idx))), -1.0, 20.0)
+        frames[sid] = pd.DataFrame({sid: values}, index=idx.rename("observation_date"))
+    return frames
+
+
+def _digest(fixture_dir):
+    # Mã băm nội dung các file dữ liệu, để kết quả đo chỉ so sánh khi cùng một bộ dữ liệu
+    digest = hashlib.sha256()
+    for folder in ("prices", "fred"):
+        root = os.path.join(fixture_dir, folder)
+        for name in sorted(os.listdir(root)) if os.path.isdir(root) else []:
+            digest.update(name.encode())
+            with open(os.path.join(root, name), "rb") as f:
+                digest.update(f.read())
+    return digest.hexdigest()[:16]
+
+
+def _write_manifest(fixture_dir, origin, **details):
+    manifest = {"origin": origin, **details, "tickers": TICKERS, "fred": FRED_IDS, "digest": _digest(fixture_dir)}
+    with open(os.path.join(fixture_dir, "manifest.json"), "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+    return manifest
+
+
+def read_recorded(fixture_dir=FIXTURE_DIR):
+    manifest_path = os.path.join(fixture_dir, "manifest.json")
+    if not os.path.exists(manifest_path):
+        raise SystemExit(f"Chưa có bộ dữ liệu trong {fixture_dir}: chạy python benchmarks/fixtures.py --record "
+                         "(từ kho cục bộ) hoặc --generate")
+    with open(manifest_path, encoding="utf-8") as f:
+        manifest = json.load(f)
+    source = sources.ReplaySource(fixture_dir)
+    try:
+        closes = pd.DataFrame({ticker: source.history(ticker)["Close"] for ticker in TICKERS})
+        frames = {sid: fred_fetcher.FredFetcher._parse(source.fred_csv(fred_fetcher.FRED_CSV_URL, sid)[1])
+                  for sid in FRED_IDS}
+    except sources.ReplayMiss as error:
+        raise SystemExit(f"Bộ dữ liệu {fixture_dir} không đầy đủ: {error}")
+    return closes, frames, manifest
+
+
+def generate(fixture_dir=FIXTURE_DIR, seed=0):
+    # Ghi dữ liệu giả lập dưới dạng bản ghi replay; chỉ giữ cột Close (cột duy nhất các trang dùng),
+    # làm tròn như dữ liệu thật để file nhỏ
+    store = sources.ReplaySource(fixture_dir).store
+    closes = synthetic_closes(seed).round(2).rename_axis("Date")
+    for ticker in TICKERS:
+        path = store.history_path(ticker, "1d")
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        closes[[ticker]].dropna().set_axis(["Close"], axis=1).to_parquet(path, compression="zstd")
+    for sid, frame in synthetic_rates(seed).items():
+        path = store.fred_path(sid)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # mtime=0: cùng seed cho ra đúng cùng file nén
+        with open(path, "wb") as raw, gzip.GzipFile(fileobj=raw, mode="wb", mtime=0) as f:
+            f.write(frame.round(2).to_csv().encode())
+    manifest = _write_manifest(fixture_dir, "generated", seed=seed, generator="benchmarks/fixtures.py --generate")
+    print(f"Đã sinh {len(closes)} phiên × {len(TICKERS)} mã và {len(FRED_IDS)} chuỗi FRED vào {fixture_dir} "
+          f"({manifest['digest']})")
+
+
+def record(fixture_dir=FIXTURE_DIR, data_dir=None):
+    # Chép dữ liệu từ kho cục bộ (đã tải bởi Dashboard hoặc python -m macro_bot.build), không gọi mạng
+    data_dir = data_dir or DATA_DIR
+    count = sources.import_store(data_dir, fixture_dir)
+    manifest = _write_manifest(fixture_dir, "recorded", data_dir=os.path.abspath(data_dir),
+                               recorded_at=pd.Timestamp.now().isoformat(timespec="seconds"))
+    # Đọc lại ngay để báo thiếu mã/chuỗi nào
+    read_recorded(fixture_dir)
+    print(f"Đã ghi {count} file từ {data_dir} vào {fixture_dir} ({manifest['digest']})")
+
+
+def scale_history(df, factor, log=True):
+    # Kéo dài lịch sử gấp `factor` lần số dòng: lặp lại chuỗi biến động (đã bỏ xu hướng) về phía trước,
+    # neo giá trị cuối như dữ liệu gốc. Giữ nguyên khoảng thời gian và tăng mật độ mốc thời gian,
+    # vì datetime64[ns] không chứa nổi hàng nghìn năm lịch sử.
+    if factor == 1:
+        return df
+    values = df.to_numpy(dtype=float)
+    out = np.full((len(values) * factor, values.shape[1]), np.nan)
+    for col in range(values.shape[1]):
+        valid = ~np.isnan(values[:, col])
+        if valid.sum() < 2:
+            continue
+        level = np.log(values[valid, col]) if log else values[valid, col]
+        steps = np.diff(level)
+        steps = np.concatenate(([0.0], steps - steps.mean()))
+        path = np.cumsum(np.tile(steps, factor))
+        path += level[-1] - path[-1]
+        out[np.tile(valid, factor), col] = np.exp(path) if log else path
+    index = pd.date_range(df.index[0], df.index[-1], periods=len(out)).rename(df.index.name)
+    return pd.DataFrame(out, index=index, columns=df.columns)
+
+
+def load_fixtures(scale=1, fixture_dir=FIXTURE_DIR):
+    closes, frames, manifest = read_recorded(fixture_dir)
+    return {
+        "source": manifest["origin"],
+        "manifest": {"dir": os.path.relpath(os.path.abspath(fixture_dir)), **manifest},
+        "scale": scale,
+        "closes": scale_history(closes, scale),
+        "fred": {sid: scale_history(frame, scale, log=False) for sid, frame in frames.items()},
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Dữ liệu cố định cho bộ đo hiệu năng")
+    parser.add_argument("--record", action="store_true", help="Chép dữ liệu từ kho cục bộ vào thư mục dữ liệu cố định")
+    parser.add_argument("--data-dir", help="Kho cục bộ để chép (mặc định MACRO_BOT_DATA_DIR)")
+    parser.add_argument("--generate", action="store_true", help="Sinh dữ liệu giả lập cố định theo seed")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--fixture-dir", default=FIXTURE_DIR)
+    args = parser.parse_args(argv)
+    if args.record:
+        record(args.fixture_dir, args.data_dir)
+        return
+    if args.generate:
+        generate(args.fixture_dir, args.seed)
+        return
+    fx = load_fixtures(fixture_dir=args.fixture_dir)
+    buf = io.StringIO()
+    fx["closes"].info(buf=buf)
+    print(f"Nguồn: {fx['source']} ({fx['manifest']['digest']})\n{buf.getvalue()}")
+    for sid, frame in fx["fred"].items():
+        print(f"{sid}: {len(frame)} dòng, {frame.index[0]:%Y-%m-%d} → {frame.index[-1]:%Y-%m-%d}")
+
+
+if __name__ == "__main__":
+    main()
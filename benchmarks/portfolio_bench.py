@@ -0,0 +1,99 @@
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import fixtures  # noqa: E402
+from macro_bot.compute import portfolio  # noqa: E402
+
+# Định giá nhiều danh mục trên toàn bộ lịch sử giá cố định (không cần mạng):
+#   trước: lặp từng vị thế, cộng chuỗi giá trị của nó vào tài khoản (cách mở rộng trực tiếp của ô
+#          "Số lượng nắm giữ × giá" ở sidebar Gold&DXY)
+#   sau:   PortfolioEngine.value, một lượt vector hóa cho mọi vị thế
+# In thời gian, kích thước kết quả và sai lệch lớn nhất giữa hai cách.
+#   python benchmarks/portfolio_bench.py --positions 1000 5000 20000 --accounts 100 1000 --years 5 0
+
+
+def synthetic_positions(index, n_positions, n_accounts, years=None, seed=0):
+    # Vị thế ngẫu nhiên trên 4 loại tài sản, ngày vào rải trong `years` năm cuối (0/None: toàn bộ lịch sử)
+    rng = np.random.default_rng(seed)
+    low = 0 if not years else max(0, index.searchsorted(index[-1] - pd.DateOffset(years=years)))
+    assets = rng.choice(portfolio.ASSETS, n_positions)
+    return pd.DataFrame({
+        "account": pd.Series(rng.integers(0, n_accounts, n_positions)).map("TK{:05d}".format),
+        "asset": assets,
+        "amount": rng.uniform(1e6, 1e9, n_positions).round(-3),
+        "entry_date": index[rng.integers(low, len(index), n_positions)],
+        "rate": np.where(assets == portfolio.DEPOSIT, rng.uniform(4, 9, n_positions).round(1), np.nan),
+    })
+
+
+def naive_value(engine, positions, index):
+    # Mỗi vị thế một chuỗi giá trị đầy đủ, cộng dồn vào tài khoản
+    offset = len(engine.index) - len(index)
+    totals = {}
+    for row in positions.itertuples(index=False):
+        entry = engine.index.searchsorted(row.entry_date)
+        if row.asset == portfolio.DEPOSIT:
+            quantity = row.amount
+            series = quantity * (1 + row.rate / 100 * (engine.days - engine.days[entry]) / portfolio.DAYS_PER_YEAR)
+        else:
+            unit = engine.unit_vnd[row.asset]
+            series = row.amount / unit[entry] * unit
+        series = np.where(np.arange(len(engine.index)) >= entry, series, 0.0)[offset:]
+        totals[row.account] = totals.get(row.account, 0.0) + series
+    return pd.DataFrame(totals, index=index)
+
+
+def best_of(fn, repeat):
+    times = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - started)
+    return min(times)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Định giá nhiều danh mục: lặp từng vị thế so với vector hóa")
+    parser.add_argument("--positions", type=int, nargs="+", default=[1000, 5000, 20000])
+    parser.add_argument("--accounts", type=int, nargs="+", default=[100, 1000])
+    parser.add_argument("--years", type=int, nargs="+", default=[5, 0], help="0: toàn bộ lịch sử")
+    parser.add_argument("--scale", type=int, default=1)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--naive-limit", type=int, default=5000, help="Chỉ chạy cách lặp tới số vị thế này")
+    args = parser.parse_args(argv)
+
+    fx = fixtures.load_fixtures(args.scale)
+    closes = fx["closes"]
+    started = time.perf_counter()
+    engine = portfolio.PortfolioEngine(closes)
+    print(f"Giá {len(engine):,} phiên ({engine.index[0]:%Y-%m-%d} → {engine.index[-1]:%Y-%m-%d}), "
+          f"dựng bộ định giá {(time.perf_counter() - started) * 1e3:.1f} ms, dữ liệu: {fx['source']}")
+    print(f"{'vị thế':>8}{'tài khoản':>11}{'năm':>6}{'ô (phiên×TK)':>15}{'lặp (ms)':>11}{'vector (ms)':>13}"
+          f"{'USD (ms)':>10}{'sai lệch':>10}")
+    for years in args.years:
+        for n_accounts in args.accounts:
+            for n_positions in args.positions:
+                positions = synthetic_positions(engine.index, n_positions, n_accounts, years)
+                fast = best_of(lambda: engine.value(positions), args.repeat)
+                fast_usd = best_of(lambda: engine.value(positions, "USD"), args.repeat)
+                result = engine.value(positions)
+                cells = result.value.size
+                naive, error = float("nan"), float("nan")
+                if n_positions <= args.naive_limit:
+                    started = time.perf_counter()
+                    expected = naive_value(engine, positions, result.index)[result.accounts]
+                    naive = time.perf_counter() - started
+                    error = float((np.abs(expected - result.value) / expected.abs().max()).max().max())
+                print(f"{n_positions:>8,}{len(result.accounts):>11,}{years or 'all':>6}{cells:>15,}"
+                      f"{naive * 1e3:>11.0f}{fast * 1e3:>13.0f}{fast_usd * 1e3:>10.0f}{error:>10.1e}")
+
+
+if __name__ == "__main__":
+    main()
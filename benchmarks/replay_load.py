@@ -0,0 +1,91 @@
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Thử tải nhiều phiên Streamlit chạy đồng thời trên dữ liệu phát lại (không cần mạng, lặp lại được theo seed):
+#   python benchmarks/replay_load.py --sessions 32 --latency 0.05 --failures 0.1   (bộ dữ liệu benchmarks/fixtures/)
+#   python -m macro_bot.data.sources --output /tmp/replay     (hoặc ghi lại từ kho cục bộ đã tải)
+#   python benchmarks/replay_load.py --replay-dir /tmp/replay
+# Mỗi lần chạy dùng một kho dữ liệu tạm mới nên lượt đầu luôn phải tải qua nguồn phát lại.
+# Mỗi tiến trình con là một worker (AppTest không chạy song song được trong cùng tiến trình),
+# các worker dùng chung bộ nhớ đệm SQLite như khi triển khai nhiều worker thật.
+
+PAGES = ["app.py", "Gold&DXY Correlation.py", "global_rates_analysis.py", "vietnam_macro_analysis.py"]
+
+
+def run_session(page, timeout):
+    from streamlit.testing.v1 import AppTest
+
+    from macro_bot.data import sources
+
+    source = sources.get_source()
+    calls, failures = source.calls, source.failures
+    started = time.perf_counter()
+    at = AppTest.from_file(os.path.join(ROOT, page), default_timeout=timeout)
+    at.run()
+    elapsed = time.perf_counter() - started
+    # Ngoại lệ chưa bắt và thông báo lỗi của khối except trên trang (st.error cũng dùng cho nhận định)
+    errors = [str(e.value) for e in at.exception] + [e.value for e in at.error if "Lỗi" in e.value]
+    return page, elapsed, errors, source.calls - calls, source.failures - failures
+
+
+def run_worker(pages, timeout):
+    # Một tác vụ cho mỗi worker: AppTest thay module __main__ nên không nhận thêm tác vụ sau phiên đầu
+    return [run_session(page, timeout) for page in pages]
+
+
+def percentile(values, q):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(round(q / 100 * (len(values) - 1))))]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Thử tải các Dashboard trên nguồn dữ liệu phát lại")
+    parser.add_argument("--replay-dir", default=os.path.join(ROOT, "benchmarks", "fixtures"),
+                        help="Bản ghi replay (mặc định bộ dữ liệu cố định benchmarks/fixtures/)")
+    parser.add_argument("--sessions", type=int, default=16, help="Số phiên mỗi trang")
+    parser.add_argument("--concurrency", type=int, default=4, help="Số worker (tiến trình)")
+    parser.add_argument("--latency", type=float, default=0.0, help="Độ trễ giả lập trung bình mỗi lời gọi (giây)")
+    parser.add_argument("--failures", type=float, default=0.0, help="Tỉ lệ lời gọi lỗi giả lập (0..1)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--pages", nargs="*", default=PAGES)
+    parser.add_argument("--timeout", type=float, default=300)
+    args = parser.parse_args(argv)
+
+    # Cấu hình được đọc khi nhập macro_bot: đặt biến môi trường trước khi chạy phiên đầu tiên
+    os.environ.update({
+        "MACRO_BOT_SOURCE": "replay",
+        "MACRO_BOT_REPLAY_DIR": os.path.abspath(args.replay_dir),
+        "MACRO_BOT_REPLAY_LATENCY": str(args.latency),
+        "MACRO_BOT_REPLAY_FAILURES": str(args.failures),
+        "MACRO_BOT_REPLAY_SEED": str(args.seed),
+        "MACRO_BOT_DATA_DIR": tempfile.mkdtemp(prefix="macro_bot_load_"),
+    })
+    sys.path.insert(0, ROOT)
+
+    # Xen kẽ các trang để mọi worker đều gặp đủ loại trang
+    jobs = [page for _ in range(args.sessions) for page in args.pages]
+    started = time.perf_counter()
+    chunks = [jobs[i::args.concurrency] for i in range(args.concurrency)]
+    with ProcessPoolExecutor(max_workers=args.concurrency) as pool:
+        results = [r for chunk in pool.map(run_worker, chunks, [args.timeout] * len(chunks)) for r in chunk]
+    total = time.perf_counter() - started
+
+    print(f"{'page':<28}{'sessions':>9}{'p50 s':>8}{'p95 s':>8}{'max s':>8}{'errors':>8}")
+    for page in args.pages:
+        times = [r[1] for r in results if r[0] == page]
+        failed = sum(1 for r in results if r[0] == page and r[2])
+        print(f"{page:<28}{len(times):>9}{statistics.median(times):>8.2f}{percentile(times, 95):>8.2f}"
+              f"{max(times):>8.2f}{failed:>8}")
+    print(f"{len(results)} phiên trong {total:.1f}s ({len(results) / total:.1f} phiên/s) trên {args.concurrency} worker, "
+          f"nguồn phát lại: {sum(r[3] for r in results)} lời gọi, {sum(r[4] for r in results)} lỗi giả lập")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Thời gian nhập module và bộ nhớ (RSS) của một tiến trình Python mới cho từng trang,
+# kèm các thư viện nặng bị nạp theo: đo chi phí khởi động một worker Streamlit trước khi có dữ liệu.
+
+TARGETS = {
+    "streamlit_app": "import streamlit",
+    "gold_sjc": "from macro_bot.view.pages import gold_sjc",
+    "gold_dxy": "from macro_bot.view.pages import gold_dxy",
+    "global_rates": "from macro_bot.view.pages import global_rates",
+    "vn_macro": "from macro_bot.view.pages import vn_macro",
+    "compute": "from macro_bot.compute import backtest, correlation, indicators, montecarlo",
+}
+HEAVY = ("yfinance", "plotly", "matplotlib", "requests")
+
+PROBE = """
+import sys, time
+started = time.perf_counter()
+{statement}
+elapsed = time.perf_counter() - started
+rss = next(int(line.split()[1]) for line in open("/proc/self/status") if line.startswith("VmRSS"))
+print(elapsed, rss / 1024, ",".join(m for m in {heavy!r} if m in sys.modules) or "-")
+"""
+
+
+def measure(statement, repeat=5):
+    best = None
+    for _ in range(repeat):
+        out = subprocess.run([sys.executable, "-c", PROBE.format(statement=statement, heavy=HEAVY)],
+                             cwd=ROOT, capture_output=True, text=True, check=True).stdout.split()
+        if best is None or float(out[0]) < float(best[0]):
+            best = out
+    return float(best[0]), float(best[1]), best[2]
+
+
+def main():
+    print(f"{'target':<16}{'import s':>10}{'RSS MB':>10}  heavy modules")
+    for name, statement in TARGETS.items():
+        elapsed, rss, heavy = measure(statement)
+        print(f"{name:<16}{elapsed:>10.2f}{rss:>10.0f}  {heavy}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,307 @@
+import argparse
+import fnmatch
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import fixtures  # noqa: E402
+import portfolio_bench  # noqa: E402
+from macro_bot.compute import backtest, correlation, indicators, montecarlo, portfolio  # noqa: E402
+from macro_bot.data import fred_fetcher, macro_generator  # noqa: E402
+from macro_bot.view import charts, figures  # noqa: E402
+
+# Bộ đo hiệu năng cho các bước chuẩn bị dữ liệu của 4 Dashboard, chạy không giao diện trên dữ liệu cố định
+# (không cần mạng) ở nhiều độ dài lịch sử (1x/10x/100x). Đo thời gian và bộ nhớ đỉnh (tracemalloc),
+# ghi JSON kèm mã commit để so sánh giữa các lần sửa:
+#   python benchmarks/suite.py                        -> benchmarks/results/<commit>.json
+#   python benchmarks/suite.py --compare old.json new.json
+
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "results")
+DEFAULT_SCALES = (1, 10, 100)
+APP_START = "2023-01-01"
+
+CASES = []
+
+
+def case(name, page, scaled=True, max_scale=None):
+    # setup(fx) trả về (hàm cần đo, số dòng dữ liệu đầu vào); phần chuẩn bị không tính vào thời gian
+    def decorator(setup):
+        CASES.append({"name": name, "page": page, "setup": setup, "scaled": scaled, "max_scale": max_scale})
+        return setup
+    return decorator
+
+
+# --- pages/gold_sjc.py ---
+
+def _app_closes(fx):
+    closes = fx["closes"]
+    return closes[closes.index >= pd.Timestamp(APP_START)]
+
+
+@case("app.mc_params", "pages/gold_sjc.py")
+def _app_mc_params(fx):
+    closes = _app_closes(fx)
+    gold, usdvnd = closes["GC=F"].dropna(), closes["VND=X"].dropna()
+    return lambda: montecarlo.estimate_params(gold, usdvnd), len(closes)
+
+
+@case("app.monte_carlo", "pages/gold_sjc.py", scaled=False)
+def _app_monte_carlo(fx):
+    return lambda: montecarlo.simulate(2000.0, 25000.0, 5.0, 0.15, 0.02, 0.03, -0.2, premium_sjc=4.0,
+                                       capital=1.0), montecarlo.TRADING_DAYS
+
+
+@case("app.gold_projection_png", "pages/gold_sjc.py")
+def _app_gold_projection(fx):
+    closes = _app_closes(fx)
+    gold, stock = closes["GC=F"].dropna(), closes["^GSPC"].dropna()
+    version = figures.data_version(gold, stock)
+    # Bộ nhớ đệm ảnh mới mỗi lần để đo đúng một lần vẽ (gồm cả nền lịch sử)
+    return lambda: figures.gold_projection(figures.FigureCache(max_entries=1), version, gold, stock, 3.0), len(closes)
+
+
+# --- pages/gold_dxy.py ---
+
+@case("gold_dxy.indicators_cold", "pages/gold_dxy.py")
+def _gold_indicators_cold(fx):
+    closes = fx["closes"]
+    return lambda: indicators.gold_dxy_frame(closes), len(closes)
+
+
+@case("gold_dxy.indicators_append", "pages/gold_dxy.py")
+def _gold_indicators_append(fx):
+    # Bộ tính đã có lịch sử, chỉ thêm 5 phiên mới (đường đi khi cache hết hạn)
+    closes = fx["closes"]
+    engine = indicators.IndicatorEngine()
+    indicators.gold_dxy_frame(closes.iloc[:-5], engine)
+    return lambda: indicators.gold_dxy_frame(closes, engine), len(closes)
+
+
+@case("gold_dxy.backtest_sweep", "pages/gold_dxy.py", max_scale=10)
+def _gold_backtest(fx):
+    df = indicators.gold_dxy_frame(fx["closes"])
+    return lambda: backtest.sweep(df), len(df)
+
+
+@case("gold_dxy.correlation_matrix", "pages/gold_dxy.py", max_scale=10)
+def _gold_correlation(fx):
+    rates = pd.concat([frame.iloc[:, 0].rename(sid) for sid, frame in fx["fred"].items()], axis=1)
+    frame = correlation.build_frame(fx["closes"], rates)
+    return lambda: correlation.rolling_corr_matrix(frame, 90), len(frame)
+
+
+@case("gold_dxy.figure", "pages/gold_dxy.py")
+def _gold_figure(fx):
+    df = indicators.gold_dxy_frame(fx["closes"])
+    return lambda: charts.gold_dxy_figure(df, entry_price=2000.0).to_json(), len(df)
+
+
+@case("gold_dxy.portfolio", "pages/gold_dxy.py", max_scale=10)
+def _gold_portfolio(fx):
+    # File 5.000 vị thế của 500 tài khoản, định giá trên toàn bộ lịch sử
+    engine = portfolio.PortfolioEngine(fx["closes"])
+    positions = portfolio_bench.synthetic_positions(engine.index, 5000, 500)
+    return lambda: engine.value(positions), len(engine)
+
+
+# --- pages/global_rates.py ---
+
+def _rate_symbols():
+    return fred_fetcher.RATE_SERIES["10 Năm (Dài hạn)"]
+
+
+@case("global_rates.catalog", "pages/global_rates.py")
+def _rates_catalog(fx):
+    symbols = _rate_symbols()
+    rows = sum(len(fx["fred"][sid]) for sid in symbols.values() if sid in fx["fred"])
+    return lambda: fred_fetcher.SeriesCatalog.from_frames(fx["fred"], symbols), rows
+
+
+@case("global_rates.figure", "pages/global_rates.py")
+def _rates_figure(fx):
+    symbols = _rate_symbols()
+    rows = sum(len(fx["fred"][sid]) for sid in symbols.values() if sid in fx["fred"])
+
+    def run():
+        # Danh mục mới mỗi lần: tính cả bước gộp tần suất (lười) khi vẽ lần đầu
+        catalog = fred_fetcher.SeriesCatalog.from_frames(fx["fred"], symbols)
+        freq = fred_fetcher.plot_frequency(catalog.first_date, catalog.last_date)
+        return charts.rates_figure(catalog.window(freq=freq)).to_json()
+    return run, rows
+
+
+# --- pages/vn_macro.py ---
+
+def _macro_freq(scale):
+    # 1x = tần suất tháng như trên trang; lớn hơn thì chia nhỏ kỳ để có số dòng gấp `scale` lần
+    if scale == 1:
+        return "ME"
+    span_hours = (pd.Timestamp("2026-01-01") - pd.Timestamp("2005-01-01")).total_seconds() / 3600
+    months = len(pd.date_range("2005-01-01", "2026-01-01", freq="ME"))
+    return f"{max(int(span_hours / (months * scale)), 1)}h"
+
+
+@case("vn_macro.generate", "pages/vn_macro.py")
+def _macro_generate(fx):
+    freq = _macro_freq(fx["scale"])
+    rows = len(pd.date_range("2005-01-01", "2026-01-01", freq=freq))
+    return lambda: macro_generator.generate_macro_frame(freq=freq), rows
+
+
+@case("vn_macro.figure", "pages/vn_macro.py")
+def _macro_figure(fx):
+    df = macro_generator.generate_macro_frame(freq=_macro_freq(fx["scale"]))
+    return lambda: charts.vn_macro_figure(df).to_json(), len(df)
+
+
+# --- Bộ chạy ---
+
+def git_revision():
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    try:
+        rev = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=root, capture_output=True,
+                             text=True, check=True).stdout.strip()
+        dirty = subprocess.run(["git", "status", "--porcelain", "--untracked-files=no"], cwd=root,
+                               capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown", False
+    return rev, bool(dirty)
+
+
+def measure(spec, fx, repeat):
+    # Lượt khởi động không tính giờ: import/khởi tạo một lần của thư viện (Plotly, Matplotlib...)
+    fn, rows = spec["setup"](fx)
+    fn()
+
+    timings = []
+    for _ in range(repeat):
+        fn, rows = spec["setup"](fx)
+        started = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - started)
+
+    # Lần chạy riêng cho bộ nhớ: tracemalloc làm chậm nên không dùng chung với đo thời gian
+    fn, rows = spec["setup"](fx)
+    tracemalloc.start()
+    try:
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return {
+        "rows": int(rows),
+        "seconds_min": round(min(timings), 6),
+        "seconds_median": round(statistics.median(timings), 6),
+        "peak_mb": round(peak / 2 ** 20, 3),
+    }
+
+
+def run(scales=DEFAULT_SCALES, patterns=None, repeat=3, fixture_dir=fixtures.FIXTURE_DIR):
+    selected = [spec for spec in CASES if not patterns or any(fnmatch.fnmatch(spec["name"], p) for p in patterns)]
+    rev, dirty = git_revision()
+    report = {
+        "git_rev": rev,
+        "git_dirty": dirty,
+        "created_at": pd.Timestamp.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "pandas": pd.__version__,
+        "machine": platform.machine(),
+        "repeat": repeat,
+        "results": [],
+    }
+    for scale in scales:
+        fx = fixtures.load_fixtures(scale, fixture_dir=fixture_dir)
+        report["fixture_source"] = fx["source"]
+        report["fixtures"] = fx["manifest"]
+        for spec in selected:
+            entry = {"case": spec["name"], "page": spec["page"], "scale": scale}
+            if not spec["scaled"] and scale != scales[0]:
+                continue
+            if spec["max_scale"] is not None and scale > spec["max_scale"]:
+                entry["skipped"] = f"max_scale={spec['max_scale']}"
+            else:
+                entry.update(measure(spec, fx, repeat))
+            report["results"].append(entry)
+            print(format_entry(entry), flush=True)
+    return report
+
+
+def format_entry(entry):
+    if "skipped" in entry:
+        return f"{entry['case']:<32}{entry['scale']:>5}x  bỏ qua ({entry['skipped']})"
+    return (f"{entry['case']:<32}{entry['scale']:>5}x{entry['rows']:>10}"
+            f"{entry['seconds_min'] * 1000:>12.1f} ms{entry['peak_mb']:>10.1f} MB")
+
+
+def compare(old_path, new_path, threshold=0.25, min_delta_ms=5.0):
+    # Trả về số phép đo chậm hơn / tốn bộ nhớ hơn quá ngưỡng (tỷ lệ) so với bản cũ;
+    # chênh lệch thời gian dưới min_delta_ms được coi là nhiễu đo
+    with open(old_path) as f:
+        old = json.load(f)
+    with open(new_path) as f:
+        new = json.load(f)
+    old_results = {(r["case"], r["scale"]): r for r in old["results"] if "skipped" not in r}
+
+    print(f"So sánh {old['git_rev']} -> {new['git_rev']}{' (có sửa chưa commit)' if new.get('git_dirty') else ''}")
+    print(f"{'case':<32}{'scale':>6}{'cũ ms':>12}{'mới ms':>12}{'thời gian':>11}{'bộ nhớ':>10}")
+    regressions = 0
+    for r in new["results"]:
+        base = old_results.get((r["case"], r["scale"]))
+        if base is None or "skipped" in r:
+            continue
+        time_change = r["seconds_min"] / base["seconds_min"] - 1 if base["seconds_min"] else 0.0
+        mem_change = r["peak_mb"] / base["peak_mb"] - 1 if base["peak_mb"] else 0.0
+        flag = ""
+        slower = time_change > threshold and (r["seconds_min"] - base["seconds_min"]) * 1000 > min_delta_ms
+        if slower or mem_change > threshold:
+            regressions += 1
+            flag = "  ⚠️"
+        print(f"{r['case']:<32}{r['scale']:>5}x{base['seconds_min'] * 1000:>12.1f}{r['seconds_min'] * 1000:>12.1f}"
+              f"{time_change:>+10.0%}{mem_change:>+10.0%}{flag}")
+    print(f"{regressions} phép đo vượt ngưỡng {threshold:.0%}")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Đo hiệu năng các bước chuẩn bị dữ liệu của Dashboard")
+    parser.add_argument("--scales", type=int, nargs="+", default=list(DEFAULT_SCALES))
+    parser.add_argument("--cases", nargs="+", help="Mẫu tên case, ví dụ gold_dxy.* app.monte_carlo")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--fixture-dir", default=fixtures.FIXTURE_DIR)
+    parser.add_argument("--output", help="File JSON kết quả (mặc định benchmarks/results/<commit>.json)")
+    parser.add_argument("--compare", nargs=2, metavar=("OLD", "NEW"), help="So sánh hai file kết quả")
+    parser.add_argument("--threshold", type=float, default=0.25, help="Ngưỡng chậm đi bị coi là hồi quy")
+    parser.add_argument("--min-delta-ms", type=float, default=5.0, help="Chênh lệch thời gian tối thiểu để tính")
+    parser.add_argument("--list", action="store_true", help="Liệt kê các case")
+    args = parser.parse_args(argv)
+
+    if args.list:
+        for spec in CASES:
+            print(f"{spec['name']:<32}{spec['page']}")
+        return 0
+    if args.compare:
+        return 1 if compare(*args.compare, threshold=args.threshold, min_delta_ms=args.min_delta_ms) else 0
+
+    report = run(args.scales, args.cases, args.repeat, args.fixture_dir)
+    output = args.output or os.path.join(
+        RESULTS_DIR, f"{report['git_rev']}{'-dirty' if report['git_dirty'] else ''}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"Đã ghi {output} (dữ liệu: {report['fixture_source']}, {report['fixtures']['digest']})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
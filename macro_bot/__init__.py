@@ -0,0 +1,5 @@
+# Gói Dashboard vĩ mô, chia ba tầng:
+#   macro_bot.data     — tải và lưu dữ liệu (yfinance, FRED, bộ nhớ đệm dùng chung, làm mới nền)
+#   macro_bot.compute  — tính toán thuần NumPy/pandas, dùng lại được trong tác vụ batch
+#   macro_bot.view     — biểu đồ (Plotly, Matplotlib) và các trang Streamlit
+# Không nhập sẵn gói con nào ở đây: thư viện nặng chỉ được nạp khi trang/tác vụ thật sự cần.
@@ -0,0 +1,192 @@
+import argparse
+import base64
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+
+from macro_bot.compute import indicators, montecarlo
+from macro_bot.data import fred_fetcher, macro_generator, market_store
+from macro_bot.view import charts, figures
+
+# Bản dựng tĩnh cho GitHub Actions: tải mỗi mã/chuỗi FRED đúng một lần,
+# dựng ảnh chụp HTML/JSON cho mọi Dashboard song song trên các nhân CPU, ghi file nguyên tử.
+
+TICKERS = ["GC=F", "^GSPC", "VND=X", "DX-Y.NYB"]
+APP_START = "2023-01-01"
+
+# Giá trị mặc định của thanh trượt trên trang Vàng SJC (view/pages/gold_sjc.py)
+DEFAULT_CPI = 4.5
+DEFAULT_IR = 7.5
+DEFAULT_PREMIUM_SJC = 4.0
+
+
+def write_atomic(path, content):
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.write(content)
+    os.replace(tmp_path, path)
+
+
+def load_inputs():
+    closes = market_store.load_closes(TICKERS)
+    fred_ids = [sid for symbols in fred_fetcher.RATE_SERIES.values() for sid in symbols.values()]
+    fred_frames = fred_fetcher.get_fetcher().fetch_many(fred_ids)
+    return closes, fred_frames
+
+
+# --- Dựng từng trang (chạy trong tiến trình con) ---
+
+def render_gold_sjc(gold_series, stock_series, usdvnd_series):
+    real_ir = DEFAULT_IR - DEFAULT_CPI
+    curr_gold_usd = float(gold_series.iloc[-1])
+    curr_exchange_rate = float(usdvnd_series.iloc[-1])
+    gold_sjc_converted = montecarlo.sjc_price(curr_gold_usd, curr_exchange_rate, DEFAULT_PREMIUM_SJC)
+
+    version = figures.data_version(gold_series, stock_series)
+    png = figures.gold_projection(figures.FigureCache(max_entries=1), version, gold_series, stock_series, real_ir)
+    img = base64.b64encode(png).decode()
+    return {
+        "title": "📊 Vàng SJC & Lãi suất thực",
+        "html": f'<img alt="gold projection" style="max-width:100%" src="data:image/png;base64,{img}">',
+        "metrics": {
+            "gold_sjc": round(gold_sjc_converted, 2),
+            "real_ir": real_ir,
+            "sp500": round(float(stock_series.iloc[-1]), 1),
+        },
+    }
+
+
+def render_gold_dxy(df):
+    fig = charts.gold_dxy_figure(df)
+    curr_price = df['Gold'].iloc[-1]
+    return {
+        "title": "🧠 Vàng, MA200 & DXY",
+        "figure": fig,
+        "metrics": {
+            "gold": round(float(curr_price), 2),
+            "rsi": round(float(df['RSI'].iloc[-1]), 1),
+            "ma200_dist_pct": round(float((curr_price - df['MA200'].iloc[-1]) / df['MA200'].iloc[-1] * 100), 1),
+            "correlation": round(float(df['Correlation'].iloc[-1]), 2),
+        },
+    }
+
+
+def render_rates(term, catalog):
+    freq = fred_fetcher.plot_frequency(catalog.first_date, catalog.last_date)
+    fig = charts.rates_figure(catalog.window(freq=freq))
+    metrics = {}
+    for name in catalog.names:
+        stats = catalog.stats(name)
+        metrics[name] = {
+            "current": round(stats["current"], 2),
+            "mean": round(stats["mean"], 2),
+            "max": round(stats["max"], 2),
+            "last": stats["last"].strftime("%Y-%m-%d"),
+            "freq": stats["freq"],
+        }
+    return {"title": f"🌐 Lãi suất {term}", "figure": fig, "metrics": metrics}
+
+
+def render_vn_macro(df):
+    latest = df.iloc[-1]
+    return {
+        "title": "🚀 Vĩ mô Việt Nam",
+        "figure": charts.vn_macro_figure(df),
+        "metrics": {col: round(float(latest[col]), 2) for col in df.columns},
+    }
+
+
+def render_view(name, render, args):
+    started = time.perf_counter()
+    view = render(*args)
+    fig = view.pop("figure", None)
+    if fig is not None:
+        view["html"] = fig.to_html(full_html=False, include_plotlyjs=False)
+        view["figure"] = json.loads(fig.to_json())
+    view["name"] = name
+    view["render_seconds"] = round(time.perf_counter() - started, 3)
+    return view
+
+
+def build_jobs(closes, fred_frames):
+    jobs = []
+
+    app_closes = closes[closes.index >= pd.Timestamp(APP_START)]
+    jobs.append(("gold_sjc", render_gold_sjc, (
+        app_closes["GC=F"].dropna(), app_closes["^GSPC"].dropna(), app_closes["VND=X"].dropna())))
+
+    jobs.append(("gold_dxy", render_gold_dxy, (indicators.gold_dxy_frame(closes),)))
+
+    for term, symbols in fred_fetcher.RATE_SERIES.items():
+        catalog = fred_fetcher.SeriesCatalog.from_frames(fred_frames, symbols)
+        if len(catalog):
+            # "10 Năm (Dài hạn)" -> rates_10y
+            jobs.append((f"rates_{term.split()[0]}y", render_rates, (term, catalog)))
+
+    jobs.append(("vn_macro", render_vn_macro, (macro_generator.generate_macro_frame(),)))
+    return jobs
+
+
+def page_html(title, body, generated_at):
+    return f"""<!DOCTYPE html>
+<html lang="vi">
+<head>
+<meta charset="utf-8">
+<title>{title}</title>
+<script src="https://cdn.plot.ly/plotly-2.35.2.min.js"></script>
+<style>body{{background:#0E1117;color:#FAFAFA;font-family:sans-serif;margin:2rem}}
+section{{margin-bottom:3rem}} code{{color:#D4AF37}}</style>
+</head>
+<body>
+<h1>{title}</h1>
+<p>Cập nhật: {generated_at}</p>
+{body}
+</body>
+</html>
+"""
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Dựng ảnh chụp tĩnh cho các Dashboard vĩ mô")
+    parser.add_argument("--output", default=".", help="Thư mục ghi index.html và snapshots/")
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    args = parser.parse_args(argv)
+
+    started = time.perf_counter()
+    closes, fred_frames = load_inputs()
+    if closes.empty:
+        raise SystemExit("Không tải được dữ liệu thị trường")
+    loaded = time.perf_counter()
+
+    jobs = build_jobs(closes, fred_frames)
+    with ProcessPoolExecutor(max_workers=max(1, min(args.workers, len(jobs)))) as pool:
+        futures = [pool.submit(render_view, name, render, job_args) for name, render, job_args in jobs]
+        views = [future.result() for future in futures]
+    rendered = time.perf_counter()
+
+    generated_at = pd.Timestamp.now().strftime('%d/%m/%Y %H:%M')
+    snapshot_dir = os.path.join(args.output, "snapshots")
+    sections = []
+    for view in views:
+        html = view.pop("html")
+        write_atomic(os.path.join(snapshot_dir, f"{view['name']}.html"),
+                     page_html(view["title"], html, generated_at))
+        write_atomic(os.path.join(snapshot_dir, f"{view['name']}.json"),
+                     json.dumps(dict(view, generated_at=generated_at), ensure_ascii=False))
+        metrics = ", ".join(f"{k}: <code>{v}</code>" for k, v in view["metrics"].items()
+                            if not isinstance(v, dict))
+        sections.append(f'<section><h2>{view["title"]}</h2><p>{metrics}</p>{html}</section>')
+
+    write_atomic(os.path.join(args.output, "index.html"),
+                 page_html("📊 Macro Dashboard", "\n".join(sections), generated_at))
+
+    print(f"Tải dữ liệu: {loaded - started:.2f}s, dựng {len(views)} trang: {rendered - loaded:.2f}s, "
+          f"tổng: {time.perf_counter() - started:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1 @@
+# Tầng tính toán: chỉ dùng NumPy/pandas, không phụ thuộc Streamlit hay thư viện vẽ
@@ -0,0 +1,82 @@
+import numpy as np
+import pandas as pd
+
+# Backtest dạng lưới: quét mọi ngưỡng × kỳ hạn nắm giữ × tín hiệu trong một lượt
+# nhân ma trận, không có vòng lặp Python theo từng tham số.
+
+DEFAULT_THRESHOLDS = {
+    "rsi": np.arange(10, 91, 1.0),
+    "ma200_dev": np.arange(-40, 41, 1.0),
+    "correlation": np.round(np.arange(-0.95, 0.96, 0.05), 2),
+}
+DEFAULT_HORIZONS = np.arange(1, 61)
+
+
+def signal_values(df):
+    # Giá trị các tín hiệu theo từng phiên (df là kết quả của get_advanced_data)
+    return {
+        "rsi": df['RSI'].to_numpy(dtype=float),
+        "ma200_dev": ((df['Gold'] - df['MA200']) / df['MA200'] * 100).to_numpy(dtype=float),
+        "correlation": df['Correlation'].to_numpy(dtype=float),
+    }
+
+
+def forward_returns(prices, horizons):
+    # Ma trận H × T: lợi suất sau h phiên tính từ mỗi phiên t (NaN nếu vượt cuối chuỗi)
+    prices = np.asarray(prices, dtype=float)
+    horizons = np.asarray(horizons, dtype=int)
+    n = len(prices)
+    future_pos = np.arange(n)[None, :] + horizons[:, None]
+    inside = future_pos < n
+    future = prices[np.minimum(future_pos, n - 1)]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        returns = future / prices[None, :] - 1
+    return np.where(inside, returns, np.nan)
+
+
+def sweep(df, thresholds=None, horizons=DEFAULT_HORIZONS):
+    # Tín hiệu "above" (vượt ngưỡng, ví dụ RSI > 70) trúng khi giá giảm sau đó,
+    # tín hiệu "below" trúng khi giá tăng sau đó — đúng tinh thần "Vật cực tất phản".
+    thresholds = thresholds or DEFAULT_THRESHOLDS
+    values = signal_values(df)
+    horizons = np.asarray(horizons, dtype=int)
+
+    returns = forward_returns(df['Gold'].to_numpy(dtype=float), horizons)
+    valid = ~np.isnan(returns)
+    returns_filled = np.where(valid, returns, 0.0)
+
+    labels = []
+    masks = []
+    for name, grid in thresholds.items():
+        grid = np.asarray(grid, dtype=float)
+        signal = values[name][None, :]
+        # NaN so sánh ra False nên các phiên thiếu chỉ báo tự bị loại
+        masks.append(signal > grid[:, None])
+        masks.append(signal < grid[:, None])
+        labels.append((name, "above", grid))
+        labels.append((name, "below", grid))
+
+    signal_matrix = np.concatenate(masks).astype(np.float64)
+    is_above = np.concatenate([np.full(len(g), d == "above") for _, d, g in labels])
+
+    events = signal_matrix @ valid.T.astype(np.float64)
+    total_return = signal_matrix @ returns_filled.T
+    falls = signal_matrix @ (returns_filled < 0).T.astype(np.float64)
+    rises = signal_matrix @ (returns_filled > 0).T.astype(np.float64)
+    hits = np.where(is_above[:, None], falls, rises)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        hit_rate = hits / events * 100
+        avg_return = total_return / events * 100
+
+    n_horizons = len(horizons)
+    # Cột nhãn dạng category: lưới dùng chung giữa các phiên nên giữ gọn (mã số nhỏ thay vì chuỗi Python)
+    return pd.DataFrame({
+        "signal": pd.Categorical(np.repeat(np.concatenate([[n] * len(g) for n, _, g in labels]), n_horizons)),
+        "direction": pd.Categorical(np.repeat(np.concatenate([[d] * len(g) for _, d, g in labels]), n_horizons)),
+        "threshold": np.repeat(np.concatenate([g for _, _, g in labels]), n_horizons),
+        "horizon": np.tile(horizons, len(signal_matrix)),
+        "events": events.ravel().astype(np.int64),
+        "hit_rate": hit_rate.ravel(),
+        "avg_return": avg_return.ravel(),
+    })
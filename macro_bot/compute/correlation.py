@@ -0,0 +1,130 @@
+import threading
+
+import numpy as np
+import pandas as pd
+
+# Ma trận tương quan trượt cho N chuỗi (Vàng, DXY, S&P 500, USD/VND, lợi suất FRED...)
+# tính mọi cặp trong một lượt vector hóa bằng tổng tích lũy của x, y, x², y², xy.
+# Mỗi cặp chỉ dùng các phiên có đủ cả hai giá trị, giống rolling(window).corr() của pandas.
+
+DEFAULT_WINDOWS = (30, 90, 250)
+# Số phiên mỗi khối: tổng tích lũy được tính lại từ 0 trong từng khối
+# để giới hạn bộ nhớ (khối × N × N) và sai số cộng dồn qua 50 năm
+BLOCK_SIZE = 512
+# Từ số ô N×N này trở lên, cộng dồn theo từng hàng thay cho np.cumsum
+ROW_CUMSUM_MIN_PAIRS = 256
+
+CORRELATION_TICKERS = {
+    "GC=F": "Vàng",
+    "DX-Y.NYB": "DXY",
+    "^GSPC": "S&P 500",
+    "VND=X": "USD/VND",
+}
+
+
+def _centered(frame):
+    values = frame.to_numpy(dtype=float)
+    valid = ~np.isnan(values)
+    # Trừ trung bình từng cột trước khi bình phương để tránh mất chính xác với giá lớn
+    means = np.nanmean(values, axis=0) if valid.any() else np.zeros(values.shape[1])
+    filled = np.where(valid, values - np.nan_to_num(means), 0.0)
+    return filled, valid
+
+
+def _window_sums(values, window):
+    # Tổng trượt theo trục thời gian qua tổng tích lũy: phần tử k là tổng của hàng k..k+window-1
+    csum = np.cumsum(values, axis=0)
+    out = csum[window - 1:].copy()
+    out[1:] -= csum[:-window]
+    return out
+
+
+def _pair_window_sums(x, window):
+    # Tổng trượt của x_i·x_j cho mọi cặp: (hàng, N, N)
+    csum = x[:, :, None] * x[:, None, :]
+    if x.shape[1] ** 2 < ROW_CUMSUM_MIN_PAIRS:
+        csum = np.cumsum(csum, axis=0)
+    else:
+        # Nhiều cặp: cộng dồn tại chỗ theo từng hàng (mỗi bước là một phép cộng vector N×N liền bộ nhớ)
+        # nhanh hơn np.cumsum theo trục 0 trên mảng 3 chiều
+        for i in range(1, len(csum)):
+            csum[i] += csum[i - 1]
+    out = csum[window - 1:].copy()
+    out[1:] -= csum[:-window]
+    return out
+
+
+def rolling_corr_matrix(frame, window, block=BLOCK_SIZE):
+    # Trả về mảng float32 (T, N, N): tương quan của mọi cặp cột trong `window` phiên kết thúc tại mỗi phiên
+    x, valid = _centered(frame)
+    n_rows, n_cols = x.shape
+    out = np.full((n_rows, n_cols, n_cols), np.nan, dtype=np.float32)
+    if n_rows < window:
+        return out
+
+    # Một cặp chỉ có giá trị khi cả hai chuỗi đủ `window` phiên (như min_periods=window của pandas),
+    # nên tổng của x, x² và độ lệch chuẩn chỉ cần tính theo từng cột; riêng xy cần theo từng cặp
+    count = _window_sums(valid.astype(float), window)
+    sx = _window_sums(x, window)
+    var = window * _window_sums(x * x, window) - sx * sx
+    sd = np.sqrt(np.where((count == window) & (var > 0), var, np.nan))
+
+    for start in range(window - 1, n_rows, block):
+        stop = min(start + block, n_rows)
+        # Tổng tích lũy của xy được tính lại từ 0 trong từng khối (kèm `window` phiên trước đó)
+        sxy = _pair_window_sums(x[start - window + 1:stop], window)
+
+        rows = slice(start - window + 1, stop - window + 1)
+        corr = window * sxy - sx[rows, :, None] * sx[rows, None, :]
+        corr /= sd[rows, :, None]
+        corr /= sd[rows, None, :]
+        # Cặp thiếu dữ liệu mang NaN từ độ lệch chuẩn
+        out[start:stop] = np.clip(corr, -1.0, 1.0)
+    return out
+
+
+def matrix_frame(tensor, columns, pos):
+    return pd.DataFrame(tensor[pos], index=columns, columns=columns)
+
+
+class CorrelationEngine:
+    # Giữ bảng dữ liệu gốc; mỗi cửa sổ chỉ tính một lần khi được dùng lần đầu
+    def __init__(self, frame, windows=DEFAULT_WINDOWS, block=BLOCK_SIZE):
+        self.frame = frame
+        self.index = frame.index
+        self.columns = list(frame.columns)
+        self.windows = tuple(windows)
+        self.block = block
+        self._tensors = {}
+        self._lock = threading.Lock()
+
+    def tensor(self, window):
+        with self._lock:
+            if window not in self._tensors:
+                self._tensors[window] = rolling_corr_matrix(self.frame, window, self.block)
+                # Mảng dùng chung giữa các phiên: chỉ đọc
+                self._tensors[window].setflags(write=False)
+            return self._tensors[window]
+
+    def _position(self, date):
+        if date is None:
+            return len(self.index) - 1
+        # Phiên gần nhất không sau ngày được chọn
+        return max(int(self.index.searchsorted(pd.Timestamp(date), side="right")) - 1, 0)
+
+    def matrix(self, window, date=None):
+        return matrix_frame(self.tensor(window), self.columns, self._position(date))
+
+    def pair(self, a, b, window):
+        i, j = self.columns.index(a), self.columns.index(b)
+        return pd.Series(self.tensor(window)[:, i, j], index=self.index, name=f"{a} / {b}")
+
+
+def build_frame(closes, rates=None):
+    # Ghép giá đóng cửa và lợi suất FRED theo lịch phiên giao dịch;
+    # chuỗi tháng được giữ giá trị gần nhất cho tới kỳ công bố tiếp theo
+    frame = closes.rename(columns=CORRELATION_TICKERS)
+    if rates is not None and not rates.empty:
+        rates = rates.reindex(rates.index.union(frame.index)).ffill().reindex(frame.index)
+        frame = pd.concat([frame, rates], axis=1)
+    return frame.dropna(how="all")
@@ -0,0 +1,74 @@
+import numpy as np
+import pandas as pd
+
+# Giảm số điểm cho biểu đồ lịch sử dài trước khi gửi sang trình duyệt.
+# Biểu đồ rộng ~1000-2000 pixel nên vài nghìn điểm là đủ giữ nguyên hình dạng đường giá.
+
+DEFAULT_POINTS = 2000
+
+
+def lttb_indices(x, y, n_out):
+    # Largest-Triangle-Three-Buckets: mỗi nhóm giữ điểm tạo tam giác lớn nhất
+    # với điểm đã chọn ở nhóm trước và trung bình của nhóm sau
+    n = len(y)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    edges = np.linspace(1, n - 1, n_out - 1).astype(int)
+    # Trung bình của từng nhóm (dùng cho nhóm "phía sau")
+    bucket_sum_x = np.add.reduceat(x[1:n - 1], edges[:-1] - 1)
+    bucket_sum_y = np.add.reduceat(y[1:n - 1], edges[:-1] - 1)
+    bucket_len = np.diff(edges)
+    avg_x = np.append(bucket_sum_x / bucket_len, x[-1])
+    avg_y = np.append(bucket_sum_y / bucket_len, y[-1])
+
+    selected = np.empty(n_out, dtype=np.int64)
+    selected[0] = 0
+    selected[-1] = n - 1
+    prev = 0
+    for i in range(n_out - 2):
+        lo, hi = edges[i], edges[i + 1]
+        area = np.abs(
+            (x[prev] - avg_x[i + 1]) * (y[lo:hi] - y[prev])
+            - (x[prev] - x[lo:hi]) * (avg_y[i + 1] - y[prev])
+        )
+        prev = lo + int(np.argmax(area))
+        selected[i + 1] = prev
+    return selected
+
+
+def minmax_indices(y, n_out):
+    # Giữ điểm cao nhất và thấp nhất của mỗi nhóm (hoàn toàn vector hóa)
+    n = len(y)
+    if n_out >= n or n_out < 4:
+        return np.arange(n)
+
+    y = np.asarray(y, dtype=float)
+    n_buckets = n_out // 2
+    edges = np.linspace(0, n, n_buckets + 1).astype(int)[:-1]
+    bucket_id = np.repeat(np.arange(n_buckets), np.diff(np.append(edges, n)))
+    order = np.lexsort((y, bucket_id))
+    starts = np.append(edges, n)
+    lows = order[starts[:-1]]
+    highs = order[starts[1:] - 1]
+    return np.unique(np.concatenate(([0, n - 1], lows, highs)))
+
+
+def downsample(series, n_out=DEFAULT_POINTS, method="lttb", start=None, end=None):
+    # Cắt theo khoảng đang xem rồi mới giảm điểm: phóng to vào khoảng hẹp sẽ thấy đủ chi tiết
+    series = series.dropna()
+    if start is not None:
+        series = series[series.index >= pd.Timestamp(start)]
+    if end is not None:
+        series = series[series.index <= pd.Timestamp(end)]
+    if len(series) <= n_out:
+        return series
+
+    if method == "minmax":
+        idx = minmax_indices(series.to_numpy(), n_out)
+    else:
+        x = series.index.asi8 if isinstance(series.index, pd.DatetimeIndex) else np.arange(len(series))
+        idx = lttb_indices(x, series.to_numpy(), n_out)
+    return series.iloc[idx]
@@ -0,0 +1,223 @@
+import threading
+
+import numpy as np
+import pandas as pd
+
+# Bộ tính chỉ báo giữ trạng thái: khi có N phiên mới chỉ tính lại trên N phiên đó
+# (cộng phần đuôi đủ dài cho cửa sổ lớn nhất) thay vì toàn bộ lịch sử, ghi tại chỗ vào đuôi mảng cấp phát trước.
+# Xuất bảng (frame(), gold_dxy_frame) vẫn là bản sao toàn bộ lịch sử: O(lịch sử) mỗi lần làm mới.
+# Kết quả khớp với công thức pandas gốc trong reference_indicators().
+
+# Số phiên cuối được so khớp lại mỗi lần cập nhật (kho dữ liệu có thể sửa vài phiên gần nhất)
+REVISION_DEPTH = 20
+
+OUTPUT_COLUMNS = ['Gold', 'DXY', 'MA200', 'RSI', 'Correlation', 'Return_10d']
+
+
+def reference_indicators(df, ma_window=200, rsi_window=14, corr_window=30, horizon=10):
+    # Công thức pandas gốc của get_advanced_data(), dùng làm chuẩn đối chiếu
+    out = df[['Gold', 'DXY']].copy()
+    out['MA200'] = out['Gold'].rolling(window=ma_window).mean()
+
+    delta = out['Gold'].diff()
+    gain = (delta.where(delta > 0, 0)).rolling(window=rsi_window).mean()
+    loss = (-delta.where(delta < 0, 0)).rolling(window=rsi_window).mean()
+    rs = gain / loss
+    out['RSI'] = 100 - (100 / (1 + rs))
+
+    out['Correlation'] = out['Gold'].rolling(window=corr_window).corr(out['DXY'])
+    out['Return_10d'] = out['Gold'].shift(-horizon) / out['Gold'] - 1
+    return out
+
+
+def _window_sums(values, window):
+    # Tổng trượt qua tổng tích lũy; trả thêm số phần tử hợp lệ và khác 0 trong cửa sổ
+    valid = ~np.isnan(values)
+    filled = np.where(valid, values, 0.0)
+    csum = np.concatenate(([0.0], np.cumsum(filled)))
+    cvalid = np.concatenate(([0], np.cumsum(valid)))
+    cnonzero = np.concatenate(([0], np.cumsum(filled != 0)))
+    sums = csum[window:] - csum[:-window]
+    counts = cvalid[window:] - cvalid[:-window]
+    nonzero = cnonzero[window:] - cnonzero[:-window]
+    # Cửa sổ toàn số 0 phải ra đúng 0, không phải sai số làm tròn
+    return np.where(nonzero == 0, 0.0, sums), counts
+
+
+def _pad(values, length):
+    out = np.full(length, np.nan)
+    out[length - len(values):] = values
+    return out
+
+
+def rolling_mean(values, window):
+    if len(values) < window:
+        return np.full(len(values), np.nan)
+    sums, counts = _window_sums(values, window)
+    return _pad(np.where(counts == window, sums / window, np.nan), len(values))
+
+
+def rsi(values, window):
+    delta = np.concatenate(([np.nan], np.diff(values)))
+    # Giống delta.where(delta > 0, 0): NaN được thay bằng 0
+    gain = np.where(delta > 0, delta, 0.0)
+    loss = np.where(delta < 0, -delta, 0.0)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        rs = rolling_mean(gain, window) / rolling_mean(loss, window)
+        return 100 - (100 / (1 + rs))
+
+
+def _flat_windows(values, window):
+    # Cửa sổ mà mọi giá trị bằng nhau: phương sai đúng bằng 0 như pandas, không để sai số làm tròn còn sót
+    changes = np.concatenate(([1.0], (np.diff(values) != 0).astype(float)))
+    moved, _ = _window_sums(changes, window - 1)
+    return moved[1:] == 0
+
+
+def rolling_corr(x, y, window):
+    n = len(x)
+    if n < window:
+        return np.full(n, np.nan)
+    # Chỉ dùng các phiên có đủ cả hai giá trị, giống pandas
+    both = ~(np.isnan(x) | np.isnan(y))
+    # Trừ mức tham chiếu trước khi cộng dồn để tránh sai số khi bình phương giá lớn
+    x = np.where(both, x - np.nanmean(x[both]) if both.any() else x, np.nan)
+    y = np.where(both, y - np.nanmean(y[both]) if both.any() else y, np.nan)
+
+    sx, count = _window_sums(x, window)
+    sy, _ = _window_sums(y, window)
+    sxx, _ = _window_sums(x * x, window)
+    syy, _ = _window_sums(y * y, window)
+    sxy, _ = _window_sums(x * y, window)
+
+    cov = sxy - sx * sy / window
+    var_x = np.where(_flat_windows(x, window), 0.0, sxx - sx * sx / window)
+    var_y = np.where(_flat_windows(y, window), 0.0, syy - sy * sy / window)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        corr = cov / np.sqrt(var_x * var_y)
+    corr = np.where((count == window) & (var_x > 0) & (var_y > 0), corr, np.nan)
+    return _pad(corr, n)
+
+
+def forward_return(values, horizon):
+    out = np.full(len(values), np.nan)
+    if len(values) > horizon:
+        out[:-horizon] = values[horizon:] / values[:-horizon] - 1
+    return out
+
+
+def gold_dxy_frame(closes, engine=None):
+    # Bảng Gold/DXY kèm chỉ báo từ giá đóng cửa của kho dữ liệu (dùng cho Dashboard và bản dựng tĩnh)
+    df = pd.DataFrame(index=closes.index)
+    df['Gold'] = closes['GC=F']
+    df['DXY'] = closes['DX-Y.NYB']
+    engine = engine if engine is not None else IndicatorEngine()
+    engine.update(df)
+    return engine.frame().ffill().dropna()
+
+
+class IndicatorEngine:
+    def __init__(self, ma_window=200, rsi_window=14, corr_window=30, horizon=10):
+        self.ma_window = ma_window
+        self.rsi_window = rsi_window
+        self.corr_window = corr_window
+        self.horizon = horizon
+        # Phần đuôi cần giữ lại để tính tiếp cửa sổ lớn nhất (+1 phiên cho diff của RSI)
+        self.lookback = max(ma_window, rsi_window + 1, corr_window)
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        # Mảng cấp phát trước, tăng gấp đôi khi đầy: thêm N phiên chỉ ghi N ô ở đuôi (không sao chép lịch sử)
+        self._size = 0
+        self._ns = np.empty(0, dtype=np.int64)
+        self._columns = {name: np.empty(0) for name in OUTPUT_COLUMNS}
+
+    def __len__(self):
+        return self._size
+
+    @property
+    def index(self):
+        return pd.DatetimeIndex(self._ns[:self._size].view('M8[ns]'))
+
+    @property
+    def columns(self):
+        return {name: values[:self._size] for name, values in self._columns.items()}
+
+    def _reserve(self, size):
+        capacity = len(self._ns)
+        if size <= capacity:
+            return
+        # Chừa chỗ trống ngay từ lần dựng đầu để các lần thêm phiên sau không phải cấp phát lại
+        capacity = max(size + size // 4, 2 * capacity, 1024)
+        grown = np.empty(capacity, dtype=np.int64)
+        grown[:self._size] = self._ns[:self._size]
+        self._ns = grown
+        for name, values in self._columns.items():
+            grown = np.full(capacity, np.nan)
+            grown[:self._size] = values[:self._size]
+            self._columns[name] = grown
+
+    def _first_changed(self, frame):
+        # Vị trí đầu tiên mà dữ liệu mới khác dữ liệu đã tính (0 = tính lại từ đầu).
+        # Chỉ so sánh REVISION_DEPTH phiên cuối đã biết
+        known = self._size
+        if known == 0:
+            return 0
+        start = max(known - REVISION_DEPTH, 0)
+        if len(frame) < known:
+            return 0
+        new_ns = frame.index[max(start - 1, 0):known].as_unit('ns').asi8
+        old_ns = self._ns[max(start - 1, 0):known]
+        if start > 0 and new_ns[0] != old_ns[0]:
+            return 0
+        if start > 0:
+            new_ns, old_ns = new_ns[1:], old_ns[1:]
+        if not np.array_equal(new_ns, old_ns):
+            return start + int(np.flatnonzero(new_ns != old_ns)[0])
+
+        changed = np.zeros(known - start, dtype=bool)
+        for name in ('Gold', 'DXY'):
+            old = self._columns[name][start:known]
+            new = frame[name].iloc[start:known].to_numpy(dtype=float)
+            changed |= ~((old == new) | (np.isnan(old) & np.isnan(new)))
+        if changed.any():
+            return start + int(np.flatnonzero(changed)[0])
+        return known
+
+    def update(self, frame):
+        # frame: bảng có cột Gold, DXY theo ngày (toàn bộ lịch sử hiện có).
+        # Chỉ đọc các phiên từ vị trí thay đổi đầu tiên; chỉ báo tính trên đoạn đó cộng một cửa sổ đuôi
+        # (tổng tích lũy cục bộ của đoạn), nên thêm N phiên tốn O(N + cửa sổ), không phụ thuộc độ dài lịch sử
+        with self._lock:
+            pos = self._first_changed(frame)
+            if pos == len(frame) and pos == self._size:
+                return 0
+
+            size = len(frame)
+            self._reserve(size)
+            seg_start = max(pos - self.lookback, 0)
+            self._ns[pos:size] = frame.index[pos:].as_unit('ns').asi8
+            self._columns['Gold'][pos:size] = frame['Gold'].iloc[pos:].to_numpy(dtype=float)
+            self._columns['DXY'][pos:size] = frame['DXY'].iloc[pos:].to_numpy(dtype=float)
+            gold = self._columns['Gold'][seg_start:size]
+            dxy = self._columns['DXY'][seg_start:size]
+
+            offset = pos - seg_start
+            self._columns['MA200'][pos:size] = rolling_mean(gold, self.ma_window)[offset:]
+            self._columns['RSI'][pos:size] = rsi(gold, self.rsi_window)[offset:]
+            self._columns['Correlation'][pos:size] = rolling_corr(gold, dxy, self.corr_window)[offset:]
+
+            # Lợi suất kỳ hạn nhìn về tương lai: các phiên cuối cũ giờ đã có giá trị
+            ret_start = max(min(pos, self._size) - self.horizon, 0)
+            self._columns['Return_10d'][ret_start:size] = forward_return(
+                self._columns['Gold'][ret_start:size], self.horizon)
+            self._size = size
+            return size - pos
+
+    def frame(self):
+        # Bản sao độc lập (O(lịch sử)): các lần cập nhật sau ghi đè đuôi mảng tại chỗ
+        with self._lock:
+            size = self._size
+            return pd.DataFrame({name: self._columns[name][:size].copy() for name in OUTPUT_COLUMNS},
+                                index=pd.DatetimeIndex(self._ns[:size].copy().view('M8[ns]')))
@@ -0,0 +1,80 @@
+import numpy as np
+import pandas as pd
+
+# Mô phỏng Monte Carlo cho giá Vàng (USD) và tỷ giá USD/VND, quy đổi ra giá SJC.
+# Toàn bộ các đường giá được sinh cùng lúc dưới dạng mảng NumPy (số đường × số bước).
+
+TRADING_DAYS = 252
+PERCENTILES = (5, 25, 50, 75, 95)
+
+# Quy đổi USD/oz sang triệu VNĐ/lượng (giống công thức trên Dashboard)
+TAEL_PER_OZ = 1.205
+GRAMS_PER_OZ = 31.1035
+
+
+def sjc_price(gold_usd, usdvnd, premium_sjc):
+    return ((gold_usd * TAEL_PER_OZ) / GRAMS_PER_OZ * usdvnd) / 1000000 + premium_sjc
+
+
+def estimate_params(gold_series, usdvnd_series):
+    # Biến động năm hóa từ log-return theo ngày, chỉ dùng các phiên có cả hai giá (tính trên float64)
+    prices = pd.concat([gold_series, usdvnd_series], axis=1, join='inner').dropna().astype(float)
+    log_ret = np.log(prices).diff().dropna().to_numpy()
+    gold_ret, fx_ret = log_ret[:, 0], log_ret[:, 1]
+    return {
+        "gold_vol": float(gold_ret.std(ddof=1) * np.sqrt(TRADING_DAYS)),
+        "fx_drift": float(fx_ret.mean() * TRADING_DAYS),
+        "fx_vol": float(fx_ret.std(ddof=1) * np.sqrt(TRADING_DAYS)),
+        "rho": float(np.corrcoef(gold_ret, fx_ret)[0, 1]),
+    }
+
+
+def simulate(curr_gold_usd, curr_exchange_rate, pct_change, gold_vol, fx_drift, fx_vol, rho,
+             premium_sjc=0.0, capital=0.0, horizon_days=TRADING_DAYS, n_steps=52,
+             n_paths=20000, seed=2026):
+    rng = np.random.default_rng(seed)
+    dt = horizon_days / TRADING_DAYS / n_steps
+    rho = float(np.clip(np.nan_to_num(rho), -0.999, 0.999))
+
+    # Kỳ vọng giá vàng cuối kỳ = kịch bản pct_change (quy về năm)
+    years = horizon_days / TRADING_DAYS
+    gold_mu = np.log1p(pct_change / 100) / years - 0.5 * gold_vol ** 2
+
+    shocks = rng.standard_normal((2, n_paths, n_steps))
+    gold_shock = shocks[0]
+    fx_shock = shocks[1]
+    fx_shock *= np.sqrt(1 - rho ** 2)
+    fx_shock += rho * gold_shock
+
+    # Log-giá tích lũy theo từng bước, tính tại chỗ để hạn chế bộ nhớ
+    gold_shock *= gold_vol * np.sqrt(dt)
+    gold_shock += gold_mu * dt
+    log_gold = np.cumsum(gold_shock, axis=1, out=gold_shock)
+    fx_shock *= fx_vol * np.sqrt(dt)
+    fx_shock += (fx_drift - 0.5 * fx_vol ** 2) * dt
+    log_fx = np.cumsum(fx_shock, axis=1, out=fx_shock)
+
+    gold_paths = curr_gold_usd * np.exp(log_gold, out=log_gold)
+    fx_paths = curr_exchange_rate * np.exp(log_fx, out=log_fx)
+    sjc_paths = sjc_price(gold_paths, fx_paths, premium_sjc)
+
+    sjc_now = sjc_price(curr_gold_usd, curr_exchange_rate, premium_sjc)
+    pnl = capital * (sjc_paths[:, -1] / sjc_now - 1)
+
+    step_days = np.round(np.linspace(0, horizon_days, n_steps + 1)).astype(int)
+    return {
+        "step_days": step_days,
+        "percentiles": np.array(PERCENTILES),
+        "sjc_now": sjc_now,
+        # Dải quạt: hàng = phân vị, cột = bước (cột 0 là giá hiện tại)
+        "sjc_bands": np.column_stack([
+            np.full(len(PERCENTILES), sjc_now),
+            np.percentile(sjc_paths, PERCENTILES, axis=0),
+        ]),
+        "gold_bands": np.column_stack([
+            np.full(len(PERCENTILES), curr_gold_usd),
+            np.percentile(gold_paths, PERCENTILES, axis=0),
+        ]),
+        "pnl_percentiles": np.percentile(pnl, PERCENTILES),
+        "prob_loss": float((pnl < 0).mean()),
+    }
@@ -0,0 +1,287 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+# Định giá nhiều danh mục cùng lúc: hàng nghìn vị thế (vàng, S&P 500, tiền gửi VNĐ, ngoại tệ USD)
+# của nhiều tài khoản được định giá trên toàn bộ lịch sử giá trong một lượt vector hóa.
+# Vị thế được cộng dồn (bincount) vào ô (tài khoản, ngày vào) rồi tích lũy theo thời gian, nên chi phí là
+# O(tài khoản × số phiên) cho mỗi loại tài sản, không phụ thuộc số vị thế. Ma trận xếp theo tài khoản
+# (mỗi hàng một tài khoản liền bộ nhớ, cumsum theo hàng nhanh nhất) và lật thành DataFrame phiên × tài khoản
+# không sao chép.
+#
+# File vị thế (CSV hoặc Parquet), mỗi dòng một vị thế:
+#   account      tên tài khoản/danh mục (bỏ trống: "Danh mục")
+#   asset        gold (oz) | sp500 (đơn vị chỉ số) | fx (USD) | vnd_deposit (VNĐ gốc)
+#   quantity     số lượng theo đơn vị trên, hoặc
+#   amount       số tiền VNĐ bỏ ra ngày vào (thay cho quantity)
+#   entry_date   ngày vào (bỏ trống: phiên đầu tiên có giá)
+#   entry_price  giá vốn theo giá niêm yết: USD/oz, điểm, VNĐ/USD (bỏ trống: giá thị trường ngày vào)
+#   rate         lãi suất tiền gửi %/năm, lãi đơn (chỉ cho vnd_deposit)
+
+GOLD, SP500, FX, DEPOSIT = "gold", "sp500", "fx", "vnd_deposit"
+ASSETS = (GOLD, SP500, FX, DEPOSIT)
+ASSET_LABELS = {GOLD: "Vàng", SP500: "S&P 500", FX: "Ngoại tệ (USD)", DEPOSIT: "Tiền gửi VNĐ"}
+# Mã giá của các tài sản có giá thị trường; tiền gửi chỉ tính lãi
+PRICE_TICKERS = {GOLD: "GC=F", SP500: "^GSPC", FX: "VND=X"}
+FX_TICKER = "VND=X"
+CURRENCIES = ("VND", "USD")
+DEFAULT_ACCOUNT = "Danh mục"
+DAYS_PER_YEAR = 365
+
+POSITION_COLUMNS = ["account", "asset", "quantity", "amount", "entry_date", "entry_price", "rate"]
+
+
+def load_positions(source, name=None):
+    # source: đường dẫn hoặc file đã mở (ví dụ file tải lên của Streamlit); định dạng theo đuôi tên file
+    name = name or getattr(source, "name", None) or str(source)
+    if os.path.splitext(name)[1].lower() == ".parquet":
+        raw = pd.read_parquet(source)
+    else:
+        raw = pd.read_csv(source)
+    return normalize_positions(raw)
+
+
+def sample_positions():
+    # File mẫu cho người dùng tải về và điền vị thế của mình
+    return pd.DataFrame([
+        {"account": "Gia đình", "asset": GOLD, "quantity": 2.0, "entry_date": "2020-03-16", "entry_price": 1500.0},
+        {"account": "Gia đình", "asset": DEPOSIT, "amount": 500_000_000, "entry_date": "2023-01-03", "rate": 7.5},
+        {"account": "Cá nhân", "asset": SP500, "amount": 200_000_000, "entry_date": "2021-01-04"},
+        {"account": "Cá nhân", "asset": FX, "quantity": 5_000, "entry_date": "2022-06-01", "entry_price": 23_200},
+    ], columns=POSITION_COLUMNS)
+
+
+def channel_positions(amount, entry_date, rate):
+    # Cùng số vốn VNĐ vào từng kênh (mỗi kênh một tài khoản) để so sánh: tiền gửi hưởng `rate` %/năm
+    return pd.DataFrame({
+        "account": [ASSET_LABELS[asset] for asset in ASSETS],
+        "asset": ASSETS,
+        "amount": float(amount),
+        "entry_date": pd.Timestamp(entry_date),
+        "rate": [rate if asset == DEPOSIT else None for asset in ASSETS],
+    })
+
+
+def normalize_positions(raw):
+    df = raw.rename(columns=lambda c: str(c).strip().lower())
+    if "asset" not in df.columns or not ({"quantity", "amount"} & set(df.columns)):
+        raise ValueError("File vị thế cần cột 'asset' và một trong hai cột 'quantity' hoặc 'amount'")
+    df = df.reindex(columns=POSITION_COLUMNS)
+    df["asset"] = df["asset"].astype(str).str.strip().str.lower()
+    unknown = sorted(set(df["asset"]) - set(ASSETS))
+    if unknown:
+        raise ValueError(f"Loại tài sản không hỗ trợ: {', '.join(unknown)} (hỗ trợ: {', '.join(ASSETS)})")
+    df["account"] = df["account"].fillna(DEFAULT_ACCOUNT).astype(str)
+    for column in ("quantity", "amount", "entry_price", "rate"):
+        df[column] = pd.to_numeric(df[column], errors="coerce")
+    df["entry_date"] = pd.to_datetime(df["entry_date"], errors="coerce")
+    if (df["quantity"].isna() & df["amount"].isna()).any():
+        raise ValueError("Mỗi vị thế cần 'quantity' hoặc 'amount'")
+    return df
+
+
+def _accumulate(out, rows, cols, weights):
+    # Tổng tích lũy theo phiên của các khoản đặt vào ô (tài khoản, phiên vào), ghi đè lên `out`
+    out.fill(0.0)
+    np.add.at(out, (rows, cols), weights)
+    return np.cumsum(out, axis=1, out=out)
+
+
+def _holders(account_codes, mask, n_accounts):
+    # Các tài khoản có vị thế trong nhóm `mask` và chỉ số hàng của từng vị thế trong khối của chúng.
+    # Khi quá nửa số tài khoản cùng nắm giữ, tính thẳng trên mọi tài khoản (cộng theo hàng chọn lọc tốn gấp ba)
+    rows, local = np.unique(account_codes[mask], return_inverse=True)
+    if 2 * len(rows) > n_accounts:
+        return np.arange(n_accounts), account_codes[mask]
+    return rows, local
+
+
+def _add_rows(out, rows, block):
+    # Cộng khối của các tài khoản nắm giữ vào ma trận mọi tài khoản
+    if len(rows) == len(out):
+        out += block
+    else:
+        out[rows] += block
+
+
+def _growth(value, rows, cols, flows, scratch=None):
+    # Lợi suất theo thời gian và mức sụt giảm từ đỉnh của chỉ số tăng trưởng; value: (tài khoản, phiên).
+    # Dòng tiền vào thưa (chỉ ở ô vào lệnh) nên được trừ riêng: (V_t - F_t) / V_t-1 = V_t / V_t-1 - F_t / V_t-1
+    # Tỷ lệ V_t / V_t-1; phiên trước chưa có vốn giữ 1 (lợi suất 0)
+    ratio = np.ones(value.shape)
+    prev = value[:, :-1]
+    held = prev > 0
+    np.divide(value[:, 1:], prev, out=ratio[:, 1:], where=held)
+    later = cols > 0
+    rows, cols, flows = rows[later], cols[later], flows[later]
+    base = value[rows, cols - 1]
+    ok = base > 0
+    np.subtract.at(ratio, (rows[ok], cols[ok]), flows[ok] / base[ok])
+    growth = np.cumprod(ratio, axis=1)
+    ratio -= 1
+    peak = np.maximum.accumulate(growth, axis=1, out=scratch)
+    drawdown = np.divide(growth, peak, out=growth)
+    drawdown -= 1
+    return ratio, drawdown
+
+
+class PortfolioEngine:
+    # Giá dùng chung cho mọi lần định giá: giá trị VNĐ của một đơn vị mỗi tài sản theo từng phiên
+    def __init__(self, closes):
+        prices = closes[list(PRICE_TICKERS.values())].astype(float).ffill().dropna()
+        self.index = prices.index
+        self.fx = prices[FX_TICKER].to_numpy()
+        # Vàng và S&P 500 niêm yết bằng USD: quy đổi qua tỷ giá từng phiên
+        self.unit_vnd = {
+            GOLD: prices[PRICE_TICKERS[GOLD]].to_numpy() * self.fx,
+            SP500: prices[PRICE_TICKERS[SP500]].to_numpy() * self.fx,
+            FX: self.fx,
+        }
+        self.days = ((self.index - self.index[0]) / pd.Timedelta(days=1)).to_numpy(dtype=float)
+
+    def __len__(self):
+        return len(self.index)
+
+    def value(self, positions, currency="VND", start=None):
+        # Định giá mọi vị thế từ `start` (mặc định: ngày vào sớm nhất) tới phiên cuối
+        if currency not in CURRENCIES:
+            raise ValueError(f"Tiền tệ báo cáo không hợp lệ: {currency} ({', '.join(CURRENCIES)})")
+        pos = normalize_positions(positions)
+        n_total = len(self.index)
+        entry_dates = pos["entry_date"].fillna(self.index[0])
+        entry = self.index.searchsorted(entry_dates.to_numpy())
+        # Vị thế vào sau phiên cuối chưa được định giá
+        pos, entry = pos[entry < n_total], entry[entry < n_total]
+        if pos.empty:
+            raise ValueError("Không có vị thế nào trong khoảng có giá")
+
+        asset = pos["asset"].to_numpy()
+        account_codes, accounts = pd.factorize(pos["account"])
+        rate = pos["rate"].fillna(0.0).to_numpy() / 100
+        is_deposit = asset == DEPOSIT
+
+        # Giá trị VNĐ một đơn vị ngày vào (tiền gửi: 1 VNĐ gốc) -> số lượng khi file cho số tiền
+        unit_entry = np.ones(len(pos))
+        for name, unit in self.unit_vnd.items():
+            mask = asset == name
+            unit_entry[mask] = unit[entry[mask]]
+        quantity = pos["quantity"].to_numpy().copy()
+        missing = np.isnan(quantity)
+        quantity[missing] = pos["amount"].to_numpy()[missing] / unit_entry[missing]
+
+        # Giá vốn VNĐ: theo giá vốn niêm yết (USD quy đổi tại tỷ giá ngày vào) hoặc giá thị trường ngày vào
+        entry_price = pos["entry_price"].to_numpy()
+        quote_fx = np.where(np.isin(asset, [GOLD, SP500]), self.fx[entry], 1.0)
+        cost_vnd = np.where(np.isnan(entry_price) | is_deposit, quantity * unit_entry, quantity * entry_price * quote_fx)
+
+        t0 = int(entry.min()) if start is None else int(self.index.searchsorted(pd.Timestamp(start)))
+        t0 = min(t0, n_total - 1)
+        n = n_total - t0
+        shape = (len(accounts), n)
+        # Vị thế vào trước `start` xuất hiện ở phiên đầu của khoảng với giá trị thị trường lúc đó
+        seen = np.maximum(entry, t0)
+        col = seen - t0
+        days = self.days[t0:]
+
+        # Một vùng nhớ tạm dùng lại cho mọi tổng tích lũy: ma trận lớn nên tránh cấp phát mới mỗi bước.
+        # Mỗi loại tài sản chỉ tính trên các tài khoản có nắm giữ loại đó
+        scratch = np.empty(shape)
+        value = np.zeros(shape)
+        seen_value = np.empty(len(pos))
+        last_value = np.empty(len(pos))
+        for name, unit in self.unit_vnd.items():
+            mask = asset == name
+            if mask.any():
+                rows, local = _holders(account_codes, mask, len(accounts))
+                held = _accumulate(scratch[:len(rows)], local, col[mask], quantity[mask])
+                held *= unit[t0:]
+                _add_rows(value, rows, held)
+                seen_value[mask] = quantity[mask] * unit[seen[mask]]
+                last_value[mask] = quantity[mask] * unit[-1]
+        if is_deposit.any():
+            # Lãi đơn: gốc × (1 + lãi suất × (ngày - ngày vào) / 365)
+            #        = Σ(gốc - gốc × lãi × ngày vào / 365) + ngày × Σ(gốc × lãi / 365): hai tổng tích lũy
+            m = is_deposit
+            principal = quantity[m]
+            entry_days = self.days[entry[m]]
+            accrual = principal * rate[m] / DAYS_PER_YEAR
+            rows, local = _holders(account_codes, m, len(accounts))
+            block = scratch[:len(rows)]
+            _add_rows(value, rows, _accumulate(block, local, col[m], principal - accrual * entry_days))
+            interest = _accumulate(block, local, col[m], accrual)
+            interest *= days
+            _add_rows(value, rows, interest)
+            seen_value[m] = principal + accrual * (self.days[seen[m]] - entry_days)
+            last_value[m] = principal + accrual * (self.days[-1] - entry_days)
+
+        cost, flows = cost_vnd, seen_value
+        if currency == "USD":
+            # Giá trị theo tỷ giá từng phiên, giá vốn theo tỷ giá ngày vào
+            value /= self.fx[t0:]
+            cost = cost_vnd / self.fx[entry]
+            flows = seen_value / self.fx[seen]
+            last_value = last_value / self.fx[-1]
+
+        positions_out = pos.assign(quantity=quantity, cost=cost, value=last_value, pnl=last_value - cost)
+        return PortfolioResult(
+            index=self.index[t0:], accounts=accounts, currency=currency, value=value, cost=cost,
+            rows=account_codes, cols=col, flows=flows, positions=positions_out, scratch=scratch,
+        )
+
+
+class PortfolioResult:
+    # Chuỗi theo tài khoản (mỗi cột một tài khoản) và tổng của mọi tài khoản.
+    # cost: giá vốn của từng vị thế, đặt vào ô (rows, cols) = (tài khoản, phiên vào)
+    def __init__(self, index, accounts, currency, value, cost, rows, cols, flows, positions, scratch=None):
+        self.index = index
+        self.accounts = list(accounts)
+        self.currency = currency
+        self.positions = positions
+        self._cost_cells = (rows, cols, cost)
+        self._cost = self._pnl = None
+        returns, drawdown = _growth(value, rows, cols, flows, scratch)
+        self.value = self._frame(value)
+        self.returns = self._frame(returns)
+        self.drawdown = self._frame(drawdown)
+
+        # Vốn cuối kỳ theo tài khoản và vốn tổng theo phiên không cần ma trận đầy đủ
+        self.final_cost = pd.Series(np.bincount(rows, weights=cost, minlength=len(self.accounts)), index=self.accounts)
+        total_value = value.sum(axis=0)
+        total_cost = np.cumsum(np.bincount(cols, weights=cost, minlength=len(index)))
+        total_returns, total_drawdown = _growth(total_value[None], np.zeros_like(cols), cols, flows)
+        total_returns, total_drawdown = total_returns[0], total_drawdown[0]
+        self.total = pd.DataFrame({"value": total_value, "cost": total_cost, "pnl": total_value - total_cost,
+                                   "return": total_returns, "drawdown": total_drawdown}, index=index)
+
+    def _frame(self, values):
+        # (tài khoản × phiên) -> DataFrame phiên × tài khoản, không sao chép
+        return pd.DataFrame(values.T, index=self.index, columns=self.accounts, copy=False)
+
+    @property
+    def cost(self):
+        # Vốn tích lũy theo phiên của từng tài khoản: chỉ dựng ma trận khi được đọc
+        if self._cost is None:
+            rows, cols, weights = self._cost_cells
+            cost = _accumulate(np.empty((len(self.accounts), len(self.index))), rows, cols, weights)
+            self._cost = self._frame(cost)
+        return self._cost
+
+    @property
+    def pnl(self):
+        if self._pnl is None:
+            self._pnl = self.value - self.cost
+        return self._pnl
+
+    def summary(self):
+        value, cost = self.value.iloc[-1], self.final_cost
+        with np.errstate(divide="ignore", invalid="ignore"):
+            pnl_pct = (value - cost) / cost * 100
+        return pd.DataFrame({
+            "Giá trị": value,
+            "Vốn": cost,
+            "Lời / Lỗ": value - cost,
+            "Lời / Lỗ (%)": pnl_pct,
+            "Sụt giảm tối đa (%)": self.drawdown.min() * 100,
+            "Số vị thế": self.positions.groupby("account").size().reindex(self.accounts),
+        }).rename_axis("Tài khoản")
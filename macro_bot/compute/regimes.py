@@ -0,0 +1,231 @@
+import numpy as np
+import pandas as pd
+
+from macro_bot.compute import backtest
+
+# Bộ luật "Vật cực tất phản": mỗi luật so một chuỗi với ngưỡng trên/dưới. Mọi luật của một bảng dữ liệu
+# được tính cho toàn bộ lịch sử trong một lượt so sánh ma trận (phiên × luật), cho ra dòng thời gian chế độ
+# (Vật cực / Trung tính / Tất phản) nén thành các đoạn liên tiếp. Kèm tổng tích lũy số lần trúng theo từng chế độ,
+# nên chế độ hiện tại, các đoạn trong một khoảng ngày và tỉ lệ trúng lịch sử đều tra bằng searchsorted O(log n).
+
+EXTREME, NEUTRAL, REVERSAL = 1, 0, -1
+REGIME_LABELS = {EXTREME: "Vật cực", NEUTRAL: "Trung tính", REVERSAL: "Tất phản"}
+SCORED_REGIMES = (EXTREME, REVERSAL)
+
+
+class Rule:
+    # Vượt trên `upper` -> chế độ `above`, dưới `lower` -> chế độ `below`, còn lại Trung tính.
+    # Trúng khi chuỗi `outcome` sau `horizon` phiên đi đúng hướng kỳ vọng: mặc định giảm sau khi vượt trên
+    # và tăng sau khi xuống dưới (tất phản); `relative` tính thay đổi theo % thay vì theo giá trị.
+    # `inclusive`: chạm đúng ngưỡng cũng tính (>= / <=), dùng khi bản gốc so sánh như vậy.
+    def __init__(self, name, column, upper=None, lower=None, above=EXTREME, below=REVERSAL, label=None,
+                 outcome=None, horizon=10, expect_above=-1, expect_below=1, relative=True, inclusive=False):
+        self.name = name
+        self.column = column
+        self.upper = upper
+        self.lower = lower
+        self.above = above
+        self.below = below
+        self.label = label or name
+        self.outcome = outcome
+        self.horizon = horizon
+        self.expect_above = expect_above
+        self.expect_below = expect_below
+        self.relative = relative
+        self.inclusive = inclusive
+
+    def classify(self, value):
+        # Chế độ của một giá trị đơn lẻ (ví dụ lãi suất thực từ thanh trượt), cùng ngưỡng với dòng thời gian
+        codes = _classify(np.asarray([value], dtype=float), *_thresholds([self]))[0]
+        return int(codes[0])
+
+
+def _thresholds(rules):
+    return (
+        np.array([np.inf if r.upper is None else r.upper for r in rules]),
+        np.array([-np.inf if r.lower is None else r.lower for r in rules]),
+        np.array([r.above for r in rules], dtype=np.int8),
+        np.array([r.below for r in rules], dtype=np.int8),
+        np.array([r.inclusive for r in rules], dtype=bool),
+    )
+
+
+def _classify(values, upper, lower, above, below, inclusive):
+    # NaN so sánh ra False nên phiên thiếu dữ liệu là Trung tính
+    is_above = np.where(inclusive, values >= upper, values > upper)
+    is_below = np.where(inclusive, values <= lower, values < lower)
+    return np.where(is_above, above, np.where(is_below, below, NEUTRAL)).astype(np.int8), is_above, is_below
+
+
+def _forward_change(values, horizon, relative):
+    out = np.full(len(values), np.nan)
+    if horizon < len(values):
+        future, current = values[horizon:], values[:-horizon]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            out[:-horizon] = future / current - 1 if relative else future - current
+    return out
+
+
+def _prefix(values):
+    # Tổng tích lũy theo phiên, thêm hàng 0 ở đầu: tổng của [i, j) = c[j] - c[i]
+    return np.concatenate((np.zeros((1,) + values.shape[1:]), np.cumsum(values, axis=0)))
+
+
+class RegimeTimeline:
+    def __init__(self, frame, rules):
+        self.index = frame.index
+        self.rules = list(rules)
+        self._columns = {rule.name: j for j, rule in enumerate(self.rules)}
+        # Mốc theo nano giây như Timestamp.value (chỉ mục đọc từ Parquet có thể ở đơn vị micro giây)
+        self._times = pd.DatetimeIndex(frame.index).as_unit("ns").asi8
+
+        values = np.column_stack([frame[rule.column].to_numpy(dtype=float) for rule in self.rules])
+        self.codes, is_above, is_below = _classify(values, *_thresholds(self.rules))
+
+        # Thay đổi của chuỗi kết quả sau `horizon` phiên và hướng kỳ vọng tại mỗi phiên
+        change = np.column_stack([
+            _forward_change(frame[rule.outcome or rule.column].to_numpy(dtype=float), rule.horizon, rule.relative)
+            for rule in self.rules
+        ])
+        expect = np.where(is_above, [r.expect_above for r in self.rules],
+                          np.where(is_below, [r.expect_below for r in self.rules], 0))
+        scored = (expect != 0) & ~np.isnan(change)
+        hit = scored & (np.sign(change) == expect)
+        self._events, self._hits, self._change = {}, {}, {}
+        for code in SCORED_REGIMES:
+            in_regime = (self.codes == code) & scored
+            self._events[code] = _prefix(in_regime.astype(np.int64))
+            self._hits[code] = _prefix((in_regime & hit).astype(np.int64))
+            self._change[code] = _prefix(np.where(in_regime, change, 0.0))
+
+        # Đoạn liên tiếp cùng chế độ (run-length): vị trí bắt đầu của từng đoạn
+        self._starts = {
+            rule.name: np.concatenate(([0], np.flatnonzero(np.diff(self.codes[:, j])) + 1))
+            for j, rule in enumerate(self.rules)
+        }
+
+    def __len__(self):
+        return len(self.index)
+
+    def rule(self, name):
+        return self.rules[self._columns[name]]
+
+    def _bounds(self, start=None, end=None):
+        # [lo, hi): các phiên từ `start` tới hết ngày `end`
+        lo = 0 if start is None else int(np.searchsorted(self._times, pd.Timestamp(start).value, side="left"))
+        if end is None:
+            hi = len(self._times)
+        else:
+            end = pd.Timestamp(end).normalize() + pd.Timedelta(days=1)
+            hi = int(np.searchsorted(self._times, end.value, side="left"))
+        return lo, max(lo, hi)
+
+    def current(self, name):
+        return int(self.codes[-1, self._columns[name]]) if len(self) else NEUTRAL
+
+    def at(self, name, date):
+        pos = int(np.searchsorted(self._times, pd.Timestamp(date).value, side="right")) - 1
+        return int(self.codes[pos, self._columns[name]]) if pos >= 0 else NEUTRAL
+
+    def hit_rate(self, name, code, start=None, end=None):
+        # Số phiên ở chế độ `code` có kết quả, số lần trúng, tỉ lệ trúng (%) và thay đổi trung bình của chuỗi kết quả
+        j = self._columns[name]
+        lo, hi = self._bounds(start, end)
+        events = int(self._events[code][hi, j] - self._events[code][lo, j])
+        hits = int(self._hits[code][hi, j] - self._hits[code][lo, j])
+        change = float(self._change[code][hi, j] - self._change[code][lo, j])
+        return {
+            "events": events,
+            "hits": hits,
+            "hit_rate": hits / events * 100 if events else np.nan,
+            "avg_change": change / events if events else np.nan,
+        }
+
+    def segments(self, name, start=None, end=None):
+        # Các đoạn chế độ giao với khoảng ngày, cắt theo biên của khoảng
+        starts = self._starts[name]
+        lo, hi = self._bounds(start, end)
+        if lo >= hi:
+            return pd.DataFrame(columns=["Bắt đầu", "Kết thúc", "Chế độ", "Số phiên"])
+        first = int(np.searchsorted(starts, lo, side="right")) - 1
+        last = int(np.searchsorted(starts, hi, side="left"))
+        seg_starts = np.maximum(starts[first:last], lo)
+        seg_ends = np.minimum(np.append(starts[first + 1:last], hi), hi)
+        codes = self.codes[seg_starts, self._columns[name]]
+        return pd.DataFrame({
+            "Bắt đầu": self.index[seg_starts],
+            "Kết thúc": self.index[seg_ends - 1],
+            "Chế độ": [REGIME_LABELS[int(c)] for c in codes],
+            "Số phiên": seg_ends - seg_starts,
+        })
+
+    def summary(self, start=None, end=None):
+        # Tỉ lệ trúng của mọi luật × chế độ trong khoảng ngày
+        rows = []
+        for rule in self.rules:
+            for code in SCORED_REGIMES:
+                stats = self.hit_rate(rule.name, code, start, end)
+                if stats["events"]:
+                    rows.append({"Luật": rule.label, "Chế độ": REGIME_LABELS[code], "Số phiên": stats["events"],
+                                 "Tỉ lệ trúng (%)": stats["hit_rate"],
+                                 "Sau (kỳ)": rule.horizon, "Thay đổi TB": stats["avg_change"]})
+        return pd.DataFrame(rows)
+
+
+# --- Luật của từng Dashboard ---
+
+# Trang Vàng SJC: lãi suất thực (lãi suất huy động - lạm phát dự kiến) từ thanh trượt
+REAL_IR_RULE = Rule("real_ir", "Real_IR", upper=4, lower=0, above=REVERSAL, below=EXTREME,
+                    label="Lãi suất thực (%)")
+
+# Trang Vàng & DXY: RSI 70/30, lệch MA200 ±12%, tương quan Vàng/DXY ±0.5; chấm theo giá vàng sau 10 phiên.
+# Bản gốc coi |lệch MA200| < 12 là an toàn nên đúng ±12 đã là cảnh báo (inclusive); các luật khác so sánh chặt
+GOLD_RULES = [
+    Rule("rsi", "rsi", upper=70, lower=30, outcome="Gold", label="RSI 14 phiên"),
+    Rule("ma200_dev", "ma200_dev", upper=12, lower=-12, below=EXTREME, outcome="Gold", label="Lệch MA200 (%)",
+         inclusive=True),
+    # Tương quan dương bất thường là Vật cực, trở về nghịch đảo chuẩn là Tất phản; chấm theo chính tương quan
+    Rule("correlation", "correlation", upper=0.5, lower=-0.5, outcome="correlation", relative=False,
+         label="Tương quan Vàng/DXY"),
+]
+
+
+def gold_inputs(df):
+    # df là kết quả của get_advanced_data(); cùng công thức tín hiệu với bộ quét backtest
+    return pd.DataFrame(dict(backtest.signal_values(df), Gold=df['Gold'].to_numpy(dtype=float)), index=df.index)
+
+
+# Trang Lãi suất: lệch ±1.5 điểm % so với trung bình trượt của khoảng xem; chấm theo lãi suất sau 12 tháng
+RATE_BAND = 1.5
+RATE_HORIZON = 12
+DEVIATION_SUFFIX = " (lệch TB)"
+
+
+def rate_inputs(levels, years, periods_per_year=12):
+    # levels: lãi suất theo tháng, mỗi cột một đồng tiền; trung bình trượt `years` năm (ít hơn thì dùng phần đã có)
+    mean = levels.rolling(years * periods_per_year, min_periods=1).mean()
+    return pd.concat([levels, (levels - mean).add_suffix(DEVIATION_SUFFIX)], axis=1)
+
+
+def rate_rules(names, band=RATE_BAND, horizon=RATE_HORIZON):
+    return [Rule(name, f"{name}{DEVIATION_SUFFIX}", upper=band, lower=-band, outcome=name, horizon=horizon,
+                 relative=False, label=name) for name in names]
+
+
+# Trang Vĩ mô Việt Nam: chênh lệch Tín dụng - M2 > 2, tỷ giá tăng > 3%/năm, M2 > 14% khi VN-Index < 1300;
+# chấm theo VN-Index sau 12 tháng
+VN_RULES = [
+    Rule("credit_spread", "Credit_Spread", upper=2, outcome="VNIndex", horizon=12, label="Tín dụng - M2 (điểm %)"),
+    Rule("fx_change", "FX_Change_12M", upper=3, outcome="VNIndex", horizon=12, label="Tỷ giá 12 tháng (%)"),
+    Rule("m2_opportunity", "M2_Opportunity", upper=0.5, above=REVERSAL, expect_above=1, outcome="VNIndex",
+         horizon=12, label="M2 > 14% & VN-Index < 1300"),
+]
+
+
+def vn_inputs(df):
+    return pd.DataFrame({
+        "Credit_Spread": df['Credit_Growth'] - df['M2_Growth'],
+        "FX_Change_12M": df['USDVND'].pct_change(12) * 100,
+        "M2_Opportunity": ((df['M2_Growth'] > 14) & (df['VNIndex'] < 1300)).astype(float),
+        "VNIndex": df['VNIndex'],
+    }, index=df.index)
@@ -0,0 +1,69 @@
+import numpy as np
+import pandas as pd
+
+# Các khoảng xem định sẵn của thanh trượt (1Y…50Y), tính lùi từ ngày mới nhất của cả bộ dữ liệu.
+# Với mỗi bản dữ liệu, vị trí bắt đầu và thống kê (hiện tại, trung bình, đỉnh) của mọi khoảng được tính
+# một lần qua tổng tích lũy và đỉnh tích lũy từ cuối chuỗi: kéo thanh trượt chỉ còn là tra từ điển
+# và cắt iloc (không sao chép), thay cho df.last() (đã bỏ ở pandas 2.x) hay tính lại trên cả chuỗi.
+
+
+def period_years(period):
+    # "20Y" -> 20
+    return int(period[:-1])
+
+
+def _offsets(index, starts):
+    index = pd.DatetimeIndex(index)
+    return {period: int(index.searchsorted(start)) for period, start in starts.items()}
+
+
+class WindowIndex:
+    def __init__(self, series, periods, end=None):
+        # series: DataFrame (các cột chung một chỉ mục) hoặc {tên: Series} (mỗi chuỗi một chỉ mục và tần suất riêng)
+        items = dict(series.items())
+        self.periods = list(periods)
+        self.names = list(items)
+        self.end = pd.Timestamp(end) if end is not None else max(values.index[-1] for values in items.values())
+        self.starts = {period: self.end - pd.DateOffset(years=period_years(period)) for period in self.periods}
+        self.frame_offsets = _offsets(series.index, self.starts) if isinstance(series, pd.DataFrame) else None
+        self.offsets = {}
+        self._stats = {}
+        for name, values in items.items():
+            self.offsets[name] = offsets = _offsets(values.index, self.starts)
+            self._stats[name] = self._window_stats(values, offsets)
+
+    @staticmethod
+    def _window_stats(values, offsets):
+        data = values.to_numpy(dtype=float)
+        valid = ~np.isnan(data)
+        n = len(data)
+        csum = np.concatenate(([0.0], np.cumsum(np.where(valid, data, 0.0))))
+        count = np.concatenate(([0], np.cumsum(valid)))
+        # Đỉnh của đoạn [i, n) cho mọi i (fmax bỏ qua NaN)
+        suffix_max = np.append(np.fmax.accumulate(data[::-1])[::-1], np.nan)
+        last = int(np.flatnonzero(valid)[-1]) if valid.any() else None
+        stats = {}
+        for period, pos in offsets.items():
+            k = int(count[n] - count[pos])
+            stats[period] = {
+                "current": float(data[last]) if last is not None else np.nan,
+                "mean": float((csum[n] - csum[pos]) / k) if k else np.nan,
+                "max": float(suffix_max[pos]),
+                "last": values.index[last] if last is not None else None,
+                "count": k,
+            }
+        return stats
+
+    def start(self, period):
+        return self.starts[period]
+
+    def stats(self, name, period):
+        return self._stats[name][period]
+
+    def slice(self, values, name, period):
+        # values: chính chuỗi đã dùng để dựng (hoặc cùng chỉ mục)
+        return values.iloc[self.offsets[name][period]:]
+
+    def view(self, frame, period):
+        # frame: chính bảng đã dùng để dựng
+        return frame.iloc[self.frame_offsets[period]:]
@@ -0,0 +1,5 @@
+import os
+
+# Thư mục dữ liệu cục bộ (giá Parquet, cache FRED, cache dùng chung, file chỉ số), mặc định ở gốc repo
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DATA_DIR = os.environ.get("MACRO_BOT_DATA_DIR", os.path.join(ROOT_DIR, ".market_data"))
@@ -0,0 +1 @@
+# Tầng dữ liệu: kho giá yfinance, chuỗi FRED, bộ nhớ đệm dùng chung và luồng làm mới nền
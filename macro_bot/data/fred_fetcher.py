@@ -0,0 +1,236 @@
+import io
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from macro_bot.config import DATA_DIR
+from macro_bot.data import sources
+
+FRED_CSV_URL = "https://fred.stlouisfed.org/graph/fredgraph.csv"
+
+# Danh mục mã lãi suất
+RATE_SERIES = {
+    "10 Năm (Dài hạn)": {
+        "USD (Mỹ)": "DGS10",
+        "EUR (Châu Âu)": "IRLTLT01EZM156N",
+        "JPY (Nhật Bản)": "IRLTLT01JPM156N",
+        "GBP (Anh)": "IRLTLT01GBM156N",
+        "CNY (Trung Quốc)": "CHNYLD10Y"
+    },
+    "2 Năm (Ngắn hạn)": {
+        "USD (Mỹ)": "DGS2",
+        "EUR (Châu Âu)": "IRT3TR01EZM156N",
+        "JPY (Nhật Bản)": "IR3TIB01JPM156N",
+        "GBP (Anh)": "IRT3TR01GBM156N",
+        "CNY (Trung Quốc)": "CHNRYLD2Y"
+    }
+}
+
+
+class FredFetcher:
+    # Tải nhiều chuỗi FRED song song qua nguồn dữ liệu (trực tiếp: một session dùng chung giữ kết nối HTTPS),
+    # gửi ETag/If-Modified-Since để chuỗi không đổi trả về 304 thay vì tải lại cả file.
+
+    def __init__(self, base_url=FRED_CSV_URL, cache_dir=None, max_workers=8, timeout=30, source=None):
+        self.base_url = base_url
+        self.source = source or sources.get_source()
+        self.cache_dir = cache_dir or os.path.join(DATA_DIR, "fred")
+        self.max_workers = max_workers
+        self.timeout = timeout
+        self.last_stats = {}
+        self._lock = threading.Lock()
+
+    def _paths(self, series_id):
+        return (
+            os.path.join(self.cache_dir, f"{series_id}.csv"),
+            os.path.join(self.cache_dir, f"{series_id}.json"),
+        )
+
+    def _read_cached(self, series_id):
+        csv_path, meta_path = self._paths(series_id)
+        if not (os.path.exists(csv_path) and os.path.exists(meta_path)):
+            return None, {}
+        with open(meta_path) as f:
+            meta = json.load(f)
+        with open(csv_path, "rb") as f:
+            body = f.read()
+        return body, meta
+
+    def _write_cached(self, series_id, body, meta):
+        csv_path, meta_path = self._paths(series_id)
+        os.makedirs(self.cache_dir, exist_ok=True)
+        # Ghi file tạm rồi đổi tên để tránh đọc phải file dở dang
+        for path, data, mode in ((csv_path, body, "wb"), (meta_path, json.dumps(meta), "w")):
+            tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp_path, mode) as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+
+    @staticmethod
+    def _parse(body):
+        data = pd.read_csv(io.BytesIO(body), index_col=0, parse_dates=True, na_values='.')
+        return data if not data.empty else pd.DataFrame()
+
+    def fetch(self, series_id):
+        started = time.perf_counter()
+        cached_body, meta = self._read_cached(series_id)
+
+        headers = {}
+        if cached_body is not None:
+            if meta.get("etag"):
+                headers["If-None-Match"] = meta["etag"]
+            if meta.get("last_modified"):
+                headers["If-Modified-Since"] = meta["last_modified"]
+
+        stats = {"status": None, "bytes": 0, "latency": 0.0, "error": None}
+        try:
+            status, content, resp_headers = self.source.fred_csv(self.base_url, series_id, headers, self.timeout)
+            stats["status"] = status
+            if status == 304 and cached_body is not None:
+                body = cached_body
+            else:
+                body = content
+                stats["bytes"] = len(body)
+                self._write_cached(series_id, body, {
+                    "etag": resp_headers.get("ETag"),
+                    "last_modified": resp_headers.get("Last-Modified"),
+                })
+            data = self._parse(body)
+        except Exception as error:
+            stats["error"] = str(error)
+            # Mất kết nối: dùng bản đã lưu nếu có
+            data = self._parse(cached_body) if cached_body is not None else pd.DataFrame()
+
+        stats["latency"] = time.perf_counter() - started
+        with self._lock:
+            self.last_stats[series_id] = stats
+        return data
+
+    def fetch_many(self, series_ids):
+        series_ids = list(dict.fromkeys(series_ids))
+        if not series_ids:
+            return {}
+        workers = min(self.max_workers, len(series_ids))
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            frames = list(pool.map(self.fetch, series_ids))
+        return dict(zip(series_ids, frames))
+
+
+# Tần suất gốc suy ra từ khoảng cách trung vị giữa hai quan sát (số ngày tối đa)
+FREQUENCIES = [("D", 4), ("W", 10), ("M", 45), ("Q", 120), ("A", None)]
+FREQ_ORDER = [freq for freq, _ in FREQUENCIES]
+FREQ_LABELS = {"D": "Ngày", "W": "Tuần", "M": "Tháng", "Q": "Quý", "A": "Năm"}
+PERIODS_PER_YEAR = {"D": 252, "W": 52, "M": 12, "Q": 4, "A": 1}
+# Nhãn đầu kỳ, khớp quy ước của chuỗi tháng/quý OECD trên FRED
+RESAMPLE_RULES = {"W": "W", "M": "MS", "Q": "QS", "A": "YS"}
+
+
+def infer_frequency(index):
+    if len(index) < 2:
+        return "D"
+    gap = np.median(np.diff(index.asi8)) / 86400e9
+    for freq, max_gap in FREQUENCIES:
+        if max_gap is None or gap <= max_gap:
+            return freq
+
+
+def plot_frequency(start, end, max_points=2000):
+    # Tần suất mịn nhất mà khoảng đang xem không vượt quá max_points điểm mỗi đường
+    years = max((pd.Timestamp(end) - pd.Timestamp(start)).days, 1) / 365.25
+    for freq in FREQ_ORDER:
+        if years * PERIODS_PER_YEAR[freq] <= max_points:
+            return freq
+    return FREQ_ORDER[-1]
+
+
+class SeriesCatalog:
+    # Mỗi chuỗi giữ nguyên tần suất và độ dài gốc (không ffill lên ngày, không cắt theo chuỗi ngắn nhất);
+    # chỉ gộp về tần suất thô hơn khi vẽ, tính lười và giữ lại cho lần sau
+    def __init__(self, series, series_ids=None):
+        self.series = {}
+        self.info = {}
+        self._resampled = {}
+        for name, values in series.items():
+            # float32: lợi suất chỉ có 2-4 chữ số thập phân, danh mục nằm trong bản chụp suốt thời gian chạy
+            values = values.dropna().astype(np.float32).sort_index()
+            if values.empty:
+                continue
+            self.series[name] = values
+            self.info[name] = {
+                "series_id": (series_ids or {}).get(name, name),
+                "freq": infer_frequency(values.index),
+                "first": values.index[0],
+                "last": values.index[-1],
+                "count": len(values),
+            }
+
+    @classmethod
+    def from_frames(cls, frames, symbols):
+        # frames: {mã FRED: bảng một cột}, symbols: {tên hiển thị: mã FRED}
+        series = {name: frames[sid].iloc[:, 0] for name, sid in symbols.items()
+                  if not frames.get(sid, pd.DataFrame()).empty}
+        return cls(series, series_ids=dict(symbols))
+
+    @property
+    def names(self):
+        return list(self.series)
+
+    @property
+    def first_date(self):
+        return min(info["first"] for info in self.info.values())
+
+    @property
+    def last_date(self):
+        return max(info["last"] for info in self.info.values())
+
+    def __len__(self):
+        return len(self.series)
+
+    def get(self, name, freq=None, start=None):
+        values = self.series[name]
+        if freq is not None and FREQ_ORDER.index(freq) > FREQ_ORDER.index(self.info[name]["freq"]):
+            key = (name, freq)
+            if key not in self._resampled:
+                # Trung bình kỳ, cùng cách tính với chuỗi tháng của OECD
+                self._resampled[key] = values.resample(RESAMPLE_RULES[freq]).mean().dropna()
+            values = self._resampled[key]
+        if start is not None:
+            values = values[values.index.searchsorted(pd.Timestamp(start)):]
+        return values
+
+    def window(self, names=None, freq=None, start=None):
+        return {name: self.get(name, freq, start) for name in (names or self.names)}
+
+    def stats(self, name, start=None):
+        # Thống kê trên dữ liệu gốc của khoảng đang xem
+        values = self.get(name, start=start)
+        return {
+            "current": float(values.iloc[-1]),
+            "mean": float(values.mean()),
+            "max": float(values.max()),
+            "last": values.index[-1],
+            "freq": self.info[name]["freq"],
+        }
+
+    def summary(self):
+        df = pd.DataFrame.from_dict(self.info, orient="index")
+        df["freq"] = df["freq"].map(FREQ_LABELS)
+        return df
+
+    def nbytes(self):
+        return sum(values.memory_usage(index=True) for values in self.series.values())
+
+
+_default_fetcher = None
+
+
+def get_fetcher():
+    global _default_fetcher
+    if _default_fetcher is None:
+        _default_fetcher = FredFetcher()
+    return _default_fetcher
@@ -0,0 +1,154 @@
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+from macro_bot.data import sources
+
+# Chế độ trong ngày cho trang Vàng SJC: nến 1 phút của Vàng (GC=F) và USD/VND (VND=X).
+# Mỗi lượt chỉ tải các nến mới hơn nến cuối đã có (kèm vài nến chồng lấn vì nến đang chạy chưa chốt giá)
+# rồi ghi vào bộ đệm vòng kích thước cố định bằng mảng NumPy: Dashboard chạy cả ngày vẫn giữ bộ nhớ không đổi.
+
+INTRADAY_TICKERS = ("GC=F", "VND=X")
+INTERVAL = "1m"
+# 3 ngày × 24 giờ nến phút (vàng giao dịch gần như suốt ngày)
+CAPACITY = 3 * 24 * 60
+POLL_SECONDS = 60
+# Số nến cuối được tải lại mỗi lượt
+OVERLAP_BARS = 3
+# Lần tải đầu tiên (chưa có nến nào)
+FIRST_PERIOD = "5d"
+# Số nến hiển thị trên biểu đồ đuôi (4 giờ gần nhất)
+TAIL_BARS = 240
+DISPLAY_TZ = "Asia/Ho_Chi_Minh"
+
+
+class RingBuffer:
+    # Mốc thời gian (epoch giây, int64) và giá đóng cửa (float64) trong hai mảng cấp phát một lần;
+    # `_end` là vị trí ghi tiếp theo, `size` số nến hợp lệ. Nến cũ nhất bị ghi đè khi đầy.
+    def __init__(self, capacity=CAPACITY):
+        self.capacity = capacity
+        self.times = np.zeros(capacity, dtype=np.int64)
+        self.values = np.full(capacity, np.nan)
+        self.size = 0
+        self._end = 0
+
+    def __len__(self):
+        return self.size
+
+    @property
+    def nbytes(self):
+        return self.times.nbytes + self.values.nbytes
+
+    @property
+    def last_time(self):
+        return int(self.times[self._end - 1]) if self.size else None
+
+    def _positions(self, n):
+        # Vị trí trong mảng của n nến cuối, theo thứ tự thời gian
+        return (self._end - n + np.arange(n)) % self.capacity
+
+    def extend(self, times, values):
+        # Nến có mốc đã có trong bộ đệm được cập nhật giá, nến mới hơn được nối vào; trả về số nến mới
+        times = np.asarray(times, dtype=np.int64)
+        values = np.asarray(values, dtype=float)
+        if self.size and len(times):
+            old = times <= self.last_time
+            if old.any():
+                pos = self._positions(self.size)
+                found = np.searchsorted(self.times[pos], times[old])
+                found = np.minimum(found, self.size - 1)
+                hit = self.times[pos[found]] == times[old]
+                self.values[pos[found[hit]]] = values[old][hit]
+                times, values = times[~old], values[~old]
+        n = len(times)
+        if n > self.capacity:
+            times, values = times[-self.capacity:], values[-self.capacity:]
+        m = len(times)
+        if m:
+            idx = (self._end + np.arange(m)) % self.capacity
+            self.times[idx] = times
+            self.values[idx] = values
+            self._end = (self._end + m) % self.capacity
+            self.size = min(self.size + m, self.capacity)
+        return n
+
+    def tail(self, n=None):
+        # Bản sao theo thứ tự thời gian của n nến cuối (mặc định toàn bộ)
+        n = self.size if n is None else min(n, self.size)
+        pos = self._positions(n)
+        return self.times[pos], self.values[pos]
+
+
+def download_bars(ticker, start=None, interval=INTERVAL):
+    # Nến trong ngày qua nguồn dữ liệu, trả về (epoch giây UTC, giá đóng cửa)
+    if start is not None:
+        start = pd.Timestamp(start, unit="s", tz="UTC").to_pydatetime()
+    raw = sources.get_source().history(ticker, start=start, interval=interval, period=FIRST_PERIOD)
+    if raw.empty:
+        return np.array([], dtype=np.int64), np.array([])
+    close = raw["Close"].dropna()
+    index = pd.DatetimeIndex(close.index)
+    # Các mã có múi giờ sàn khác nhau: quy hết về UTC
+    index = index.tz_localize("UTC") if index.tz is None else index.tz_convert("UTC")
+    return index.asi8 // 10 ** 9, close.to_numpy(dtype=float)
+
+
+class IntradayFeed:
+    # Một bộ đệm vòng cho mỗi mã, dùng chung giữa các phiên trong tiến trình
+    def __init__(self, tickers=INTRADAY_TICKERS, capacity=CAPACITY, interval=INTERVAL, download=None):
+        self.tickers = tuple(tickers)
+        self.interval = interval
+        self.buffers = {ticker: RingBuffer(capacity) for ticker in self.tickers}
+        self._download = download or download_bars
+        self.last_poll = 0.0
+        self.error = None
+        self._lock = threading.Lock()
+        self._poll_lock = threading.Lock()
+
+    def __len__(self):
+        return min(len(buffer) for buffer in self.buffers.values())
+
+    def nbytes(self):
+        return sum(buffer.nbytes for buffer in self.buffers.values())
+
+    def poll(self):
+        # Một lượt hỏi cho mọi mã; lỗi của một mã không làm mất nến của mã khác
+        added = 0
+        errors = []
+        for ticker, buffer in self.buffers.items():
+            last = buffer.last_time
+            start = None if last is None else last - OVERLAP_BARS * 60
+            try:
+                times, values = self._download(ticker, start, self.interval)
+            except Exception as exc:
+                errors.append(f"{ticker}: {type(exc).__name__}: {exc}")
+                continue
+            with self._lock:
+                added += buffer.extend(times, values)
+        self.error = "; ".join(errors) or None
+        self.last_poll = time.time()
+        return added
+
+    def refresh(self, max_age=POLL_SECONDS):
+        # Nhiều phiên cùng gọi: chỉ một luồng hỏi mạng, các luồng khác đọc ngay bộ đệm hiện có
+        if time.time() - self.last_poll < max_age or not self._poll_lock.acquire(blocking=False):
+            return 0
+        try:
+            return self.poll()
+        finally:
+            self._poll_lock.release()
+
+    def frame(self, n=TAIL_BARS):
+        # n nến cuối của mã đầu tiên; các mã khác lấy giá gần nhất không sau mốc đó (như merge_asof)
+        with self._lock:
+            tails = {ticker: buffer.tail(n if i == 0 else None)
+                     for i, (ticker, buffer) in enumerate(self.buffers.items())}
+        base_times = tails[self.tickers[0]][0]
+        columns = {}
+        for ticker, (times, values) in tails.items():
+            pos = np.searchsorted(times, base_times, side="right") - 1
+            columns[ticker] = np.where(pos >= 0, values[np.maximum(pos, 0)], np.nan) if len(times) else np.nan
+        index = pd.to_datetime(base_times, unit="s", utc=True).tz_convert(DISPLAY_TZ).tz_localize(None)
+        return pd.DataFrame(columns, index=index).dropna()
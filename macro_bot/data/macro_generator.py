@@ -0,0 +1,75 @@
+import numpy as np
+import pandas as pd
+
+# Bộ sinh dữ liệu vĩ mô Việt Nam mô phỏng từ các bảng chế độ theo năm.
+# Mỗi dòng bảng: (năm đầu, năm cuối, giá trị); None = không giới hạn. Dòng đầu tiên khớp được ưu tiên.
+# Bước tăng của tỷ giá và VN-Index được định nghĩa theo tháng.
+
+# Tăng trưởng Tín dụng (Credit Growth %) - Dữ liệu sát thực tế SBV
+CREDIT_GROWTH_TABLE = [
+    (2007, 2007, 35),
+    (2009, 2009, 53),
+    (2011, 2012, 12),
+    (2015, 2018, 14.5),
+]
+CREDIT_GROWTH_DEFAULT = 12.0
+
+# Tỷ giá USD/VND: bước trượt giá mỗi tháng
+FX_BASE = 16000
+FX_STEP_TABLE = [
+    (2008, 2008, 150),   # Khủng hoảng tài chính
+    (2011, 2011, 200),   # Lạm phát cao
+    (2022, None, 100),   # USD mạnh lên toàn cầu
+]
+FX_STEP_DEFAULT = 20     # Trượt giá tự nhiên
+
+# VN-Index: bước tăng/giảm mỗi tháng, không hiển thị dưới mức sàn
+VNINDEX_BASE = 200
+VNINDEX_FLOOR = 200
+VNINDEX_STEP_TABLE = [
+    (2007, 2007, 80),
+    (2008, 2008, -70),
+    (2017, 2018, 40),
+    (2020, 2021, 55),
+    (2022, 2022, -45),
+]
+VNINDEX_STEP_DEFAULT = 1
+
+
+def year_lookup(years, table, default):
+    conditions = [
+        (years >= lo) & (years <= (hi if hi is not None else np.iinfo(np.int64).max))
+        for lo, hi, _ in table
+    ]
+    return np.select(conditions, [value for _, _, value in table], default=default)
+
+
+def months_per_period(freq):
+    # Số tháng ứng với một kỳ của tần suất (ME = 1, ngày ≈ 12/365...)
+    periods_per_year = len(pd.date_range('2001-01-01', '2001-12-31', freq=freq))
+    return 12 / periods_per_year
+
+
+def generate_macro_frame(start='2005-01-01', end='2026-01-01', freq='ME'):
+    date_rng = pd.date_range(start=start, end=end, freq=freq)
+    years = date_rng.year.to_numpy()
+    df = pd.DataFrame(index=date_rng)
+
+    df['Credit_Growth'] = year_lookup(years, CREDIT_GROWTH_TABLE, CREDIT_GROWTH_DEFAULT).astype(float)
+
+    # Tăng trưởng M2 (%) - Thường thấp hơn tín dụng một chút
+    df['M2_Growth'] = df['Credit_Growth'] * 0.85 + 2
+
+    # Bước theo tháng quy đổi theo độ dài kỳ; ở tần suất tháng giữ nguyên số nguyên
+    scale = months_per_period(freq)
+    fx_steps = year_lookup(years, FX_STEP_TABLE, FX_STEP_DEFAULT)
+    vni_steps = year_lookup(years, VNINDEX_STEP_TABLE, VNINDEX_STEP_DEFAULT)
+    if scale != 1:
+        fx_steps = fx_steps * scale
+        vni_steps = vni_steps * scale
+
+    df['USDVND'] = FX_BASE + np.cumsum(fx_steps)
+    # Mức sàn chỉ áp dụng khi hiển thị, giá trị tích lũy vẫn chạy tiếp bên dưới
+    df['VNIndex'] = np.maximum(VNINDEX_BASE + np.cumsum(vni_steps), VNINDEX_FLOOR)
+
+    return df
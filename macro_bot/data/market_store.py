@@ -0,0 +1,93 @@
+import os
+import time
+
+import pandas as pd
+
+from macro_bot.config import DATA_DIR
+from macro_bot.data import sources
+
+# Kho dữ liệu thị trường trên đĩa (Parquet, mỗi mã một file).
+# Lần đầu tải toàn bộ lịch sử, các lần sau chỉ tải các phiên mới hơn phiên cuối đã lưu.
+
+# Tải lại vài phiên gần nhất vì phiên cuối có thể chưa chốt giá
+REFRESH_OVERLAP_DAYS = 5
+
+
+def _ticker_path(ticker):
+    safe_name = "".join(c if c.isalnum() else "_" for c in ticker)
+    return os.path.join(DATA_DIR, "prices", f"{safe_name}.parquet")
+
+
+def _download(ticker, start=None):
+    # Qua nguồn dữ liệu (mạng, ghi lại hoặc phát lại bản đã ghi); bảng rỗng khi không có phiên nào
+    raw = sources.get_source().history(ticker, start=start)
+    if raw.empty:
+        return pd.DataFrame()
+    raw.index = pd.DatetimeIndex(raw.index).tz_localize(None)
+    raw.index.name = "Date"
+    return raw.dropna(how="all")
+
+
+def read_history(ticker):
+    path = _ticker_path(ticker)
+    if not os.path.exists(path):
+        return pd.DataFrame()
+    return pd.read_parquet(path)
+
+
+def _write_history(ticker, df):
+    path = _ticker_path(ticker)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    # Ghi ra file tạm rồi đổi tên để tiến trình khác không đọc phải file dở dang
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    df.to_parquet(tmp_path)
+    os.replace(tmp_path, path)
+
+
+def refresh_ticker(ticker, max_age=3600):
+    stored = read_history(ticker)
+    path = _ticker_path(ticker)
+
+    # Dữ liệu còn mới thì không gọi mạng
+    if not stored.empty and time.time() - os.path.getmtime(path) < max_age:
+        return stored
+
+    if stored.empty:
+        # Chưa có lịch sử: lỗi của nguồn dữ liệu được báo lên (luồng làm mới nền ghi lại lỗi)
+        fresh = _download(ticker)
+    else:
+        start = stored.index[-1] - pd.Timedelta(days=REFRESH_OVERLAP_DAYS)
+        try:
+            fresh = _download(ticker, start=start.strftime("%Y-%m-%d"))
+        except Exception:
+            fresh = pd.DataFrame()
+
+    if fresh.empty:
+        # Lỗi mạng: giữ nguyên lịch sử cũ, lần sau thử lại
+        return stored
+
+    if stored.empty:
+        merged = fresh
+    else:
+        # Phiên trùng lặp lấy theo dữ liệu mới tải
+        merged = pd.concat([stored[stored.index < fresh.index[0]], fresh])
+    merged = merged[~merged.index.duplicated(keep="last")].sort_index()
+    _write_history(ticker, merged)
+    return merged
+
+
+def load_closes(tickers, start=None, max_age=3600):
+    # Trả về bảng giá đóng cửa giống yf.download(tickers)['Close']
+    closes = {}
+    for ticker in tickers:
+        history = refresh_ticker(ticker, max_age=max_age)
+        if not history.empty:
+            closes[ticker] = history["Close"]
+
+    if not closes:
+        return pd.DataFrame()
+
+    df = pd.DataFrame(closes)
+    if start is not None:
+        df = df[df.index >= pd.Timestamp(start)]
+    return df
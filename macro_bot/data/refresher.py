@@ -0,0 +1,174 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from macro_bot import instrumentation
+from macro_bot.data import shared_cache
+
+# Làm mới dữ liệu chạy nền (stale-while-revalidate): luồng nền làm mới mã/chuỗi FRED
+# trước khi hết hạn, trang Streamlit luôn đọc bản chụp tốt gần nhất trong O(1).
+# Lỗi làm mới được ghi lại kèm tuổi dữ liệu thay vì làm trống Dashboard.
+
+# Làm mới khi dữ liệu đạt 80% thời hạn
+REFRESH_AHEAD = 0.8
+# Thời gian chờ thử lại sau lỗi: tăng dần, tối đa bằng thời hạn
+RETRY_BASE = 30
+# Tăng khi đổi dạng giá trị lưu trong bộ nhớ đệm dùng chung (2: bảng gọn CompactFrame)
+# để worker cũ và mới không đọc nhầm bản của nhau
+CACHE_FORMAT = 2
+
+
+class Snapshot:
+    def __init__(self, value=None, fetched_at=None):
+        self.value = value
+        self.fetched_at = fetched_at
+        self.last_attempt = fetched_at
+        self.error = None
+        self.failures = 0
+
+    @property
+    def ok(self):
+        return self.fetched_at is not None
+
+    def age(self, now=None):
+        if not self.ok:
+            return float("inf")
+        return (time.time() if now is None else now) - self.fetched_at
+
+
+class BackgroundRefresher:
+    def __init__(self, cache=None, max_workers=4, tick=1.0, clock=time.time):
+        self.cache = cache
+        self.tick = tick
+        # Đồng hồ cho hạn làm mới và tuổi dữ liệu (thay được khi kiểm thử)
+        self.clock = clock
+        self._jobs = {}
+        self._snapshots = {}
+        self._due = {}
+        self._running = set()
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="refresher")
+        self._thread = None
+
+    def register(self, name, fn, ttl):
+        # Gọi lại nhiều lần (mỗi lần rerun) không đăng ký trùng
+        with self._lock:
+            if name in self._jobs:
+                return
+            self._jobs[name] = (fn, ttl)
+            self._snapshots[name] = Snapshot()
+            self._due[name] = 0.0
+        self.start()
+
+    def start(self):
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._loop, name="refresher", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def _loop(self):
+        while not self._stop.is_set():
+            self.run_due(self._pool.submit)
+            self._stop.wait(self.tick)
+
+    def run_due(self, submit=None):
+        # Chạy các tác vụ đã đến hạn: luồng nền đẩy vào pool, không truyền submit thì chạy ngay tại chỗ
+        now = self.clock()
+        with self._lock:
+            due = [name for name, at in self._due.items() if at <= now and name not in self._running]
+            self._running.update(due)
+        for name in due:
+            if submit is None:
+                self._run(name)
+            else:
+                submit(self._run, name)
+        return due
+
+    def _run(self, name):
+        fn, ttl = self._jobs[name]
+        snapshot = self._snapshots[name]
+        snapshot.last_attempt = self.clock()
+        try:
+            # Qua bộ nhớ đệm dùng chung: giữa nhiều worker chỉ một worker gọi mạng
+            cache = self.cache or shared_cache.get_cache()
+            # Luồng nền: chỉ được đo khi bật MACRO_BOT_PROFILE=1
+            with instrumentation.stage(f"refresh.{name}"):
+                value, updated_at, error = cache.fetch_entry(f"refresher:v{CACHE_FORMAT}:{name}", fn,
+                                                             ttl=ttl * REFRESH_AHEAD)
+        except Exception as exc:
+            value, updated_at, error = None, None, f"{type(exc).__name__}: {exc}"
+
+        if updated_at is not None:
+            # Thay cả bản chụp một lần để trang đọc không bao giờ thấy trạng thái dở dang
+            fresh = Snapshot(value, updated_at)
+            fresh.last_attempt = snapshot.last_attempt
+            if error:
+                fresh.failures = snapshot.failures
+            snapshot = self._snapshots[name] = fresh
+
+        if error:
+            snapshot.error = error
+            snapshot.failures += 1
+            next_due = self.clock() + min(RETRY_BASE * 2 ** (snapshot.failures - 1), ttl)
+        else:
+            # Bản cũ do worker khác đang làm mới: kiểm tra lại sau ít giây
+            next_due = max(updated_at + ttl * REFRESH_AHEAD, self.clock() + 5 * self.tick)
+
+        with self._lock:
+            self._due[name] = next_due
+            self._running.discard(name)
+
+    def get(self, name):
+        return self._snapshots.get(name)
+
+    def read(self, name, timeout=120):
+        # Trả bản chụp tốt gần nhất; chỉ lần đầu tiên (chưa có dữ liệu) mới phải chờ
+        snapshot = self._snapshots[name]
+        if snapshot.ok:
+            return snapshot
+        with self._lock:
+            self._due[name] = 0.0
+        deadline = time.time() + timeout
+        while time.time() < deadline:
+            snapshot = self._snapshots[name]
+            if snapshot.ok or snapshot.failures:
+                break
+            time.sleep(0.05)
+        if not snapshot.ok:
+            raise RuntimeError(snapshot.error or "Hết thời gian chờ dữ liệu")
+        return snapshot
+
+    def status(self):
+        now = self.clock()
+        with self._lock:
+            due = dict(self._due)
+        return {name: {"age": s.age(now), "error": s.error, "failures": s.failures, "next_refresh": due[name]}
+                for name, s in self._snapshots.items()}
+
+
+def format_age(seconds):
+    if seconds == float("inf"):
+        return "chưa có"
+    if seconds < 60:
+        return f"{seconds:.0f} giây"
+    if seconds < 3600:
+        return f"{seconds / 60:.0f} phút"
+    return f"{seconds / 3600:.1f} giờ"
+
+
+_default_refresher = None
+_default_lock = threading.Lock()
+
+
+def get_refresher():
+    global _default_refresher
+    with _default_lock:
+        if _default_refresher is None:
+            _default_refresher = BackgroundRefresher()
+        return _default_refresher
@@ -0,0 +1,248 @@
+import functools
+import os
+import pickle
+import sqlite3
+import threading
+import time
+import uuid
+
+from macro_bot.config import DATA_DIR
+
+# Bộ nhớ đệm dùng chung giữa nhiều tiến trình Streamlit (nhiều replica trên cùng máy).
+# Chỉ một worker được làm mới một khóa tại một thời điểm (single-flight);
+# các worker khác trả về bản cũ nếu có, hoặc chờ worker kia ghi xong.
+
+COUNTERS = ("hits", "misses", "refreshes", "stale", "waits", "errors")
+
+
+class MemoryBackend:
+    # Chỉ trong một tiến trình; dùng khi không cần chia sẻ hoặc để chạy thử
+    def __init__(self):
+        self._entries = {}
+        self._locks = {}
+        self._counters = dict.fromkeys(COUNTERS, 0)
+        self._mutex = threading.Lock()
+
+    def get(self, key):
+        with self._mutex:
+            return self._entries.get(key)
+
+    def set(self, key, value):
+        with self._mutex:
+            self._entries[key] = (value, time.time())
+
+    def try_lock(self, key, owner, lease):
+        now = time.time()
+        with self._mutex:
+            holder = self._locks.get(key)
+            if holder is not None and holder[1] > now:
+                return False
+            self._locks[key] = (owner, now + lease)
+            return True
+
+    def unlock(self, key, owner):
+        with self._mutex:
+            if self._locks.get(key, (None,))[0] == owner:
+                del self._locks[key]
+
+    def is_locked(self, key):
+        with self._mutex:
+            holder = self._locks.get(key)
+            return holder is not None and holder[1] > time.time()
+
+    def incr(self, name, amount=1):
+        with self._mutex:
+            self._counters[name] = self._counters.get(name, 0) + amount
+
+    def counters(self):
+        with self._mutex:
+            return dict(self._counters)
+
+
+class SQLiteBackend:
+    # File SQLite trên đĩa cục bộ (chế độ WAL), giá trị được pickle
+    def __init__(self, path):
+        self.path = path
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._local = threading.local()
+        with self._conn() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("CREATE TABLE IF NOT EXISTS entries (key TEXT PRIMARY KEY, value BLOB, updated_at REAL)")
+            conn.execute("CREATE TABLE IF NOT EXISTS locks (key TEXT PRIMARY KEY, owner TEXT, expires_at REAL)")
+            conn.execute("CREATE TABLE IF NOT EXISTS counters (name TEXT PRIMARY KEY, value INTEGER)")
+
+    def _conn(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            self._local.conn = conn
+        return conn
+
+    def get(self, key):
+        row = self._conn().execute("SELECT value, updated_at FROM entries WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return None
+        try:
+            return pickle.loads(row[0]), row[1]
+        except Exception:
+            # Bản ghi của phiên bản code cũ (lớp đã đổi chỗ/đổi tên): coi như chưa có để tính lại
+            return None
+
+    def set(self, key, value):
+        blob = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        self._conn().execute(
+            "INSERT OR REPLACE INTO entries (key, value, updated_at) VALUES (?, ?, ?)",
+            (key, sqlite3.Binary(blob), time.time()),
+        )
+
+    def try_lock(self, key, owner, lease):
+        now = time.time()
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.execute("DELETE FROM locks WHERE key = ? AND expires_at < ?", (key, now))
+            cur = conn.execute(
+                "INSERT OR IGNORE INTO locks (key, owner, expires_at) VALUES (?, ?, ?)",
+                (key, owner, now + lease),
+            )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        return cur.rowcount == 1
+
+    def unlock(self, key, owner):
+        self._conn().execute("DELETE FROM locks WHERE key = ? AND owner = ?", (key, owner))
+
+    def is_locked(self, key):
+        row = self._conn().execute(
+            "SELECT 1 FROM locks WHERE key = ? AND expires_at >= ?", (key, time.time())
+        ).fetchone()
+        return row is not None
+
+    def incr(self, name, amount=1):
+        self._conn().execute(
+            "INSERT INTO counters (name, value) VALUES (?, ?) "
+            "ON CONFLICT(name) DO UPDATE SET value = value + excluded.value",
+            (name, amount),
+        )
+
+    def counters(self):
+        rows = self._conn().execute("SELECT name, value FROM counters").fetchall()
+        return {**dict.fromkeys(COUNTERS, 0), **dict(rows)}
+
+
+class SharedCache:
+    def __init__(self, backend, lease=120, wait_timeout=60, poll_interval=0.1):
+        self.backend = backend
+        self.lease = lease
+        self.wait_timeout = wait_timeout
+        self.poll_interval = poll_interval
+        self.owner = f"{os.getpid()}-{uuid.uuid4().hex[:8]}"
+        # Bộ đếm của riêng tiến trình này; backend.counters() là tổng của mọi tiến trình
+        self.local_counters = dict.fromkeys(COUNTERS, 0)
+        self._counter_lock = threading.Lock()
+
+    def _count(self, name):
+        with self._counter_lock:
+            self.local_counters[name] += 1
+        self.backend.incr(name)
+
+    def _refresh(self, key, compute, entry):
+        try:
+            value = compute()
+        except Exception as error:
+            self._count("errors")
+            if entry is not None:
+                # Làm mới lỗi: vẫn phục vụ bản cũ
+                self._count("stale")
+                return entry[0], entry[1], f"{type(error).__name__}: {error}"
+            raise
+        self.backend.set(key, value)
+        self._count("refreshes")
+        return value, time.time(), None
+
+    def _refresh_if_stale(self, key, compute, ttl):
+        # Đọc lại ngay trước khi tính: worker khác có thể vừa làm mới xong giữa lần đọc đầu và lúc lấy khóa
+        entry = self.backend.get(key)
+        if entry is not None and time.time() - entry[1] < ttl:
+            return entry[0], entry[1], None
+        return self._refresh(key, compute, entry)
+
+    def fetch_entry(self, key, compute, ttl):
+        # Trả về (giá trị, thời điểm cập nhật, lỗi làm mới nếu đang phục vụ bản cũ)
+        entry = self.backend.get(key)
+        if entry is not None and time.time() - entry[1] < ttl:
+            self._count("hits")
+            return entry[0], entry[1], None
+
+        self._count("misses")
+        if self.backend.try_lock(key, self.owner, self.lease):
+            try:
+                return self._refresh_if_stale(key, compute, ttl)
+            finally:
+                self.backend.unlock(key, self.owner)
+
+        # Worker khác đang làm mới
+        if entry is not None:
+            self._count("stale")
+            return entry[0], entry[1], None
+
+        self._count("waits")
+        deadline = time.time() + self.wait_timeout
+        while time.time() < deadline:
+            time.sleep(self.poll_interval)
+            fresh = self.backend.get(key)
+            if fresh is not None:
+                return fresh[0], fresh[1], None
+            if not self.backend.is_locked(key):
+                break
+        # Worker kia lỗi hoặc quá lâu: lấy khóa nếu còn được, đọc lại rồi mới tự tính
+        if self.backend.try_lock(key, self.owner, self.lease):
+            try:
+                return self._refresh_if_stale(key, compute, ttl)
+            finally:
+                self.backend.unlock(key, self.owner)
+        return self._refresh_if_stale(key, compute, ttl)
+
+    def get_or_refresh(self, key, compute, ttl):
+        return self.fetch_entry(key, compute, ttl)[0]
+
+    def cached(self, ttl, name=None):
+        return cached(ttl, name=name, cache=self)
+
+    def stats(self):
+        with self._counter_lock:
+            local = dict(self.local_counters)
+        return {"local": local, "shared": self.backend.counters()}
+
+    def summary(self):
+        shared = self.backend.counters()
+        return " · ".join(f"{name}: {shared[name]}" for name in ("hits", "misses", "refreshes", "stale"))
+
+
+_default_cache = None
+
+
+def get_cache():
+    global _default_cache
+    if _default_cache is None:
+        if os.environ.get("MACRO_BOT_CACHE_BACKEND", "sqlite") == "memory":
+            backend = MemoryBackend()
+        else:
+            backend = SQLiteBackend(os.path.join(DATA_DIR, "shared_cache.sqlite3"))
+        _default_cache = SharedCache(backend)
+    return _default_cache
+
+
+def cached(ttl, name=None, cache=None):
+    # Decorator: khóa = tên hàm + tham số; cache mặc định được khởi tạo khi gọi lần đầu
+    def decorator(func):
+        prefix = name or f"{func.__module__}.{func.__qualname__}"
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            key = f"{prefix}:{args!r}:{sorted(kwargs.items())!r}"
+            return (cache or get_cache()).get_or_refresh(key, lambda: func(*args, **kwargs), ttl)
+        return wrapper
+    return decorator
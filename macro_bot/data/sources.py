@@ -0,0 +1,256 @@
+import argparse
+import gzip
+import os
+import random
+import threading
+import time
+
+import pandas as pd
+
+from macro_bot.config import DATA_DIR
+
+# Nguồn dữ liệu cho mọi lời gọi mạng (giá yfinance theo ngày/phút, file CSV của FRED), chọn qua biến môi trường:
+#   MACRO_BOT_SOURCE=live    gọi mạng như bình thường (mặc định)
+#   MACRO_BOT_SOURCE=record  gọi mạng và ghi lại phản hồi vào MACRO_BOT_REPLAY_DIR (Parquet zstd, CSV gzip)
+#   MACRO_BOT_SOURCE=replay  không gọi mạng: phục vụ bản đã ghi từ bộ nhớ, có thể giả lập độ trễ và lỗi
+#                            (MACRO_BOT_REPLAY_LATENCY giây trung bình, MACRO_BOT_REPLAY_FAILURES tỉ lệ 0..1,
+#                             MACRO_BOT_REPLAY_SEED để lặp lại đúng chuỗi lỗi)
+# Mọi nguồn trả về cùng dạng dữ liệu nên kho giá, bộ tải FRED và nến phút không cần biết đang chạy nguồn nào.
+
+SOURCE = os.environ.get("MACRO_BOT_SOURCE", "live")
+REPLAY_DIR = os.environ.get("MACRO_BOT_REPLAY_DIR", os.path.join(DATA_DIR, "replay"))
+FRED_POOL_SIZE = 8
+
+
+class ReplayMiss(LookupError):
+    pass
+
+
+class InjectedFailure(ConnectionError):
+    pass
+
+
+def _frame_from_yfinance(raw, ticker):
+    if raw is None or raw.empty:
+        return pd.DataFrame()
+    # Xử lý MultiIndex của yfinance (phiên bản mới)
+    if isinstance(raw.columns, pd.MultiIndex):
+        raw = raw.xs(ticker, axis=1, level=-1)
+    return raw
+
+
+class LiveSource:
+    name = "live"
+
+    def __init__(self, pool_size=FRED_POOL_SIZE):
+        self.pool_size = pool_size
+        self._session = None
+        self._lock = threading.Lock()
+
+    @property
+    def session(self):
+        # Tạo session (và nạp requests) ở lần gọi mạng đầu tiên, không phải khi nhập module
+        with self._lock:
+            if self._session is None:
+                import requests
+                from requests.adapters import HTTPAdapter
+
+                self._session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=self.pool_size, pool_maxsize=self.pool_size)
+                self._session.mount("https://", adapter)
+                self._session.mount("http://", adapter)
+            return self._session
+
+    def history(self, ticker, start=None, interval="1d", period="max"):
+        # Bảng OHLCV của một mã như yf.download; yfinance nặng nên chỉ nạp khi thật sự gọi mạng
+        import yfinance as yf
+
+        if start is None:
+            raw = yf.download(ticker, period=period, interval=interval, auto_adjust=True, progress=False)
+        else:
+            raw = yf.download(ticker, start=start, interval=interval, auto_adjust=True, progress=False)
+        return _frame_from_yfinance(raw, ticker)
+
+    def fred_csv(self, url, series_id, headers=None, timeout=30):
+        # Trả về (mã HTTP, nội dung, header phản hồi); 304 khi chuỗi không đổi so với ETag/If-Modified-Since
+        resp = self.session.get(url, params={"id": series_id}, headers=headers or {}, timeout=timeout)
+        if resp.status_code != 304:
+            resp.raise_for_status()
+        return resp.status_code, resp.content, dict(resp.headers)
+
+
+class _Store:
+    # Vị trí file ghi lại của từng mã/chuỗi trong thư mục replay
+    def __init__(self, root):
+        self.root = root
+
+    def history_path(self, ticker, interval):
+        safe_name = "".join(c if c.isalnum() else "_" for c in ticker)
+        return os.path.join(self.root, "prices", f"{safe_name}.{interval}.parquet")
+
+    def fred_path(self, series_id):
+        return os.path.join(self.root, "fred", f"{series_id}.csv.gz")
+
+
+def _filter_start(frame, start):
+    if start is None or frame.empty:
+        return frame
+    start = pd.Timestamp(start)
+    if frame.index.tz is not None and start.tz is None:
+        start = start.tz_localize("UTC")
+    elif frame.index.tz is None and start.tz is not None:
+        start = start.tz_convert(None)
+    return frame[frame.index >= start]
+
+
+class RecordSource(LiveSource):
+    name = "record"
+
+    def __init__(self, root=REPLAY_DIR, pool_size=FRED_POOL_SIZE):
+        super().__init__(pool_size)
+        self.store = _Store(root)
+        self._write_lock = threading.Lock()
+
+    def _write(self, path, write):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # Ghi ra file tạm rồi đổi tên để tiến trình khác không đọc phải file dở dang
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        write(tmp_path)
+        os.replace(tmp_path, path)
+
+    def history(self, ticker, start=None, interval="1d", period="max"):
+        frame = super().history(ticker, start=start, interval=interval, period=period)
+        if frame.empty:
+            return frame
+        path = self.store.history_path(ticker, interval)
+        with self._write_lock:
+            # Gộp với bản đã ghi: lần tải thêm chỉ có các phiên mới, bản ghi giữ toàn bộ lịch sử
+            if os.path.exists(path):
+                recorded = pd.read_parquet(path)
+                merged = pd.concat([recorded[recorded.index < frame.index[0]], frame])
+            else:
+                merged = frame
+            self._write(path, lambda tmp: merged.to_parquet(tmp, compression="zstd"))
+        return frame
+
+    def fred_csv(self, url, series_id, headers=None, timeout=30):
+        # Bỏ header điều kiện để luôn nhận đủ nội dung chuỗi mà ghi lại
+        status, body, resp_headers = super().fred_csv(url, series_id, timeout=timeout)
+        with self._write_lock:
+            self._write(self.store.fred_path(series_id), lambda tmp: _write_gzip(tmp, body))
+        return status, body, resp_headers
+
+
+def _write_gzip(path, body):
+    with gzip.open(path, "wb") as f:
+        f.write(body)
+
+
+def _read_gzip(path):
+    with gzip.open(path, "rb") as f:
+        return f.read()
+
+
+class ReplaySource:
+    # Phục vụ bản đã ghi từ bộ nhớ (mỗi file chỉ đọc một lần), không bao giờ gọi mạng
+    name = "replay"
+
+    def __init__(self, root=REPLAY_DIR, latency=0.0, failure_rate=0.0, seed=None):
+        self.store = _Store(root)
+        self.latency = latency
+        self.failure_rate = failure_rate
+        self._rng = random.Random(seed)
+        self._memory = {}
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.failures = 0
+
+    def _inject(self, what):
+        with self._lock:
+            self.calls += 1
+            delay = self._rng.uniform(0, 2 * self.latency) if self.latency else 0.0
+            fail = self._rng.random() < self.failure_rate
+            if fail:
+                self.failures += 1
+        if delay:
+            time.sleep(delay)
+        if fail:
+            raise InjectedFailure(f"Lỗi giả lập khi tải {what}")
+
+    def _load(self, path, read):
+        with self._lock:
+            if path not in self._memory:
+                if not os.path.exists(path):
+                    raise ReplayMiss(f"Chưa ghi lại: {path}")
+                self._memory[path] = read(path)
+            return self._memory[path]
+
+    def history(self, ticker, start=None, interval="1d", period="max"):
+        self._inject(ticker)
+        frame = self._load(self.store.history_path(ticker, interval), pd.read_parquet)
+        # Bản sao: nơi gọi được sửa chỉ mục/cột mà không ảnh hưởng bản trong bộ nhớ
+        return _filter_start(frame, start).copy()
+
+    def fred_csv(self, url, series_id, headers=None, timeout=30):
+        self._inject(series_id)
+        body = self._load(self.store.fred_path(series_id), _read_gzip)
+        return 200, body, {}
+
+
+def make_source(name=SOURCE):
+    if name == "live":
+        return LiveSource()
+    if name == "record":
+        return RecordSource()
+    if name == "replay":
+        return ReplaySource(
+            latency=float(os.environ.get("MACRO_BOT_REPLAY_LATENCY", "0")),
+            failure_rate=float(os.environ.get("MACRO_BOT_REPLAY_FAILURES", "0")),
+            seed=int(os.environ["MACRO_BOT_REPLAY_SEED"]) if os.environ.get("MACRO_BOT_REPLAY_SEED") else None,
+        )
+    raise ValueError(f"MACRO_BOT_SOURCE không hợp lệ: {name} (live, record, replay)")
+
+
+_default_source = None
+_default_lock = threading.Lock()
+
+
+def get_source():
+    global _default_source
+    with _default_lock:
+        if _default_source is None:
+            _default_source = make_source()
+        return _default_source
+
+
+def import_store(data_dir=DATA_DIR, root=REPLAY_DIR):
+    # Tạo bản ghi replay từ kho cục bộ đã tải (giá Parquet, cache CSV của FRED) mà không gọi mạng
+    store = _Store(root)
+    count = 0
+    prices_dir = os.path.join(data_dir, "prices")
+    for name in sorted(os.listdir(prices_dir)) if os.path.isdir(prices_dir) else []:
+        if name.endswith(".parquet"):
+            path = os.path.join(root, "prices", f"{name[:-len('.parquet')]}.1d.parquet")
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            pd.read_parquet(os.path.join(prices_dir, name)).to_parquet(path, compression="zstd")
+            count += 1
+    fred_dir = os.path.join(data_dir, "fred")
+    for name in sorted(os.listdir(fred_dir)) if os.path.isdir(fred_dir) else []:
+        if name.endswith(".csv"):
+            os.makedirs(os.path.join(root, "fred"), exist_ok=True)
+            with open(os.path.join(fred_dir, name), "rb") as f:
+                _write_gzip(store.fred_path(name[:-len(".csv")]), f.read())
+            count += 1
+    return count
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Bản ghi replay cho MACRO_BOT_SOURCE=replay")
+    parser.add_argument("--from-store", default=DATA_DIR, help="Kho dữ liệu cục bộ để chép sang (mặc định DATA_DIR)")
+    parser.add_argument("--output", default=REPLAY_DIR)
+    args = parser.parse_args(argv)
+    print(f"Đã ghi {import_store(args.from_store, args.output)} file vào {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,260 @@
+import atexit
+import json
+import os
+import sys
+import threading
+import time
+
+from macro_bot.config import DATA_DIR
+
+# Đo thời gian và kích thước dữ liệu từng bước của mỗi lượt chạy lại trang Streamlit
+# (tải dữ liệu, đọc cache, tính chỉ báo, dựng biểu đồ, gửi biểu đồ).
+# Bật bằng MACRO_BOT_PROFILE=1 (mọi phiên + luồng nền) hoặc ?debug=1 trên URL (chỉ phiên đó).
+# Khi tắt, stage() chỉ trả về một đối tượng rỗng dùng chung nên gần như không tốn gì.
+
+ENABLED = os.environ.get("MACRO_BOT_PROFILE", "") == "1"
+# Mỗi worker một file (node_exporter đọc mọi *.prom trong thư mục) để các worker không ghi đè nhau.
+# MACRO_BOT_WORKER_ID đặt tên cố định cho worker (giữ cùng file qua các lần khởi động lại); mặc định theo PID.
+# File được xóa khi tiến trình thoát, file của PID đã chết (bị kill) được dọn ở lần ghi đầu của tiến trình khác.
+# Mọi chỉ số mang nhãn worker: cộng các worker bằng sum without (worker) (...) trên Prometheus.
+WORKER_ID = os.environ.get("MACRO_BOT_WORKER_ID") or str(os.getpid())
+METRICS_DIR = os.path.join(DATA_DIR, "metrics")
+METRICS_FILE = os.environ.get("MACRO_BOT_METRICS_FILE", os.path.join(METRICS_DIR, f"macro_bot-{WORKER_ID}.prom"))
+# Mỗi lượt chạy một dòng JSON; để trống để không ghi
+LOG_FILE = os.environ.get("MACRO_BOT_PROFILE_LOG", "")
+
+_local = threading.local()
+_lock = threading.Lock()
+# (trang, bước) -> [số lần, tổng giây, tổng byte]
+_stages = {}
+# trang -> [số lượt chạy, tổng giây]
+_reruns = {}
+# Các file chỉ số tiến trình này đã ghi, xóa khi thoát
+_written = set()
+
+
+class _NoopStage:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def payload(self, obj):
+        return obj
+
+
+_NOOP = _NoopStage()
+
+
+class _Stage:
+    def __init__(self, recorder, name):
+        self.recorder = recorder
+        self.name = name
+        self.bytes = 0
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        elapsed = time.perf_counter() - self.started
+        page = self.recorder.page if self.recorder is not None else "background"
+        if self.recorder is not None:
+            self.recorder.stages.append((self.name, elapsed, self.bytes))
+        _add(page, self.name, elapsed, self.bytes)
+        return False
+
+    def payload(self, obj):
+        # Ghi kích thước dữ liệu ra của bước này, trả lại nguyên đối tượng
+        self.bytes += payload_size(obj)
+        return obj
+
+
+class Recorder:
+    def __init__(self, page):
+        self.page = page
+        self.started = time.perf_counter()
+        self.stages = []
+
+
+def payload_size(obj):
+    if obj is None:
+        return 0
+    if isinstance(obj, (bytes, bytearray, memoryview)):
+        return len(obj)
+    if isinstance(obj, str):
+        return len(obj.encode())
+    if hasattr(obj, "to_plotly_json"):
+        # Biểu đồ Plotly: kích thước JSON gửi trình duyệt (chỉ tính khi đang đo)
+        return len(obj.to_json())
+    if hasattr(obj, "memory_usage"):
+        usage = obj.memory_usage(index=True)
+        return int(usage.sum()) if hasattr(usage, "sum") else int(usage)
+    if hasattr(obj, "nbytes"):
+        return int(obj.nbytes)
+    if isinstance(obj, dict):
+        return sum(payload_size(v) for v in obj.values())
+    if isinstance(obj, (list, tuple)):
+        return sum(payload_size(v) for v in obj)
+    return sys.getsizeof(obj)
+
+
+def _add(page, name, elapsed, size):
+    with _lock:
+        entry = _stages.setdefault((page, name), [0, 0.0, 0])
+        entry[0] += 1
+        entry[1] += elapsed
+        entry[2] += size
+
+
+def current():
+    return getattr(_local, "recorder", None)
+
+
+def stage(name):
+    recorder = getattr(_local, "recorder", None)
+    if recorder is None and not ENABLED:
+        return _NOOP
+    return _Stage(recorder, name)
+
+
+def _debug_requested():
+    try:
+        import streamlit as st
+        return st.query_params.get("debug") == "1"
+    except Exception:
+        return False
+
+
+def begin(page):
+    # Gọi ở đầu trang; mỗi phiên Streamlit chạy trên luồng riêng nên bộ ghi đặt theo luồng
+    _local.recorder = Recorder(page) if ENABLED or _debug_requested() else None
+    return _local.recorder
+
+
+def finish():
+    # Gọi ở cuối trang: hiện bảng gỡ lỗi (nếu bật) và cộng dồn vào file chỉ số
+    recorder = getattr(_local, "recorder", None)
+    _local.recorder = None
+    if recorder is None:
+        return None
+    total = time.perf_counter() - recorder.started
+    with _lock:
+        entry = _reruns.setdefault(recorder.page, [0, 0.0])
+        entry[0] += 1
+        entry[1] += total
+    debug_panel(recorder, total)
+    write_metrics()
+    if LOG_FILE:
+        _append_log(recorder, total)
+    return recorder
+
+
+def debug_panel(recorder, total):
+    import pandas as pd
+    import streamlit as st
+
+    with st.sidebar.expander("🛠️ Hiệu năng lượt chạy", expanded=False):
+        rows = [{"Bước": name, "ms": round(elapsed * 1000, 1), "KB": round(size / 1024, 1)}
+                for name, elapsed, size in recorder.stages]
+        st.dataframe(pd.DataFrame(rows), hide_index=True, use_container_width=True)
+        measured = sum(elapsed for _, elapsed, _ in recorder.stages)
+        st.caption(f"Tổng lượt chạy: {total * 1000:.0f} ms (đã đo {measured * 1000:.0f} ms) · "
+                   f"chỉ số: {METRICS_FILE}")
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(page, stage=None):
+    labels = f'worker="{_escape(WORKER_ID)}",page="{_escape(page)}"'
+    return labels if stage is None else f'{labels},stage="{_escape(stage)}"'
+
+
+def prometheus_text():
+    with _lock:
+        stages = {key: list(value) for key, value in _stages.items()}
+        reruns = {key: list(value) for key, value in _reruns.items()}
+    lines = [
+        "# HELP macro_bot_stage_seconds_total Tổng thời gian của từng bước",
+        "# TYPE macro_bot_stage_seconds_total counter",
+    ]
+    lines += [f'macro_bot_stage_seconds_total{{{_labels(p, s)}}} {v[1]:.6f}' for (p, s), v in sorted(stages.items())]
+    lines += ["# HELP macro_bot_stage_calls_total Số lần chạy từng bước",
+              "# TYPE macro_bot_stage_calls_total counter"]
+    lines += [f'macro_bot_stage_calls_total{{{_labels(p, s)}}} {v[0]}' for (p, s), v in sorted(stages.items())]
+    lines += ["# HELP macro_bot_stage_bytes_total Tổng kích thước dữ liệu ra của từng bước",
+              "# TYPE macro_bot_stage_bytes_total counter"]
+    lines += [f'macro_bot_stage_bytes_total{{{_labels(p, s)}}} {v[2]}' for (p, s), v in sorted(stages.items())]
+    lines += ["# HELP macro_bot_reruns_total Số lượt chạy lại của từng trang",
+              "# TYPE macro_bot_reruns_total counter"]
+    lines += [f'macro_bot_reruns_total{{{_labels(p)}}} {v[0]}' for p, v in sorted(reruns.items())]
+    lines += ["# HELP macro_bot_rerun_seconds_total Tổng thời gian chạy lại của từng trang",
+              "# TYPE macro_bot_rerun_seconds_total counter"]
+    lines += [f'macro_bot_rerun_seconds_total{{{_labels(p)}}} {v[1]:.6f}' for p, v in sorted(reruns.items())]
+    return "\n".join(lines) + "\n"
+
+
+def _pid_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def prune_dead(directory=METRICS_DIR):
+    # Xóa file chỉ số đặt tên theo PID của tiến trình không còn chạy (thoát bất thường, không kịp dọn)
+    removed = []
+    for name in os.listdir(directory) if os.path.isdir(directory) else []:
+        pid = name[len("macro_bot-"):-len(".prom")] if name.startswith("macro_bot-") and name.endswith(".prom") else ""
+        if pid.isdigit() and int(pid) != os.getpid() and not _pid_alive(int(pid)):
+            try:
+                os.remove(os.path.join(directory, name))
+                removed.append(name)
+            except FileNotFoundError:
+                pass
+    return removed
+
+
+def remove_metrics():
+    with _lock:
+        paths = list(_written)
+        _written.clear()
+    for path in paths:
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+
+def write_metrics(path=None):
+    # File văn bản cho node_exporter (textfile collector); ghi file tạm rồi đổi tên
+    path = os.path.abspath(path or METRICS_FILE)
+    with _lock:
+        first = not _written
+        _written.add(path)
+    if first:
+        prune_dead(os.path.dirname(path))
+        atexit.register(remove_metrics)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.write(prometheus_text())
+    os.replace(tmp_path, path)
+
+
+def _append_log(recorder, total):
+    record = {
+        "ts": time.time(),
+        "page": recorder.page,
+        "total_ms": round(total * 1000, 3),
+        "stages": [{"stage": name, "ms": round(elapsed * 1000, 3), "bytes": size}
+                   for name, elapsed, size in recorder.stages],
+    }
+    with _lock, open(LOG_FILE, "a", encoding="utf-8") as f:
+        f.write(json.dumps(record, ensure_ascii=False) + "\n")
@@ -0,0 +1 @@
+# Tầng hiển thị: biểu đồ Plotly (charts), ảnh Matplotlib (figures) và các trang Streamlit (pages)
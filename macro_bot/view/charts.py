@@ -0,0 +1,143 @@
+import pandas as pd
+import plotly.graph_objects as go
+
+from macro_bot.compute import downsample
+
+# Các biểu đồ Plotly dùng chung cho Dashboard Streamlit và bản dựng tĩnh (macro_bot/build.py)
+
+HISTORICAL_EVENTS = [
+    {"date": "1980-01-01", "label": "Đỉnh lãi suất Volcker", "color": "#FFA500"},
+    {"date": "1987-10-19", "label": "Black Monday", "color": "#FF4B4B"},
+    {"date": "2008-09-15", "label": "Khủng hoảng Lehman", "color": "#FF4B4B"},
+    {"date": "2020-03-01", "label": "Đại dịch COVID-19", "color": "#00FFCC"},
+    {"date": "2022-03-16", "label": "Chu kỳ thắt chặt FED", "color": "#FFA500"}
+]
+
+
+def gold_dxy_figure(df, entry_price=None, start=None, end=None):
+    # Mỗi đường chỉ gửi ~2000 điểm đại diện của khoảng đang xem
+    gold_view = downsample.downsample(df['Gold'], start=start, end=end)
+    ma_view = downsample.downsample(df['MA200'], start=start, end=end)
+    dxy_view = downsample.downsample(df['DXY'], start=start, end=end)
+
+    fig = go.Figure()
+    fig.add_trace(go.Scatter(x=gold_view.index, y=gold_view, name="Giá Vàng", line=dict(color='#FFD700')))
+    fig.add_trace(go.Scatter(x=ma_view.index, y=ma_view, name="MA200", line=dict(color='#FF00FF', dash='dash')))
+    fig.add_trace(go.Scatter(x=dxy_view.index, y=dxy_view, name="DXY", yaxis="y2", line=dict(color='#00CCFF', width=1)))
+
+    # Điểm mua của bạn trên biểu đồ
+    if entry_price is not None:
+        fig.add_hline(y=entry_price, line_dash="dot", line_color="white", annotation_text="Giá vốn của bạn")
+
+    fig.update_layout(
+        height=500, template="plotly_dark", hovermode="x unified",
+        xaxis=dict(rangeslider=dict(visible=True)),
+        yaxis2=dict(overlaying="y", side="right", showgrid=False),
+        legend=dict(orientation="h", y=1.1, x=0.5, xanchor="center"),
+        margin=dict(l=0, r=0, t=30, b=0)
+    )
+    return fig
+
+
+def rates_figure(series_by_name, show_events=True):
+    # Mỗi chuỗi vẽ trên trục thời gian riêng của nó (chuỗi tháng không bị kéo giãn thành ngày)
+    fig = go.Figure()
+    for name, series in series_by_name.items():
+        # Giảm số điểm theo độ rộng biểu đồ; khoảng thời gian ngắn hơn sẽ hiện đủ chi tiết
+        series_view = downsample.downsample(series)
+        fig.add_trace(go.Scatter(x=series_view.index, y=series_view, name=name, line=dict(width=1.5)))
+
+    starts = [series.index[0] for series in series_by_name.values() if not series.empty]
+    if show_events and starts:
+        for event in HISTORICAL_EVENTS:
+            e_date = pd.to_datetime(event["date"])
+            if e_date >= min(starts):
+                fig.add_vline(x=e_date, line_width=1, line_dash="dash", line_color=event["color"])
+
+    fig.update_layout(height=600, template="plotly_dark", hovermode="x unified",
+                      yaxis=dict(title="Lãi suất (%)", gridcolor='rgba(255,255,255,0.1)'),
+                      xaxis=dict(rangeslider=dict(visible=True)))
+    return fig
+
+
+def vn_macro_figure(df_view, show_m2=True, show_credit=True, show_fx=True):
+    fig = go.Figure()
+
+    # Trục 1: Tín dụng & M2 (Dạng cột/đường bên trái)
+    if show_credit:
+        fig.add_trace(go.Bar(x=df_view.index, y=df_view['Credit_Growth'], name="Tăng trưởng Tín dụng (%)", marker_color='rgba(255, 75, 75, 0.4)', yaxis="y1"))
+    if show_m2:
+        fig.add_trace(go.Scatter(x=df_view.index, y=df_view['M2_Growth'], name="Cung tiền M2 (%)", line=dict(color='#00d1ff', width=2), yaxis="y1"))
+
+    # Trục 2: VN-Index (Đường đậm bên phải)
+    fig.add_trace(go.Scatter(x=df_view.index, y=df_view['VNIndex'], name="VN-Index (Phải)", line=dict(color='#FFD700', width=4), yaxis="y2"))
+
+    # Trục 3: Tỷ giá USD/VND (Đường đứt nét bên phải)
+    if show_fx:
+        fig.add_trace(go.Scatter(x=df_view.index, y=df_view['USDVND'], name="Tỷ giá USD/VND (Phải)", line=dict(color='#FFFFFF', width=1, dash='dot'), yaxis="y3"))
+
+    # Cấu hình Layout đa trục
+    fig.update_layout(
+        height=700, template="plotly_dark",
+        yaxis=dict(title="Tăng trưởng (%)", side="left", range=[0, 60]),
+        yaxis2=dict(title="VN-Index", overlaying="y", side="right", showgrid=False),
+        yaxis3=dict(title="USD/VND", overlaying="y", side="right", anchor="free", position=0.95, showgrid=False),
+        legend=dict(orientation="h", y=1.1, x=0.5, xanchor="center"),
+        hovermode="x unified"
+    )
+    return fig
+
+
+def correlation_heatmap(matrix, title=None):
+    # Ma trận tương quan N×N, thang màu cố định -1..1 để so sánh giữa các ngày/cửa sổ
+    values = matrix.to_numpy()
+    fig = go.Figure(go.Heatmap(
+        z=values, x=matrix.columns, y=matrix.index, zmin=-1, zmax=1, colorscale="RdBu",
+        text=[[f"{v:.2f}" if v == v else "" for v in row] for row in values], texttemplate="%{text}",
+        colorbar=dict(title="Tương quan")
+    ))
+    fig.update_layout(height=max(400, 40 * len(matrix)), template="plotly_dark", title=title,
+                      yaxis=dict(autorange="reversed"), margin=dict(l=0, r=0, t=40 if title else 30, b=0))
+    return fig
+
+
+def correlation_pair_figure(series_by_window, start=None, end=None):
+    # Tương quan của một cặp theo thời gian, mỗi cửa sổ một đường
+    fig = go.Figure()
+    for window, series in series_by_window.items():
+        view = downsample.downsample(series.dropna(), start=start, end=end)
+        fig.add_trace(go.Scatter(x=view.index, y=view, name=f"{window} phiên", line=dict(width=1.5)))
+    fig.add_hline(y=0, line_dash="dot", line_color="gray")
+    fig.update_layout(height=400, template="plotly_dark", hovermode="x unified", yaxis=dict(range=[-1, 1]),
+                      legend=dict(orientation="h", y=1.1, x=0.5, xanchor="center"),
+                      margin=dict(l=0, r=0, t=30, b=0))
+    return fig
+
+
+def backtest_heatmap(heat, yaxis_title):
+    # Xác suất thắng (%) theo ngưỡng × số phiên nắm giữ của lưới backtest
+    fig = go.Figure(go.Heatmap(z=heat.values, x=heat.columns, y=heat.index, colorscale="RdYlGn",
+                               colorbar=dict(title="Xác suất (%)")))
+    fig.update_layout(height=450, template="plotly_dark", xaxis_title="Số phiên nắm giữ",
+                      yaxis_title=yaxis_title, margin=dict(l=0, r=0, t=30, b=0))
+    return fig
+
+
+def portfolio_figure(frame, currency="VND", start=None, end=None):
+    # Giá trị và vốn của danh mục (trục trái), mức sụt giảm từ đỉnh (%) ở trục phải
+    value_view = downsample.downsample(frame['value'], start=start, end=end)
+    cost_view = downsample.downsample(frame['cost'], start=start, end=end)
+    drawdown_view = downsample.downsample(frame['drawdown'] * 100, method="minmax", start=start, end=end)
+
+    fig = go.Figure()
+    fig.add_trace(go.Scatter(x=value_view.index, y=value_view, name="Giá trị", line=dict(color='#FFD700')))
+    fig.add_trace(go.Scatter(x=cost_view.index, y=cost_view, name="Vốn", line=dict(color='white', dash='dot')))
+    fig.add_trace(go.Scatter(x=drawdown_view.index, y=drawdown_view, name="Sụt giảm (%)", yaxis="y2",
+                             fill="tozeroy", line=dict(color='rgba(255, 75, 75, 0.6)', width=1)))
+    fig.update_layout(
+        height=450, template="plotly_dark", hovermode="x unified",
+        yaxis=dict(title=currency), yaxis2=dict(title="Sụt giảm (%)", overlaying="y", side="right", showgrid=False),
+        legend=dict(orientation="h", y=1.1, x=0.5, xanchor="center"),
+        margin=dict(l=0, r=0, t=30, b=0)
+    )
+    return fig
@@ -0,0 +1,240 @@
+import io
+import threading
+from collections import OrderedDict
+
+import matplotlib
+matplotlib.use("Agg")
+import matplotlib.dates as mdates  # noqa: E402
+import matplotlib.image as mimage  # noqa: E402
+import matplotlib.patches as mpatches  # noqa: E402
+import numpy as np  # noqa: E402
+import pandas as pd  # noqa: E402
+from matplotlib.backends.backend_agg import FigureCanvasAgg  # noqa: E402
+from matplotlib.figure import Figure  # noqa: E402
+
+# Lớp dựng biểu đồ matplotlib cho trang Vàng SJC (view/pages/gold_sjc.py) và bản dựng tĩnh.
+# Dùng Figure trực tiếp (không qua pyplot) nên không có hình nào bị giữ lại trong bộ quản lý toàn cục;
+# ảnh PNG đã vẽ được cache theo đúng đầu vào (LRU giới hạn số lượng), hình gốc được giải phóng ngay.
+# Riêng biểu đồ dự báo giữ lại một hình nền lịch sử theo phiên bản dữ liệu (ProjectionChart).
+
+BACKGROUND = '#0E1117'
+
+
+class FigureCache:
+    def __init__(self, max_entries=64, max_layers=2):
+        self.max_entries = max_entries
+        self.max_layers = max_layers
+        self._images = OrderedDict()
+        # Lớp nền đã vẽ sẵn (ví dụ lịch sử giá theo phiên bản dữ liệu), dùng lại cho nhiều ảnh
+        self._layers = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self._images)
+
+    def __contains__(self, key):
+        with self._lock:
+            return key in self._images
+
+    def image(self, key, render, *args, **kwargs):
+        # render(*args, **kwargs) trả về ảnh PNG (bytes)
+        with self._lock:
+            if key in self._images:
+                self._images.move_to_end(key)
+                self.hits += 1
+                return self._images[key]
+
+        image = render(*args, **kwargs)
+
+        with self._lock:
+            self.misses += 1
+            self._images[key] = image
+            self._images.move_to_end(key)
+            while len(self._images) > self.max_entries:
+                self._images.popitem(last=False)
+        return image
+
+    def png(self, key, draw, *args, figsize=(10, 5), **kwargs):
+        return self.image(key, render_png, draw, *args, figsize=figsize, **kwargs)
+
+    def layer(self, key, build, *args):
+        with self._lock:
+            if key in self._layers:
+                self._layers.move_to_end(key)
+                return self._layers[key]
+        layer = build(*args)
+        with self._lock:
+            # Hai phiên cùng dựng một lớp: giữ bản vào trước
+            layer = self._layers.setdefault(key, layer)
+            self._layers.move_to_end(key)
+            while len(self._layers) > self.max_layers:
+                self._layers.popitem(last=False)
+        return layer
+
+
+def render_png(draw, *args, figsize=(10, 5), **kwargs):
+    fig = Figure(figsize=figsize)
+    fig.patch.set_facecolor(BACKGROUND)
+    draw(fig, *args, **kwargs)
+    buf = io.BytesIO()
+    fig.savefig(buf, format="png", facecolor=fig.get_facecolor(), bbox_inches="tight")
+    fig.clear()
+    return buf.getvalue()
+
+
+def data_version(*series):
+    # Nhận diện phiên bản dữ liệu: độ dài, ngày cuối và giá trị cuối của từng chuỗi
+    return tuple((len(s), str(s.index[-1]), float(s.iloc[-1])) for s in series)
+
+
+# --- Biểu đồ Vàng & S&P 500 kèm dự báo theo lãi suất thực ---
+
+PROJECTION_DAYS = 30
+# Trục giá vàng chỉ nới theo bậc 10% giá hiện tại khi đường dự báo vượt khỏi vùng lịch sử,
+# để các mức lãi suất thực gần nhau dùng chung một nền đã vẽ
+YLIM_STEP = 0.1
+MAX_BACKGROUNDS = 4
+
+
+def projection_key(version, real_ir):
+    return ("gold_projection", version, round(real_ir, 1))
+
+
+def history_key(version):
+    return ("gold_history", version)
+
+
+def inflation_key(cpi):
+    return ("inflation_history", cpi)
+
+
+class ProjectionChart:
+    # Lịch sử Vàng/S&P 500 chỉ vẽ (raster) một lần mỗi phiên bản dữ liệu và giới hạn trục; đổi lãi suất thực
+    # chỉ phục hồi ảnh nền rồi vẽ đè đường dự báo, vùng màu, chú thích và tiêu đề.
+    def __init__(self, gold_series, stock_series, figsize=(10, 5)):
+        self.curr_gold_usd = float(gold_series.iloc[-1])
+        self.future_dates = pd.date_range(start=gold_series.index[-1], periods=PROJECTION_DAYS)
+        self.fig = Figure(figsize=figsize)
+        self.fig.patch.set_facecolor(BACKGROUND)
+        self.fig.subplots_adjust(left=0.08, right=0.91, top=0.88, bottom=0.08)
+        self.canvas = FigureCanvasAgg(self.fig)
+
+        ax1 = self.fig.add_subplot()
+        ax1.set_facecolor(BACKGROUND)
+        # Trục Vàng
+        self.gold_line = ax1.plot(gold_series.index, gold_series, color='#D4AF37', lw=2, label="Vàng thực tế")
+        ax1.set_ylabel("Giá Vàng (USD)", color='#D4AF37', fontweight='bold')
+        ax1.grid(True, alpha=0.1)
+        # Trục thời gian gồm cả khoảng dự báo
+        ax1.update_datalim([(mdates.date2num(self.future_dates[-1]), self.curr_gold_usd)])
+        ax1.autoscale_view()
+        self.history_ylim = ax1.get_ylim()
+
+        # Trục S&P 500
+        ax2 = ax1.twinx()
+        self.stock_line = ax2.plot(stock_series.index, stock_series, color='#2E8B57', lw=1, label="S&P 500", alpha=0.5)
+        ax2.set_ylabel("S&P 500", color='#2E8B57', fontweight='bold')
+
+        self.ax1, self.ax2 = ax1, ax2
+        self._backgrounds = OrderedDict()
+        self._lock = threading.Lock()
+        self.full_draws = 0
+
+    def projection(self, real_ir):
+        return [self.curr_gold_usd * (1 - (real_ir/1000))**i for i in range(PROJECTION_DAYS)]
+
+    def ylim(self, projection):
+        # Giới hạn trục vàng: vùng lịch sử, nới theo bậc YLIM_STEP nếu đường dự báo vượt ra ngoài
+        low, high = self.history_ylim
+        step = YLIM_STEP * self.curr_gold_usd
+        if max(projection) > high:
+            high = high + step * np.ceil((max(projection) - high) / step)
+        if min(projection) < low:
+            low = low - step * np.ceil((low - min(projection)) / step)
+        return float(low), float(high)
+
+    def _background(self, ylim):
+        if ylim in self._backgrounds:
+            self._backgrounds.move_to_end(ylim)
+            return self._backgrounds[ylim]
+        self.ax1.set_ylim(ylim)
+        self.canvas.draw()
+        self.full_draws += 1
+        background = self.canvas.copy_from_bbox(self.fig.bbox)
+        self._backgrounds[ylim] = background
+        while len(self._backgrounds) > MAX_BACKGROUNDS:
+            self._backgrounds.popitem(last=False)
+        return background
+
+    def png(self, real_ir):
+        gold_projection = self.projection(real_ir)
+        with self._lock:
+            ylim = self.ylim(gold_projection)
+            background = self._background(ylim)
+            self.ax1.set_ylim(ylim)
+            self.canvas.restore_region(background)
+
+            ax1 = self.ax1
+            lns2 = ax1.plot(self.future_dates, gold_projection, color='#D4AF37', ls='--', alpha=0.7,
+                            label="Dự báo (Real IR)")
+            # Vùng highlight và chú thích trong box
+            if real_ir > 0:
+                color_zone = 'cyan'
+                label_zone = "Vùng hút tiền về Bank"
+            else:
+                color_zone = 'orange'
+                label_zone = "Vùng trú ẩn (Vàng ưu thế)"
+            span = ax1.axvspan(self.future_dates[0], self.future_dates[-1], color=color_zone, alpha=0.15)
+            zone_patch = mpatches.Patch(color=color_zone, alpha=0.3, label=label_zone)
+
+            # Gộp tất cả các đường và vùng màu vào chú thích
+            lns = self.gold_line + lns2 + self.stock_line + [zone_patch]
+            labs = [l.get_label() for l in lns]
+            legend = ax1.legend(lns, labs, loc='upper left', facecolor='#1E1E1E', edgecolor='white',
+                                fontsize='small')
+            title = self.ax2.set_title(f"Mô phỏng Lãi suất thực: {real_ir:.1f}%", color='white', pad=20)
+
+            for artist in (span, lns2[0], legend, title):
+                self.fig.draw_artist(artist)
+            buf = io.BytesIO()
+            mimage.imsave(buf, np.asarray(self.canvas.buffer_rgba()), format="png")
+
+            # Trả lại nền sạch cho lần vẽ sau
+            for artist in (span, lns2[0], legend):
+                artist.remove()
+            title.set_text("")
+        return buf.getvalue()
+
+
+def gold_projection(cache, version, gold_series, stock_series, real_ir):
+    real_ir = round(real_ir, 1)
+    chart = cache.layer(history_key(version), ProjectionChart, gold_series, stock_series)
+    return cache.image(projection_key(version, real_ir), chart.png, real_ir)
+
+
+def inflation_history(cache, df_hist, cpi):
+    return cache.png(inflation_key(cpi), draw_inflation_history, df_hist, cpi, figsize=(10, 4))
+
+
+def draw_monte_carlo(fig, mc_dates, bands):
+    ax_mc = fig.add_subplot()
+    ax_mc.set_facecolor(BACKGROUND)
+    ax_mc.fill_between(mc_dates, bands[5], bands[95], color='#D4AF37', alpha=0.15, label="Vùng 5% - 95%")
+    ax_mc.fill_between(mc_dates, bands[25], bands[75], color='#D4AF37', alpha=0.35, label="Vùng 25% - 75%")
+    ax_mc.plot(mc_dates, bands[50], color='#D4AF37', lw=2, label="Trung vị")
+    ax_mc.set_ylabel("Vàng SJC (Tr/lượng)", color='white')
+    ax_mc.tick_params(colors='white')
+    ax_mc.grid(True, alpha=0.1)
+    ax_mc.legend(loc='upper left', facecolor='#1E1E1E', edgecolor='white', fontsize='small')
+
+
+def draw_inflation_history(fig, df_hist, cpi):
+    ax_h = fig.add_subplot()
+    ax_h.set_facecolor(BACKGROUND)
+    ax_h.bar(df_hist["Năm"].astype(str), df_hist["Lạm phát (%)"], color='tomato', alpha=0.7)
+    ax_h.axhline(cpi, color='cyan', ls='--', label=f"Dự báo 2026 ({cpi}%)")
+    ax_h.set_ylabel("Lạm phát (%)", color='white')
+    ax_h.tick_params(colors='white')
+    ax_h.legend(facecolor='#1E1E1E', edgecolor='white')
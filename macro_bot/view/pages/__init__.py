@@ -0,0 +1 @@
+# Mỗi trang là một module có hàm render(); streamlit_app.py chỉ nhập module khi trang được mở
@@ -0,0 +1,142 @@
+import streamlit as st
+import pandas as pd
+
+from macro_bot import instrumentation
+from macro_bot.compute import regimes, windows
+from macro_bot.data import fred_fetcher, refresher
+from macro_bot.view import charts, widgets
+
+# Các khoảng xem của thanh trượt
+PERIODS = ["1Y", "5Y", "10Y", "20Y", "30Y", "50Y"]
+
+# Hàm tải dữ liệu an toàn từ FRED (tải song song toàn bộ mã trong một lượt)
+# Luồng nền làm mới trước khi hết hạn (qua bộ nhớ đệm dùng chung giữa các worker),
+# trang chỉ đọc bản chụp gần nhất nên không phải chờ tải mạng
+def fetch_fred_batch(symbols):
+    fetcher = fred_fetcher.get_fetcher()
+    frames = fetcher.fetch_many(symbols.values())
+    stats = {sid: dict(fetcher.last_stats.get(sid, {})) for sid in symbols.values()}
+    # Danh mục giữ từng chuỗi ở tần suất gốc thay vì gộp thành bảng ngày
+    return fred_fetcher.SeriesCatalog.from_frames(frames, symbols), stats
+
+
+# Vị trí bắt đầu và thống kê của mọi khoảng xem cho mọi chuỗi, tính một lần cho mỗi bản dữ liệu
+@st.cache_resource(ttl=3600, max_entries=8)
+def get_rate_windows(version, job_name, _catalog):
+    return windows.WindowIndex(_catalog.series, PERIODS, end=_catalog.last_date)
+
+# Chế độ lãi suất của mọi đồng tiền trong kỳ hạn đang xem, tính một lần cho mỗi bản dữ liệu × khoảng xem
+# (khóa theo phiên bản dữ liệu và tên job, danh mục không bị băm lại mỗi lần chạy lại).
+# Chuỗi theo tháng của mọi đồng tiền (chuỗi quý/năm giữ giá trị tới kỳ sau), lệch khỏi trung bình trượt.
+@st.cache_resource(ttl=3600, max_entries=16)
+def get_rate_regimes(version, job_name, years, _catalog):
+    levels = pd.DataFrame(_catalog.window(freq="M")).ffill(limit=11)
+    return regimes.RegimeTimeline(regimes.rate_inputs(levels, years), regimes.rate_rules(levels.columns))
+
+
+def render():
+    instrumentation.begin("global_rates")
+    st.title("🧠 Hệ Thống Phân Tích & Dự Báo Vĩ Mô 50 Năm")
+
+    # Danh mục mã lãi suất
+    mapping = fred_fetcher.RATE_SERIES
+
+    # --- SIDEBAR ---
+    st.sidebar.header("⚙️ Cấu hình")
+    term_choice = st.sidebar.radio("Kỳ hạn lãi suất:", list(mapping.keys()))
+    time_period = st.sidebar.select_slider("Khoảng thời gian:", options=PERIODS, value="50Y")
+    show_events = st.sidebar.checkbox("Hiện sự kiện lịch sử", value=True)
+
+    try:
+        with st.spinner('📡 Đang trích xuất dữ liệu vĩ mô...'):
+            current_symbols = mapping[term_choice]
+            job_name = f"global_rates.fred_catalog:{tuple(current_symbols.values())}"
+            with instrumentation.stage("data.read"):
+                data_refresher = refresher.get_refresher()
+                data_refresher.register(job_name, lambda: fetch_fred_batch(current_symbols), ttl=3600)
+                snapshot = data_refresher.read(job_name)
+                catalog, fred_stats = snapshot.value
+            widgets.data_status(snapshot)
+
+        # Chuỗi tải lỗi không làm trống cả trang nhưng phải được báo ra (dùng bản lưu gần nhất nếu có)
+        failed = [sid for sid, stat in fred_stats.items() if stat.get("error")]
+        if failed:
+            st.sidebar.warning(f"⚠️ Không tải được {', '.join(failed)} — dùng bản lưu gần nhất nếu có")
+
+        with st.sidebar.expander("📡 Độ trễ tải dữ liệu FRED"):
+            for sid, stat in fred_stats.items():
+                status = stat.get("error") or stat.get("status")
+                st.caption(f"{sid}: {stat.get('latency', 0) * 1000:.0f} ms ({status})")
+
+        if len(catalog):
+            selected_currencies = st.sidebar.multiselect(
+                "Đồng tiền hiển thị:", options=catalog.names,
+                default=[c for c in ["USD (Mỹ)", "EUR (Châu Âu)"] if c in catalog.names]
+            )
+
+            # Khoảng xem tính từ ngày mới nhất của cả danh mục; chuỗi ngắn hơn không làm ngắn các chuỗi khác
+            with instrumentation.stage("compute.rate_windows"):
+                rate_windows = get_rate_windows(snapshot.fetched_at, job_name, catalog)
+            view_start = rate_windows.start(time_period)
+            view_freq = fred_fetcher.plot_frequency(max(view_start, catalog.first_date), catalog.last_date)
+
+            # --- SECTION 1: BIỂU ĐỒ CHÍNH ---
+            st.subheader(f"📊 Lịch sử Lãi suất {term_choice} ({time_period})")
+            with instrumentation.stage("compute.rates_window") as step:
+                rates_view = step.payload(catalog.window(selected_currencies, freq=view_freq, start=view_start))
+            with instrumentation.stage("figure.rates"):
+                fig = charts.rates_figure(rates_view, show_events=show_events)
+            with instrumentation.stage("render.rates") as step:
+                st.plotly_chart(step.payload(fig), use_container_width=True)
+            st.caption(f"*Vẽ theo tần suất {fred_fetcher.FREQ_LABELS[view_freq].lower()} "
+                       "(chuỗi thưa hơn giữ nguyên tần suất gốc).*")
+
+            with st.expander("📚 Danh mục chuỗi FRED"):
+                st.dataframe(catalog.summary(), use_container_width=True)
+                st.caption(f"Bộ nhớ dữ liệu gốc: {catalog.nbytes() / 1024:.0f} KB")
+
+            # --- SECTION 2: PHÂN TÍCH THÔNG MINH & DỰ BÁO ---
+            st.divider()
+            st.subheader("🤖 Phân Tích & Dự Báo Thông Minh")
+
+            # Chọn đồng tiền trọng tâm để dự báo
+            focus_cur = st.selectbox("Chọn đồng tiền để nhận định:", options=selected_currencies if selected_currencies else catalog.names)
+
+            # Thống kê trên dữ liệu gốc của khoảng đang xem (đã tính sẵn)
+            focus_stats = rate_windows.stats(focus_cur, time_period)
+            current_val = focus_stats["current"]
+            hist_mean = focus_stats["mean"]
+            hist_max = focus_stats["max"]
+
+            c1, c2, c3 = st.columns(3)
+            c1.metric("Giá trị hiện tại", f"{current_val:.2f}%")
+            c2.metric("Trung bình lịch sử", f"{hist_mean:.2f}%")
+            c3.metric("Đỉnh lịch sử", f"{hist_max:.2f}%")
+            st.caption(f"Quan sát mới nhất: {focus_stats['last']:%d/%m/%Y} "
+                       f"(tần suất {fred_fetcher.FREQ_LABELS[catalog.info[focus_cur]['freq']].lower()})")
+
+            # Logic Nhận định
+            with instrumentation.stage("compute.rate_regimes"):
+                timeline = get_rate_regimes(snapshot.fetched_at, job_name, windows.period_years(time_period), catalog)
+            regime = timeline.current(focus_cur)
+            st.info(f"**Nhận định cho {focus_cur}:**")
+            if regime == regimes.EXTREME:
+                st.warning(f"⚠️ Lãi suất hiện tại đang cao hơn đáng kể so với trung bình lịch sử ({hist_mean:.2f}%). Theo quy luật 'Mean Reversion', áp lực giảm lãi suất trong trung hạn là rất lớn khi lạm phát được kiểm soát.")
+            elif regime == regimes.REVERSAL:
+                st.success(f"🟢 Lãi suất đang ở vùng thấp lịch sử. Điều này hỗ trợ cực tốt cho các kênh tài sản rủi ro (Chứng khoán, Bất động sản), nhưng cần cảnh giác với rủi ro lạm phát quay trở lại.")
+            else:
+                st.write(f"🔄 Lãi suất đang dao động quanh mức trung bình dài hạn. Thị trường đang ở trạng thái cân bằng vĩ mô.")
+            if regime != regimes.NEUTRAL:
+                history = timeline.hit_rate(focus_cur, regime, start=view_start)
+                if history["events"]:
+                    st.caption(f"Trong khoảng xem: {history['events']} tháng ở vùng này, lãi suất đảo chiều sau "
+                               f"{regimes.RATE_HORIZON} tháng {history['hit_rate']:.0f}% số lần "
+                               f"(thay đổi TB {history['avg_change']:+.2f} điểm %).")
+
+        else:
+            st.error("Không có dữ liệu khả dụng.")
+
+    except Exception as e:
+        st.error(f"Lỗi vận hành: {e}")
+
+    instrumentation.finish()
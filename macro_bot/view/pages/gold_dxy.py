@@ -0,0 +1,311 @@
+import io
+
+import streamlit as st
+import pandas as pd
+
+from macro_bot import instrumentation
+from macro_bot.compute import backtest, correlation, indicators, portfolio, regimes
+from macro_bot.data import compact, fred_fetcher, market_store, refresher
+from macro_bot.view import charts, widgets
+
+# Bộ tính chỉ báo dùng chung trong tiến trình, giữ trạng thái giữa các lần hết hạn cache
+@st.cache_resource
+def get_indicator_engine():
+    return indicators.IndicatorEngine()
+
+# Luồng nền làm mới trước khi hết hạn (qua bộ nhớ đệm dùng chung giữa các worker),
+# trang chỉ đọc bản chụp gần nhất nên không phải chờ tải mạng
+def get_advanced_data(engine):
+    # Tải dữ liệu (kho cục bộ chỉ tải thêm các phiên mới)
+    closes = market_store.load_closes(['GC=F', 'DX-Y.NYB'])
+    
+    # Chỉ báo kỹ thuật: MA200, RSI 14 phiên, Tương quan 30 phiên với DXY
+    # (giá trị từ -1 nghịch đảo hoàn toàn đến 1 đồng pha hoàn toàn) và biến động sau 10 phiên cho Backtest.
+    # Chỉ các phiên mới được tính lại. Bản chụp lưu gọn (float32, chỉ đọc) vì được giữ suốt thời gian chạy.
+    return compact.CompactFrame.from_frame(indicators.gold_dxy_frame(closes, engine))
+
+# Dữ liệu cho ma trận tương quan đa tài sản: giá đóng cửa và lợi suất FRED theo lịch phiên
+def get_correlation_inputs():
+    closes = market_store.load_closes(list(correlation.CORRELATION_TICKERS))
+    fetcher = fred_fetcher.get_fetcher()
+    rates = []
+    for term, symbols in fred_fetcher.RATE_SERIES.items():
+        frames = fetcher.fetch_many(symbols.values())
+        for name, sid in symbols.items():
+            if not frames[sid].empty:
+                # "10 Năm (Dài hạn)" + "USD (Mỹ)" -> "10Y USD"
+                rates.append(frames[sid].iloc[:, 0].rename(f"{term.split()[0]}Y {name.split()[0]}"))
+    return correlation.build_frame(closes, pd.concat(rates, axis=1) if rates else None)
+
+# Giá toàn bộ lịch sử của các tài sản trong file danh mục (vàng, S&P 500, USD/VND)
+def get_portfolio_prices():
+    closes = market_store.load_closes(list(portfolio.PRICE_TICKERS.values()))
+    return compact.CompactFrame.from_frame(closes)
+
+# Các kết quả dưới đây tính một lần cho mỗi bản dữ liệu và dùng chung giữa các phiên (không sửa trực tiếp).
+# Khóa theo phiên bản dữ liệu (thời điểm tải của bản chụp): tham số bảng có gạch dưới nên không bị băm lại
+# mỗi lần chạy lại trang.
+
+# Mọi cửa sổ tương quan
+@st.cache_resource(ttl=3600, max_entries=2)
+def get_correlation_engine(version, _frame):
+    return correlation.CorrelationEngine(_frame)
+
+# Dòng thời gian chế độ của mọi luật trên toàn bộ lịch sử
+@st.cache_resource(ttl=3600, max_entries=2)
+def get_regime_timeline(version, _df):
+    return regimes.RegimeTimeline(regimes.gold_inputs(_df), regimes.GOLD_RULES)
+
+# Quét lưới backtest cho mọi tín hiệu/ngưỡng/kỳ hạn trong một lượt
+@st.cache_resource(ttl=3600, max_entries=2)
+def get_backtest_grid(version, _df):
+    return backtest.sweep(_df)
+
+# Giá quy đổi VNĐ của mọi tài sản danh mục theo từng phiên
+@st.cache_resource(ttl=3600, max_entries=2)
+def get_portfolio_engine(version, _prices):
+    return portfolio.PortfolioEngine(_prices.frame())
+
+# Định giá file vị thế đã tải lên; cùng file (theo nội dung) và tiền tệ dùng chung kết quả
+@st.cache_resource(ttl=3600, max_entries=8)
+def value_portfolio(version, file_name, data, currency, _engine):
+    source = io.BytesIO(data)
+    return _engine.value(portfolio.load_positions(source, name=file_name), currency)
+
+
+def render():
+    instrumentation.begin("gold_dxy")
+    st.title("🧠 Hệ Thống Dự Báo Định Lượng & Quản Lý Danh Mục")
+
+    try:
+        with instrumentation.stage("data.read") as step:
+            data_refresher = refresher.get_refresher()
+            engine = get_indicator_engine()
+            data_refresher.register("gold_dxy.get_advanced_data", lambda: get_advanced_data(engine), ttl=3600)
+            snapshot = data_refresher.read("gold_dxy.get_advanced_data")
+            # Bản chụp dùng chung giữa các phiên: DataFrame chỉ đọc trỏ thẳng vào mảng của bản chụp
+            df = step.payload(snapshot.value.frame())
+            version = snapshot.fetched_at
+        widgets.data_status(snapshot)
+        curr_price = df['Gold'].iloc[-1]
+
+        # --- SECTION 1: QUẢN LÝ DANH MỤC (PORTFOLIO) ---
+        st.sidebar.header("💰 Danh Mục Của Bạn")
+        with st.sidebar:
+            holdings = st.number_input("Số lượng nắm giữ (oz)", min_value=0.0, value=1.0, step=0.1)
+            entry_price = st.number_input("Giá vốn (USD/oz)", min_value=0.0, value=2000.0, step=10.0)
+
+            current_value = holdings * curr_price
+            total_cost = holdings * entry_price
+            pnl = current_value - total_cost
+            pnl_pct = (pnl / total_cost * 100) if total_cost > 0 else 0
+
+            st.divider()
+            st.subheader("Báo cáo nhanh")
+            st.metric("Tổng giá trị", f"${current_value:,.2f}")
+            st.metric("Lời / Lỗ", f"${pnl:,.2f}", f"{pnl_pct:.2f}%")
+
+            # Nhiều tài khoản/vị thế (vàng, S&P 500, tiền gửi VNĐ, USD) từ file
+            st.divider()
+            st.subheader("📂 Danh mục từ file")
+            uploaded = st.file_uploader("File vị thế (CSV/Parquet)", type=["csv", "parquet"])
+            st.download_button("⬇️ File mẫu (CSV)", portfolio.sample_positions().to_csv(index=False),
+                               file_name="positions.csv", mime="text/csv")
+            report_currency = st.radio("Tiền tệ báo cáo", portfolio.CURRENCIES, horizontal=True)
+
+            book = None
+            if uploaded is not None:
+                data_refresher.register("gold_dxy.portfolio_prices", get_portfolio_prices, ttl=3600)
+                try:
+                    with instrumentation.stage("data.read_portfolio_prices"):
+                        prices_snapshot = data_refresher.read("gold_dxy.portfolio_prices")
+                    with instrumentation.stage("compute.portfolio") as step:
+                        book_engine = get_portfolio_engine(prices_snapshot.fetched_at, prices_snapshot.value)
+                        book = step.payload(value_portfolio(prices_snapshot.fetched_at, uploaded.name,
+                                                            uploaded.getvalue(), report_currency, book_engine))
+                except ValueError as error:
+                    st.error(f"File vị thế không hợp lệ: {error}")
+                if book is not None:
+                    last = book.total.iloc[-1]
+                    unit = "$" if report_currency == "USD" else "₫"
+                    st.metric("Tổng giá trị (file)", f"{unit}{last['value']:,.0f}")
+                    st.metric("Lời / Lỗ (file)", f"{unit}{last['pnl']:,.0f}",
+                              f"{last['pnl'] / last['cost'] * 100:.2f}%" if last['cost'] > 0 else None)
+
+        # --- SECTION 2: DỰ BÁO HIỆN TẠI ---
+        st.subheader("🔮 Dự Báo Vị Thế Hiện Tại")
+        with instrumentation.stage("compute.regimes"):
+            timeline = get_regime_timeline(version, df)
+        c1, c2, c3 = st.columns(3)
+
+        # Nhận định hiện tại và tỉ lệ trúng lịch sử của cùng chế độ lấy từ một dòng thời gian
+        def regime_caption(name):
+            code = timeline.current(name)
+            if code == regimes.NEUTRAL:
+                return
+            stats = timeline.hit_rate(name, code)
+            if stats["events"]:
+                st.caption(f"Lịch sử: {stats['events']} phiên {regimes.REGIME_LABELS[code]}, "
+                           f"đúng hướng sau {timeline.rule(name).horizon} phiên {stats['hit_rate']:.0f}%")
+
+        rsi_val = df['RSI'].iloc[-1]
+        with c1:
+            st.markdown(f"**Nhiệt độ RSI: {rsi_val:.1f}**")
+            rsi_regime = timeline.current("rsi")
+            if rsi_regime == regimes.EXTREME: st.error("Trạng thái: QUÁ MUA (Rủi ro)")
+            elif rsi_regime == regimes.REVERSAL: st.success("Trạng thái: QUÁ BÁN (Cơ hội)")
+            else: st.info("Trạng thái: TRUNG TÍNH")
+            regime_caption("rsi")
+
+        with c2:
+            dist = ((curr_price - df['MA200'].iloc[-1]) / df['MA200'].iloc[-1]) * 100
+            st.markdown(f"**Lệch MA200: {dist:.1f}%**")
+            st.write("Vùng an toàn" if timeline.current("ma200_dev") == regimes.NEUTRAL else "⚠️ Cẩn thận đảo chiều")
+            regime_caption("ma200_dev")
+
+        with c3:
+            # Lấy giá trị tương quan mới nhất
+            curr_corr = df['Correlation'].iloc[-1]
+            st.markdown(f"**Tương quan Vàng/DXY: {curr_corr:.2f}**")
+            corr_regime = timeline.current("correlation")
+            if corr_regime == regimes.REVERSAL:
+                st.write("✅ Nghịch đảo chuẩn (DXY tăng -> Vàng giảm)")
+            elif corr_regime == regimes.EXTREME:
+                st.write("⚠️ Bất thường (Cùng tăng/giảm)")
+            else:
+                st.write("⚖️ Không rõ ràng")
+            regime_caption("correlation")
+
+        # --- SECTION 3: BIỂU ĐỒ TỔNG HỢP ---
+        # Chọn khoảng xem; biểu đồ chỉ gửi các điểm đại diện của khoảng đó
+        view_start, view_end = st.slider(
+            "Khoảng thời gian biểu đồ:",
+            min_value=df.index[0].to_pydatetime(), max_value=df.index[-1].to_pydatetime(),
+            value=(df.index[0].to_pydatetime(), df.index[-1].to_pydatetime()), format="YYYY-MM-DD"
+        )
+        with instrumentation.stage("figure.gold_dxy"):
+            fig = charts.gold_dxy_figure(df, entry_price=entry_price, start=view_start, end=view_end)
+        with instrumentation.stage("render.gold_dxy") as step:
+            st.plotly_chart(step.payload(fig), use_container_width=True)
+
+        # --- SECTION 3b: DANH MỤC TỪ FILE ---
+        if book is not None:
+            with st.expander(f"📂 Danh mục từ file: {len(book.positions):,} vị thế, {len(book.accounts):,} tài khoản",
+                             expanded=True):
+                book_choice = st.selectbox("Tài khoản:", ["Tổng"] + book.accounts)
+                if book_choice == "Tổng":
+                    book_view = book.total
+                else:
+                    book_view = pd.DataFrame({"value": book.value[book_choice], "cost": book.cost[book_choice],
+                                              "drawdown": book.drawdown[book_choice]})
+                with instrumentation.stage("figure.portfolio"):
+                    fig_book = charts.portfolio_figure(book_view, report_currency, start=view_start, end=view_end)
+                with instrumentation.stage("render.portfolio") as step:
+                    st.plotly_chart(step.payload(fig_book), use_container_width=True)
+                st.dataframe(book.summary().sort_values("Lời / Lỗ", ascending=False),
+                             use_container_width=True, column_config={
+                                 column: st.column_config.NumberColumn(column, format="%.0f")
+                                 for column in ("Giá trị", "Vốn", "Lời / Lỗ")})
+                st.caption(f"*Định giá theo {report_currency} trên {len(book.index):,} phiên; "
+                           "lợi suất loại bỏ dòng tiền vào, sụt giảm tính từ đỉnh của chỉ số tăng trưởng.*")
+
+        # --- SECTION 4: BẢNG DỮ LIỆU CHI TIẾT (MỚI) ---
+        st.divider()
+        st.subheader("📋 Dữ Liệu Chi Tiết & Tương Quan (Gold vs DXY)")
+
+        with st.expander("Xem bảng dữ liệu chi tiết", expanded=True):
+            # Chuẩn bị dữ liệu hiển thị, đảo ngược để xem ngày mới nhất trước
+            display_df = df[['Gold', 'DXY', 'RSI', 'Correlation']].sort_index(ascending=False)
+
+            # Sử dụng column_config để hiển thị đẹp hơn
+            st.dataframe(
+                display_df,
+                use_container_width=True,
+                height=400,
+                column_config={
+                    "Gold": st.column_config.NumberColumn(
+                        "Giá Vàng ($)", format="$%.2f"
+                    ),
+                    "DXY": st.column_config.NumberColumn(
+                        "DXY Index", format="%.2f"
+                    ),
+                    "RSI": st.column_config.ProgressColumn(
+                        "RSI (Sức mạnh)", format="%.1f", min_value=0, max_value=100
+                    ),
+                    "Correlation": st.column_config.NumberColumn(
+                        "Tương quan (30p)", format="%.2f"
+                    )
+                }
+            )
+            st.caption("*Tương quan (Correlation): Gần -1 là ngược chiều nhau, gần 1 là cùng chiều.*")
+
+        # --- SECTION 5: KẾT QUẢ BACKTEST ---
+        with st.expander("📊 Xem Dữ Liệu Kiểm Chứng RSI (50 Năm)"):
+            # Chỉ tính các phiên đã có kết quả sau 10 phiên
+            overbought = timeline.hit_rate("rsi", regimes.EXTREME)
+
+            b1, b2, b3 = st.columns(3)
+            b1.metric("Số lần RSI > 70", f"{overbought['events']}")
+            b2.metric("Xác suất giảm sau đó", f"{overbought['hit_rate']:.1f}%")
+            b3.metric("Biến động TB", f"{overbought['avg_change'] * 100:.2f}%")
+
+        with st.expander("🧭 Dòng thời gian Vật cực / Tất phản (theo khoảng xem biểu đồ)"):
+            rule_labels = {rule.name: rule.label for rule in timeline.rules}
+            rule_choice = st.selectbox("Luật:", list(rule_labels), format_func=rule_labels.get)
+            segments = timeline.segments(rule_choice, view_start, view_end)
+            st.dataframe(segments[segments['Chế độ'] != regimes.REGIME_LABELS[regimes.NEUTRAL]]
+                         .sort_values('Bắt đầu', ascending=False), hide_index=True, use_container_width=True)
+            st.dataframe(timeline.summary(view_start, view_end), hide_index=True, use_container_width=True)
+            st.caption(f"*{len(segments)} đoạn chế độ trong khoảng xem; trúng khi chuỗi kết quả đảo chiều "
+                       "(giảm sau khi vượt ngưỡng trên, tăng sau khi xuống dưới ngưỡng dưới).*")
+
+        with st.expander("🧪 Quét Backtest đa tín hiệu (ngưỡng × kỳ hạn)"):
+            with instrumentation.stage("compute.backtest_grid") as step:
+                grid = step.payload(get_backtest_grid(version, df))
+            signal_labels = {"rsi": "RSI", "ma200_dev": "Lệch MA200 (%)", "correlation": "Tương quan Vàng/DXY"}
+            g1, g2, g3 = st.columns(3)
+            signal_choice = g1.selectbox("Tín hiệu:", list(signal_labels), format_func=signal_labels.get)
+            direction = g2.radio("Điều kiện:", ["above", "below"],
+                                 format_func=lambda d: "Vượt trên ngưỡng (chờ giảm)" if d == "above" else "Dưới ngưỡng (chờ tăng)")
+            min_events = g3.number_input("Số lần tối thiểu", min_value=1, value=30, step=10)
+
+            view = grid[(grid['signal'] == signal_choice) & (grid['direction'] == direction) & (grid['events'] >= min_events)]
+            heat = view.pivot(index='threshold', columns='horizon', values='hit_rate')
+            fig_bt = charts.backtest_heatmap(heat, signal_labels[signal_choice])
+            with instrumentation.stage("render.backtest_heatmap") as step:
+                st.plotly_chart(step.payload(fig_bt), use_container_width=True)
+
+            st.dataframe(view.sort_values('hit_rate', ascending=False).head(20), hide_index=True, use_container_width=True)
+            st.caption(f"*Đã kiểm chứng {len(grid):,} tổ hợp tín hiệu × ngưỡng × kỳ hạn.*")
+
+        with st.expander("🔗 Ma trận tương quan đa tài sản (Vàng, DXY, S&P 500, USD/VND, lợi suất)"):
+            data_refresher.register("gold_dxy.correlation_inputs", get_correlation_inputs, ttl=3600)
+            with instrumentation.stage("data.read_correlation_inputs") as step:
+                corr_snapshot = data_refresher.read("gold_dxy.correlation_inputs")
+                corr_inputs = step.payload(corr_snapshot.value)
+            with instrumentation.stage("compute.correlation_engine"):
+                corr_engine = get_correlation_engine(corr_snapshot.fetched_at, corr_inputs)
+            m1, m2 = st.columns(2)
+            corr_window = m1.selectbox("Cửa sổ tương quan (phiên):", corr_engine.windows)
+            corr_date = m2.date_input("Tại ngày:", value=corr_engine.index[-1].date(),
+                                      min_value=corr_engine.index[0].date(), max_value=corr_engine.index[-1].date())
+            with instrumentation.stage("compute.correlation_matrix"):
+                corr_matrix = corr_engine.matrix(corr_window, corr_date)
+            with instrumentation.stage("render.correlation_heatmap") as step:
+                st.plotly_chart(step.payload(charts.correlation_heatmap(corr_matrix)), use_container_width=True)
+
+            p1, p2 = st.columns(2)
+            pair_a = p1.selectbox("Tài sản A:", corr_engine.columns, index=0)
+            pair_b = p2.selectbox("Tài sản B:", corr_engine.columns, index=1)
+            with instrumentation.stage("figure.correlation_pair"):
+                pair_series = {w: corr_engine.pair(pair_a, pair_b, w) for w in corr_engine.windows}
+                fig_pair = charts.correlation_pair_figure(pair_series, start=view_start, end=view_end)
+            with instrumentation.stage("render.correlation_pair") as step:
+                st.plotly_chart(step.payload(fig_pair), use_container_width=True)
+            st.caption(f"*{len(corr_engine.columns)} chuỗi × {len(corr_engine.windows)} cửa sổ, "
+                       "mọi cặp được tính trong một lượt vector hóa.*")
+
+    except Exception as e:
+        st.error(f"Lỗi hệ thống hoặc đường truyền dữ liệu: {str(e)}")
+
+    instrumentation.finish()
@@ -0,0 +1,227 @@
+import streamlit as st
+import pandas as pd
+
+from macro_bot import instrumentation
+from macro_bot.compute import montecarlo, portfolio, regimes
+from macro_bot.data import compact, intraday, market_store, refresher
+from macro_bot.view import figures, widgets
+
+# 2. Dữ liệu lịch sử lạm phát 
+vn_inflation_hist = {
+    "Năm": [2008, 2011, 2012, 2015, 2020, 2022, 2023, 2024, 2025],
+    "Lạm phát (%)": [19.8, 18.1, 9.2, 0.6, 3.2, 3.1, 3.2, 3.5, 4.0],
+    "Sự kiện": ["Khủng hoảng TG", "Vật cực - Lạm phát đỉnh", "Tất phản - Thắt chặt", "Thấp kỷ lục", "Đại dịch", "Hồi phục", "Ổn định", "Tăng nhẹ", "Tiền 2026"]
+}
+df_hist = pd.DataFrame(vn_inflation_hist)
+
+# 3. Hàm lấy dữ liệu
+# Luồng nền làm mới trước khi hết hạn (qua bộ nhớ đệm dùng chung giữa các worker),
+# trang chỉ đọc bản chụp gần nhất nên không phải chờ tải mạng
+def load_data():
+    tickers = ["GC=F", "^GSPC", "VND=X"]
+    data = market_store.load_closes(tickers, start="2023-01-01")
+    # Bản chụp lưu gọn (float32, chỉ đọc), dùng chung giữa các phiên
+    return compact.CompactFrame.from_frame(data)
+
+# Ảnh biểu đồ đã vẽ, dùng chung trong tiến trình và giới hạn số lượng
+@st.cache_resource
+def get_figure_cache():
+    return figures.FigureCache(max_entries=128)
+
+# Mô phỏng Monte Carlo, cache theo đúng các đầu vào của mô phỏng
+# (chuỗi giá nhận diện qua phiên bản dữ liệu, không băm lại mỗi lần chạy lại)
+@st.cache_data(ttl=3600)
+def estimate_mc_params(version, _gold_series, _usdvnd_series):
+    return montecarlo.estimate_params(_gold_series, _usdvnd_series)
+
+# Giá quy đổi VNĐ của vàng, S&P 500 và USD cho máy tính đầu tư, theo phiên bản dữ liệu
+@st.cache_resource(ttl=3600, max_entries=2)
+def get_portfolio_engine(version, _df_raw):
+    return portfolio.PortfolioEngine(_df_raw)
+
+# Bộ đệm nến phút dùng chung giữa các phiên: mỗi phút chỉ một phiên hỏi yfinance
+@st.cache_resource
+def get_intraday_feed():
+    return intraday.IntradayFeed()
+
+# Chỉ phần này chạy lại mỗi phút (fragment): chỉ số và đuôi biểu đồ cập nhật, lịch sử ngày không vẽ lại
+@st.fragment(run_every=intraday.POLL_SECONDS)
+def intraday_panel(premium_sjc):
+    feed = get_intraday_feed()
+    feed.refresh()
+    tail = feed.frame(intraday.TAIL_BARS)
+    if feed.error:
+        st.warning(f"⚠️ Lỗi tải nến phút: {feed.error}")
+    if tail.empty:
+        st.info("Đang chờ nến 1 phút từ thị trường...")
+        return
+    sjc = montecarlo.sjc_price(tail["GC=F"], tail["VND=X"], premium_sjc)
+    i1, i2, i3 = st.columns(3)
+    i1.metric("Vàng (USD/oz, phút)", f"{tail['GC=F'].iloc[-1]:,.1f}",
+              delta=f"{tail['GC=F'].iloc[-1] - tail['GC=F'].iloc[0]:+,.1f}")
+    i2.metric("USD/VND (phút)", f"{tail['VND=X'].iloc[-1]:,.0f}",
+              delta=f"{tail['VND=X'].iloc[-1] - tail['VND=X'].iloc[0]:+,.0f}")
+    i3.metric("SJC quy đổi (Tr/lượng)", f"{sjc.iloc[-1]:.2f}", delta=f"{sjc.iloc[-1] - sjc.iloc[0]:+.2f}")
+    st.line_chart(sjc.rename("SJC quy đổi (Tr/lượng)"), height=250)
+    st.caption(f"Nến cuối {tail.index[-1]:%H:%M %d/%m} (giờ VN) · {len(feed)} nến trong bộ đệm "
+               f"({feed.nbytes() / 1024:.0f} KB cố định) · hỏi lại mỗi {intraday.POLL_SECONDS} giây")
+
+@st.cache_data(max_entries=64)
+def run_monte_carlo(curr_gold_usd, curr_exchange_rate, pct_change, premium_sjc, gold_vol, fx_drift, fx_vol, rho):
+    # capital=1 để P&L là tỷ suất, nhân với số vốn ở máy tính đầu tư
+    return montecarlo.simulate(curr_gold_usd, curr_exchange_rate, pct_change, gold_vol, fx_drift, fx_vol, rho,
+                               premium_sjc=premium_sjc, capital=1.0)
+
+
+def render():
+    # 1. Giao diện
+    instrumentation.begin("app")
+    st.title("📊 Hệ thống Theo dõi Vĩ mô & Quy luật 'Vật cực tất phản'")
+    st.markdown(f"**Cập nhật dữ liệu thực tế ngày:** {pd.Timestamp.now().strftime('%d/%m/%Y')}")
+
+    # 4. Luồng xử lý chính
+    try:
+        with instrumentation.stage("data.read") as step:
+            data_refresher = refresher.get_refresher()
+            data_refresher.register("app.load_data", load_data, ttl=3600)
+            snapshot = data_refresher.read("app.load_data")
+            # Bản chụp dùng chung giữa các phiên: DataFrame chỉ đọc trỏ thẳng vào mảng của bản chụp
+            df_raw = step.payload(snapshot.value.frame())
+        widgets.data_status(snapshot)
+        if not df_raw.empty:
+            # Tách dữ liệu
+            gold_series = df_raw["GC=F"].dropna()
+            stock_series = df_raw["^GSPC"].dropna()
+            usdvnd_series = df_raw["VND=X"].dropna()
+
+            curr_gold_usd = float(gold_series.iloc[-1])
+            curr_stock = float(stock_series.iloc[-1])
+            curr_exchange_rate = float(usdvnd_series.iloc[-1])
+
+            # 5. Sidebar cấu hình
+            st.sidebar.header("🕹️ Điều khiển Vĩ mô 2026")
+            cpi = st.sidebar.slider("Lạm phát dự kiến (%)", 1.0, 20.0, 4.5)
+            ir = st.sidebar.slider("Lãi suất huy động (%)", 1.0, 20.0, 7.5)
+            premium_sjc = st.sidebar.number_input("Chênh lệch SJC (Tr/lượng)", value=4.0)
+            intraday_mode = st.sidebar.toggle("⚡ Giá trong ngày (nến 1 phút)", value=False)
+            real_ir = ir - cpi
+
+            st.sidebar.divider()
+            st.sidebar.header("🏆 Kịch bản Vàng 2026")
+
+            # SỬA ĐỔI PHẦN KỊCH BẢN THEO YÊU CẦU
+            scenario = st.sidebar.selectbox("Chọn trạng thái thị trường:", 
+                ["Bình thường", "Vật cực (Sốt nóng)", "Tất phản (Điều chỉnh)", "Đi ngang (Sideway)", "Tự nhập con số"])
+
+            reason = ""
+            if scenario == "Bình thường":
+                pct_change = 7.5  # Trung bình +5% đến +10%
+                reason = "Kinh tế ổn định, lạm phát thấp."
+            elif scenario == "Vật cực (Sốt nóng)":
+                pct_change = 30.0 # Trung bình +20% đến +40%
+                reason = "Chiến tranh, khủng hoảng kinh tế, hoặc lạm phát phi mã."
+            elif scenario == "Tất phản (Điều chỉnh)":
+                pct_change = -15.0 # Trung bình -10% đến -20%
+                reason = "Ngân hàng Trung ương tăng lãi suất thực cao, vàng bị bán tháo."
+            elif scenario == "Đi ngang (Sideway)":
+                pct_change = 0.0   # Trung bình -5% đến +5%
+                reason = "Thị trường chờ đợi tín hiệu mới, không có biến động lớn."
+            else:
+                pct_change = st.sidebar.number_input("Nhập % bạn dự đoán:", value=10.0)
+                reason = "Kịch bản tùy chỉnh dựa trên phân tích cá nhân."
+
+            st.sidebar.caption(f"**Giải thích:** {reason}")
+            # 6. Hiển thị Dashboard chỉ số chính
+            gold_sjc_converted = montecarlo.sjc_price(curr_gold_usd, curr_exchange_rate, premium_sjc)
+
+            m1, m2, m3 = st.columns(3)
+            m1.metric("Vàng SJC Dự báo (Tr/lượng)", f"{gold_sjc_converted:.2f}")
+            m2.metric("Lãi Suất Thực (Real IR)", f"{real_ir:.1f}%", delta=f"{real_ir-2.0:.1f}%")
+            m3.metric("S&P 500", f"{curr_stock:,.1f}")
+
+            if intraday_mode:
+                st.subheader("⚡ Giá trong ngày")
+                intraday_panel(premium_sjc)
+
+            # 7. Vẽ biểu đồ tương quan Live & Dự báo
+            st.subheader("📈 Mô Phỏng diễn biến tương quan & Dự báo hướng đi")
+            fig_cache = get_figure_cache()
+            version = figures.data_version(gold_series, stock_series, usdvnd_series)
+            with instrumentation.stage("figure.gold_projection") as step:
+                png = step.payload(figures.gold_projection(fig_cache, version, gold_series, stock_series, real_ir))
+            with instrumentation.stage("render.gold_projection"):
+                st.image(png)
+
+            # 7b. Mô phỏng Monte Carlo giá SJC cho kịch bản đã chọn
+            st.subheader("🎲 Mô phỏng Monte Carlo giá SJC (1 năm)")
+            with instrumentation.stage("compute.monte_carlo") as step:
+                mc_params = estimate_mc_params(version, gold_series, usdvnd_series)
+                mc = step.payload(run_monte_carlo(curr_gold_usd, curr_exchange_rate, pct_change, premium_sjc, **mc_params))
+            mc_dates = pd.bdate_range(start=gold_series.index[-1], periods=mc["step_days"][-1] + 1)[mc["step_days"]]
+            bands = dict(zip(mc["percentiles"], mc["sjc_bands"]))
+
+            with instrumentation.stage("figure.monte_carlo") as step:
+                png = step.payload(fig_cache.png(("monte_carlo", version, pct_change, premium_sjc),
+                                                 figures.draw_monte_carlo, mc_dates, bands, figsize=(10, 4)))
+            with instrumentation.stage("render.monte_carlo"):
+                st.image(png)
+            st.caption(f"*{scenario}: biến động Vàng {mc_params['gold_vol'] * 100:.1f}%/năm, "
+                       f"USD/VND {mc_params['fx_vol'] * 100:.1f}%/năm, tương quan {mc_params['rho']:.2f}.*")
+
+            # 8. Tham chiếu lịch sử & Phân tích
+            st.divider()
+            col_hist1, col_hist2 = st.columns([2, 1])
+
+            with col_hist1:
+                st.subheader("📚 Lịch sử Lạm phát Việt Nam")
+                with instrumentation.stage("figure.inflation_history") as step:
+                    png = step.payload(figures.inflation_history(fig_cache, df_hist, cpi))
+                st.image(png)
+
+            with col_hist2:
+                st.write("**Bảng dữ liệu chi tiết**")
+                st.dataframe(df_hist, hide_index=True)
+
+            # 9. Nhận định tự động
+            st.subheader("💡 Nhận định từ Hệ thống")
+            regime = regimes.REAL_IR_RULE.classify(real_ir)
+            if regime == regimes.EXTREME:
+                st.warning("⚠️ **VẬT CỰC:** Lãi suất thực âm. Dòng tiền có xu hướng tháo chạy khỏi ngân hàng để tìm đến Vàng/Bất động sản.")
+            elif regime == regimes.REVERSAL:
+                st.success("🏦 **TẤT PHẢN:** Lãi suất thực đang rất hấp dẫn. Gửi tiết kiệm là kênh trú ẩn an toàn và hiệu quả nhất lúc này.")
+            else:
+                st.info("⚖️ **TRUNG TÍNH:** Thị trường đang cân bằng. Hãy quan sát thêm các tín hiệu từ tỷ giá.")
+
+            # 10. Máy tính lợi nhuận đầu tư
+            st.divider()
+            st.subheader("🧮 Máy tính Lợi nhuận Đầu tư")
+            von = st.number_input("Nhập số vốn đầu tư (VNĐ):", value=1000000000, step=10000000)
+
+            c_gold, c_bank = st.columns(2)
+            with c_gold:
+                loi_nhuan_vang = von * (pct_change / 100)
+                st.info(f"Kịch bản Vàng ({scenario} {pct_change}%):\n\n**{loi_nhuan_vang:,.0f} VNĐ**")
+                pnl_bands = dict(zip(mc["percentiles"], mc["pnl_percentiles"] * von))
+                st.caption(f"Monte Carlo: xấu (5%) **{pnl_bands[5]:,.0f}** · trung vị **{pnl_bands[50]:,.0f}** · "
+                           f"tốt (95%) **{pnl_bands[95]:,.0f}** VNĐ — xác suất lỗ {mc['prob_loss'] * 100:.0f}%")
+            with c_bank:
+                loi_nhuan_bank = von * (ir / 100)
+                st.success(f"Gửi tiết kiệm (Lãi suất {ir}%):\n\n**{loi_nhuan_bank:,.0f} VNĐ**")
+
+            # Kiểm chứng lịch sử: cùng số vốn vào từng kênh từ một ngày trong quá khứ
+            first_day, last_day = df_raw.index[0].date(), df_raw.index[-1].date()
+            default_day = max(first_day, (df_raw.index[-1] - pd.DateOffset(years=1)).date())
+            since = st.date_input("Nếu đã đầu tư từ ngày:", value=default_day, min_value=first_day, max_value=last_day)
+            with instrumentation.stage("compute.portfolio") as step:
+                book = step.payload(get_portfolio_engine(version, df_raw).value(
+                    portfolio.channel_positions(von, since, ir)))
+            st.line_chart(book.value, height=300)
+            st.dataframe(book.summary()[["Giá trị", "Lời / Lỗ", "Lời / Lỗ (%)", "Sụt giảm tối đa (%)"]].round(1),
+                         use_container_width=True)
+            st.caption(f"*Giá trị theo VNĐ từ {book.index[0]:%d/%m/%Y}; vàng và S&P 500 quy đổi theo tỷ giá từng phiên, "
+                       f"tiền gửi tính lãi đơn {ir}%/năm.*")
+
+    except Exception as error:
+        st.error(f"Đang chờ dữ liệu từ thị trường... (Lỗi: {error})")
+
+    instrumentation.finish()
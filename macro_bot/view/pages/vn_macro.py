@@ -0,0 +1,103 @@
+import streamlit as st
+
+from macro_bot import instrumentation
+from macro_bot.compute import regimes, windows
+from macro_bot.data import compact, macro_generator
+from macro_bot.view import charts
+
+# Các giai đoạn quan sát của thanh trượt
+PERIODS = ["5Y", "10Y", "15Y", "20Y"]
+
+# Một bản gọn (float32, chỉ đọc) dùng chung giữa các phiên thay vì một bản sao cho mỗi lần trúng cache
+@st.cache_resource(ttl=86400)
+def fetch_comprehensive_data(start='2005-01-01', end='2026-01-01', freq='ME'):
+    # Tạo dữ liệu từ 2005 - 2026 (21 năm) từ các bảng chế độ theo năm
+    return compact.CompactFrame.from_frame(macro_generator.generate_macro_frame(start=start, end=end, freq=freq))
+
+# Vị trí bắt đầu của mọi giai đoạn quan sát: kéo thanh trượt chỉ còn cắt iloc
+@st.cache_resource(ttl=86400, max_entries=2)
+def get_vn_windows():
+    return windows.WindowIndex(fetch_comprehensive_data().frame(), PERIODS)
+
+# Chế độ của các luật dòng tiền / tỷ giá / chứng khoán trên toàn bộ lịch sử
+@st.cache_resource(ttl=86400, max_entries=2)
+def get_vn_regimes():
+    inputs = regimes.vn_inputs(fetch_comprehensive_data().frame())
+    return inputs, regimes.RegimeTimeline(inputs, regimes.VN_RULES)
+
+
+def history_caption(timeline, name):
+    code = timeline.current(name)
+    stats = timeline.hit_rate(name, code) if code != regimes.NEUTRAL else {"events": 0}
+    if stats["events"]:
+        st.caption(f"Lịch sử: {stats['events']} tháng tương tự, VN-Index đi đúng hướng sau 12 tháng "
+                   f"{stats['hit_rate']:.0f}% số lần.")
+
+
+def render():
+    instrumentation.begin("vn_macro")
+    st.title("🚀 Hệ Thống Phân Tích Tổng Lực Vĩ Mô Việt Nam")
+    st.markdown("Sự kết hợp giữa **Cung tiền (M2)**, **Tín dụng**, **Tỷ giá USD/VND** và **VN-Index**")
+
+    try:
+        with instrumentation.stage("data.generate") as step:
+            df = step.payload(fetch_comprehensive_data().frame())
+
+        # --- SIDEBAR ---
+        st.sidebar.header("🔍 Tùy chọn hiển thị")
+        period = st.sidebar.select_slider("Giai đoạn quan sát:", options=PERIODS, value="20Y")
+        df_view = get_vn_windows().view(df, period)
+
+        show_m2 = st.sidebar.checkbox("Hiện Cung tiền (M2)", value=True)
+        show_credit = st.sidebar.checkbox("Hiện Tăng trưởng Tín dụng", value=True)
+        show_fx = st.sidebar.checkbox("Hiện Tỷ giá USD/VND", value=True)
+
+        # --- BIỂU ĐỒ ĐA TRỤC ---
+        st.subheader(f"📈 Tương quan Vĩ mô & Chứng khoán ({period})")
+
+        with instrumentation.stage("figure.vn_macro"):
+            fig = charts.vn_macro_figure(df_view, show_m2=show_m2, show_credit=show_credit, show_fx=show_fx)
+
+        with instrumentation.stage("render.vn_macro") as step:
+            st.plotly_chart(step.payload(fig), use_container_width=True)
+
+        # --- PHÂN TÍCH THÔNG MINH ---
+        st.divider()
+        st.subheader("🤖 Nhận Định Tình Huống")
+
+        col1, col2, col3 = st.columns(3)
+
+        latest = df.iloc[-1]
+        with instrumentation.stage("compute.regimes"):
+            inputs, timeline = get_vn_regimes()
+
+        with col1:
+            st.write("#### 💸 Dòng tiền")
+            if timeline.current("credit_spread") == regimes.EXTREME:
+                st.warning(f"**Thanh khoản hẹp:** Tín dụng ({latest['Credit_Growth']:.1f}%) đang chạy nhanh hơn M2. Áp lực tăng lãi suất huy động là rất lớn.")
+            else:
+                st.success("**Thanh khoản tốt:** Dòng tiền dồi dào, hỗ trợ thị trường tài chính ổn định.")
+            history_caption(timeline, "credit_spread")
+
+        with col2:
+            st.write("#### 💵 Tỷ giá")
+            # So với cùng kỳ năm ngoái
+            fx_change = inputs['FX_Change_12M'].iloc[-1]
+            if timeline.current("fx_change") == regimes.EXTREME:
+                st.error(f"**Tỷ giá căng thẳng:** VND mất giá {fx_change:.1f}% trong năm qua. Rủi ro khối ngoại bán ròng trên TTCK tăng cao.")
+            else:
+                st.info("**Tỷ giá ổn định:** Ngân hàng Nhà nước đang kiểm soát tốt biến động tiền tệ.")
+            history_caption(timeline, "fx_change")
+
+        with col3:
+            st.write("#### 📈 Chứng khoán")
+            if timeline.current("m2_opportunity") == regimes.REVERSAL:
+                st.success("**Cơ hội:** Cung tiền đang mở rộng nhưng chỉ số chưa tăng tương ứng. Dư địa tăng trưởng vẫn còn.")
+            else:
+                st.write("**Trạng thái:** Thị trường đang phản ánh khá sát các biến số vĩ mô.")
+            history_caption(timeline, "m2_opportunity")
+
+    except Exception as e:
+        st.error(f"Lỗi hệ thống: {e}")
+
+    instrumentation.finish()
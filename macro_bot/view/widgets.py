@@ -0,0 +1,11 @@
+import streamlit as st
+
+from macro_bot.data import refresher, shared_cache
+
+
+def data_status(snapshot):
+    # Tuổi bản chụp từ luồng làm mới nền, lỗi làm mới gần nhất và bộ đếm cache dùng chung
+    st.sidebar.caption(f"⏱️ Dữ liệu cập nhật {refresher.format_age(snapshot.age())} trước")
+    if snapshot.error:
+        st.sidebar.warning(f"⚠️ Làm mới dữ liệu lỗi, đang hiển thị bản cũ: {snapshot.error}")
+    st.sidebar.caption(f"🗄️ Cache dùng chung — {shared_cache.get_cache().summary()}")
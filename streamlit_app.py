@@ -0,0 +1,25 @@
+import importlib
+
+import streamlit as st
+
+# Điểm vào duy nhất cho mọi Dashboard: streamlit run streamlit_app.py
+# Module của trang (cùng Plotly/Matplotlib/yfinance mà trang cần) chỉ được nhập khi trang được mở lần đầu,
+# nên worker khởi động nhanh và không giữ thư viện của các trang chưa ai xem.
+
+# (module trong macro_bot.view.pages, tiêu đề, biểu tượng)
+PAGES = [
+    ("gold_sjc", "Vàng SJC & Vĩ mô 2026", "📊"),
+    ("gold_dxy", "Vàng, DXY & Danh mục", "🧠"),
+    ("global_rates", "Lãi suất toàn cầu", "🌐"),
+    ("vn_macro", "Vĩ mô Việt Nam", "🚀"),
+]
+
+
+def _page(module, title, icon, default=False):
+    def run():
+        importlib.import_module(f"macro_bot.view.pages.{module}").render()
+    return st.Page(run, title=title, icon=icon, url_path=module, default=default)
+
+
+st.set_page_config(page_title="Macro Dashboard", layout="wide")
+st.navigation([_page(*page, default=i == 0) for i, page in enumerate(PAGES)]).run()
@@ -0,0 +1,72 @@
+import numpy as np
+import pandas as pd
+from numpy.testing import assert_allclose
+
+from macro_bot.compute import backtest
+
+THRESHOLDS = {
+    "rsi": np.array([30.0, 50.0, 70.0]),
+    "ma200_dev": np.array([-10.0, 0.0, 12.0]),
+    "correlation": np.array([-0.5, 0.0, 0.5]),
+}
+HORIZONS = np.array([1, 5, 10, 60])
+
+
+def make_frame(n=900, seed=11):
+    rng = np.random.default_rng(seed)
+    gold = pd.Series(1500 * np.exp(np.cumsum(rng.normal(0.0002, 0.01, n))),
+                     index=pd.bdate_range("2020-01-01", periods=n))
+    df = pd.DataFrame({"Gold": gold})
+    df["MA200"] = gold.rolling(200).mean()
+    df["RSI"] = np.clip(50 + np.cumsum(rng.normal(0, 4, n)) % 80 - 40 + rng.normal(0, 5, n), 0, 100)
+    df.loc[df.index[:14], "RSI"] = np.nan
+    df["Correlation"] = np.tanh(np.cumsum(rng.normal(0, 0.1, n)))
+    df.loc[df.index[:30], "Correlation"] = np.nan
+    return df
+
+
+def loop_sweep(df, thresholds, horizons):
+    # Từng tham số một: chọn các phiên có tín hiệu, lấy lợi suất sau h phiên còn trong chuỗi
+    values = backtest.signal_values(df)
+    prices = df["Gold"].to_numpy()
+    rows = []
+    for name, grid in thresholds.items():
+        for direction in ("above", "below"):
+            for threshold in grid:
+                signal = values[name] > threshold if direction == "above" else values[name] < threshold
+                for h in horizons:
+                    days = np.flatnonzero(signal[:len(prices) - h])
+                    returns = prices[days + h] / prices[days] - 1
+                    hits = (returns < 0) if direction == "above" else (returns > 0)
+                    events = len(days)
+                    rows.append({
+                        "signal": name, "direction": direction, "threshold": threshold, "horizon": h,
+                        "events": events,
+                        "hit_rate": hits.sum() / events * 100 if events else np.nan,
+                        "avg_return": returns.mean() * 100 if events else np.nan,
+                    })
+    return pd.DataFrame(rows)
+
+
+def test_sweep_matches_per_parameter_loop():
+    df = make_frame()
+    result = backtest.sweep(df, THRESHOLDS, HORIZONS)
+    expected = loop_sweep(df, THRESHOLDS, HORIZONS)
+
+    assert len(result) == len(expected) == sum(2 * len(g) for g in THRESHOLDS.values()) * len(HORIZONS)
+    for column in ("signal", "direction"):
+        assert list(result[column].astype(str)) == list(expected[column])
+    assert_allclose(result["threshold"], expected["threshold"])
+    assert (result["horizon"].to_numpy() == expected["horizon"].to_numpy()).all()
+    assert (result["events"].to_numpy() == expected["events"].to_numpy()).all()
+    assert_allclose(result["hit_rate"], expected["hit_rate"], rtol=1e-12, equal_nan=True)
+    assert_allclose(result["avg_return"], expected["avg_return"], rtol=1e-9, atol=1e-12, equal_nan=True)
+    # Ngưỡng không bao giờ vượt thì không có sự kiện
+    assert (result["events"] > 0).any() and result["hit_rate"].notna().any()
+
+
+def test_forward_returns_stop_at_end_of_series():
+    prices = np.array([100.0, 110.0, 99.0, 120.0])
+    returns = backtest.forward_returns(prices, [1, 3])
+    assert_allclose(returns[0], [0.1, -0.1, 120 / 99 - 1, np.nan], equal_nan=True)
+    assert_allclose(returns[1], [0.2, np.nan, np.nan, np.nan], equal_nan=True)
@@ -0,0 +1,51 @@
+import numpy as np
+import pandas as pd
+import pytest
+from numpy.testing import assert_allclose
+
+from macro_bot.compute import correlation
+
+
+def make_frame(n_rows=700, n_cols=4, seed=5):
+    rng = np.random.default_rng(seed)
+    idx = pd.bdate_range("2020-01-01", periods=n_rows)
+    # Chuỗi giá mức lớn, có tương quan chung, lỗ hổng rải rác và một chuỗi bắt đầu muộn
+    common = np.cumsum(rng.normal(0, 1, n_rows))
+    values = 1000 + 50 * common[:, None] + np.cumsum(rng.normal(0, 1, (n_rows, n_cols)), axis=0) * 30
+    values[rng.random(values.shape) < 0.02] = np.nan
+    values[:120, -1] = np.nan
+    return pd.DataFrame(values, index=idx, columns=[f"S{i}" for i in range(n_cols)])
+
+
+@pytest.mark.parametrize("n_cols, window, block", [
+    (4, 30, correlation.BLOCK_SIZE),
+    (4, 90, 64),          # nhiều khối, cửa sổ lớn hơn nửa khối
+    (16, 20, 37),         # đủ nhiều cặp để cộng dồn theo từng hàng
+])
+def test_tensor_matches_pandas_rolling_corr(n_cols, window, block):
+    frame = make_frame(n_cols=n_cols)
+    tensor = correlation.rolling_corr_matrix(frame, window, block)
+    expected = frame.rolling(window).corr().to_numpy().reshape(len(frame), n_cols, n_cols)
+
+    assert tensor.shape == expected.shape and tensor.dtype == np.float32
+    assert (np.isnan(tensor) == np.isnan(expected)).all()
+    assert_allclose(tensor, expected, atol=2e-5, equal_nan=True)
+
+
+def test_short_frame_is_all_nan():
+    frame = make_frame().iloc[200:210]
+    assert np.isnan(correlation.rolling_corr_matrix(frame, 30)).all()
+
+
+def test_engine_matrix_and_pair_read_the_tensor():
+    frame = make_frame()
+    engine = correlation.CorrelationEngine(frame, windows=(30,))
+    expected = frame.rolling(30).corr()
+
+    date = frame.index[400] + pd.Timedelta(days=1)
+    matrix = engine.matrix(30, date)
+    assert_allclose(matrix, expected.loc[frame.index[400]], atol=2e-5)
+    pair = engine.pair("S0", "S2", 30)
+    assert_allclose(pair, expected.xs("S0", level=1)["S2"], atol=2e-5, equal_nan=True)
+    assert engine.tensor(30) is engine.tensor(30)
+    assert not engine.tensor(30).flags.writeable
@@ -0,0 +1,134 @@
+import gc
+import itertools
+import tracemalloc
+
+import matplotlib.pyplot as plt
+import numpy as np
+import pandas as pd
+
+from macro_bot.view import figures
+
+DF_HIST = pd.DataFrame({
+    "Năm": [2008, 2011, 2012, 2015, 2020, 2022, 2023, 2024, 2025],
+    "Lạm phát (%)": [19.8, 18.1, 9.2, 0.6, 3.2, 3.1, 3.2, 3.5, 4.0],
+})
+# Vùng kéo thanh trượt quanh mặc định của trang Vàng SJC, bước 0.1 như trên Dashboard
+CPI_VALUES = [round(4.0 + 0.1 * i, 1) for i in range(6)]
+IR_VALUES = [round(7.0 + 0.1 * i, 1) for i in range(4)]
+# Chênh lệch bộ nhớ cho phép giữa hai mốc đo (một ảnh PNG của trang đã vài chục KB)
+MEMORY_BOUND = 1024 * 1024
+
+
+def make_series(seed=0):
+    rng = np.random.default_rng(seed)
+    idx = pd.bdate_range("2023-01-01", periods=800)
+    gold = pd.Series(1900 * np.exp(np.cumsum(rng.normal(0, 0.01, len(idx)))), index=idx)
+    stock = pd.Series(4000 * np.exp(np.cumsum(rng.normal(0, 0.01, len(idx)))), index=idx)
+    return gold, stock
+
+
+def rerun(cache, gold, stock, cpi, ir):
+    # Cùng lời gọi như view/pages/gold_sjc.py
+    version = figures.data_version(gold, stock)
+    figures.gold_projection(cache, version, gold, stock, ir - cpi)
+    figures.inflation_history(cache, DF_HIST, cpi)
+    return cache.layer(figures.history_key(version), figures.ProjectionChart, gold, stock)
+
+
+def traced():
+    gc.collect()
+    return tracemalloc.get_traced_memory()[0]
+
+
+def test_thousands_of_reruns_keep_memory_flat():
+    gold, stock = make_series()
+    cache = figures.FigureCache(max_entries=32)
+    rng = np.random.default_rng(1)
+    # Lần kéo đầu tiên qua cả vùng: mỗi ảnh khác nhau vẽ đúng một lần, nền lịch sử một lần mỗi giới hạn trục
+    for cpi, ir in itertools.product(CPI_VALUES, IR_VALUES):
+        chart = rerun(cache, gold, stock, cpi, ir)
+    real_irs = {round(ir - cpi, 1) for cpi in CPI_VALUES for ir in IR_VALUES}
+    assert cache.misses == len(CPI_VALUES) + len(real_irs)
+    assert chart.full_draws == len({chart.ylim(chart.projection(r)) for r in real_irs})
+    warm, full_draws = cache.misses, chart.full_draws
+
+    tracemalloc.start()
+    try:
+        early = traced()
+        for i in range(3000):
+            rerun(cache, gold, stock, rng.choice(CPI_VALUES), rng.choice(IR_VALUES))
+            if i == 500:
+                early = traced()
+        late = traced()
+    finally:
+        tracemalloc.stop()
+
+    assert cache.misses == warm
+    assert chart.full_draws == full_draws
+    assert len(plt.get_fignums()) == 0
+    assert len(cache) <= cache.max_entries
+    assert late - early < MEMORY_BOUND
+
+
+def test_eviction_bounds_cache_and_memory():
+    def draw(fig, k):
+        ax = fig.add_subplot()
+        ax.plot([0, 1, 2], [0, k, 0])
+
+    cache = figures.FigureCache(max_entries=8)
+    # Đầy bộ nhớ đệm trước (font, bộ đệm của matplotlib được tạo ở lần vẽ đầu), sau đó mỗi ảnh mới đẩy ảnh cũ ra
+    for k in range(12):
+        cache.png(("churn", k), draw, k, figsize=(2, 1))
+    tracemalloc.start()
+    try:
+        early = traced()
+        for k in range(12, 36):
+            cache.png(("churn", k), draw, k, figsize=(2, 1))
+        late = traced()
+    finally:
+        tracemalloc.stop()
+
+    assert cache.misses == 36
+    assert ("churn", 27) not in cache and ("churn", 35) in cache
+    assert len(cache) == cache.max_entries
+    assert len(plt.get_fignums()) == 0
+    assert late - early < MEMORY_BOUND
+
+
+def test_projection_keyed_by_real_ir_not_cpi():
+    gold, stock = make_series()
+    cache = figures.FigureCache(max_entries=16)
+    version = figures.data_version(gold, stock)
+    rerun(cache, gold, stock, 4.5, 7.5)
+    assert cache.misses == 2
+    assert figures.projection_key(version, 3.0) in cache and figures.inflation_key(4.5) in cache
+
+    # cpi đổi nhưng lãi suất thực giữ nguyên (3.0): chỉ biểu đồ lạm phát vẽ lại
+    rerun(cache, gold, stock, 5.0, 8.0)
+    assert cache.misses == 3 and cache.hits == 1
+
+    # Chỉ lãi suất huy động đổi: biểu đồ lạm phát lấy từ bộ nhớ đệm
+    rerun(cache, gold, stock, 5.0, 8.4)
+    assert cache.misses == 4 and cache.hits == 2
+    assert figures.projection_key(version, 3.4) in cache
+    assert len(plt.get_fignums()) == 0
+
+
+def test_slider_moves_redraw_only_the_projection():
+    gold, stock = make_series()
+    chart = figures.ProjectionChart(gold, stock)
+    # Các mức lãi suất thực có cùng giới hạn trục: lịch sử chỉ được raster một lần
+    real_irs = [3.0, 3.1, 3.2, 3.5]
+    assert len({chart.ylim(chart.projection(r)) for r in real_irs}) == 1
+    images = [chart.png(r) for r in real_irs]
+    assert chart.full_draws == 1
+    assert len(set(images)) == len(real_irs)
+    # Vẽ lại cùng mức cho đúng cùng một ảnh: nền được trả về trạng thái sạch sau mỗi lần
+    assert chart.png(3.0) == images[0]
+
+    # Dự báo vượt khỏi vùng lịch sử thì nới trục và vẽ nền mới, vẫn thấy toàn bộ đường dự báo
+    projection = chart.projection(-19.0)
+    low, high = chart.ylim(projection)
+    assert low <= min(projection) and max(projection) <= high
+    chart.png(-19.0)
+    assert chart.full_draws == 2
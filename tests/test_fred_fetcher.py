@@ -0,0 +1,130 @@
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import pandas as pd
+import pytest
+
+from macro_bot.data import fred_fetcher, sources
+
+SERIES = {
+    "DGS10": b"observation_date,DGS10\n2024-01-02,3.95\n2024-01-03,.\n2024-01-04,3.99\n",
+    "DGS2": b"observation_date,DGS2\n2024-01-02,4.33\n2024-01-03,4.38\n",
+    "IRLTLT01EZM156N": b"observation_date,IRLTLT01EZM156N\n2023-12-01,2.78\n2024-01-01,2.72\n",
+    "CHNYLD10Y": b"observation_date,CHNYLD10Y\n2024-01-02,2.56\n2024-01-03,2.55\n",
+}
+# Độ trễ giả lập mỗi yêu cầu để thấy rõ các yêu cầu có chồng lên nhau hay không
+DELAY = 0.2
+
+
+class StubFred:
+    # Máy chủ HTTP cục bộ giả lập fredgraph.csv: trả ETag, 304 khi khớp If-None-Match, có thể trả 500
+    def __init__(self):
+        self.requests = []
+        self.fail = False
+        self._lock = threading.Lock()
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                started = time.monotonic()
+                series_id = parse_qs(urlparse(self.path).query)["id"][0]
+                time.sleep(DELAY)
+                etag = f'"{series_id}-v1"'
+                if stub.fail:
+                    status, body = 500, b"error"
+                elif self.headers.get("If-None-Match") == etag:
+                    status, body = 304, b""
+                else:
+                    status, body = 200, SERIES[series_id]
+                self.send_response(status)
+                if status != 500:
+                    self.send_header("ETag", etag)
+                    self.send_header("Last-Modified", "Wed, 03 Jan 2024 00:00:00 GMT")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+                with stub._lock:
+                    stub.requests.append({"id": series_id, "status": status, "start": started,
+                                          "end": time.monotonic(), "if_none_match": self.headers.get("If-None-Match")})
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}/fredgraph.csv"
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+@pytest.fixture
+def stub():
+    server = StubFred()
+    yield server
+    server.stop()
+
+
+@pytest.fixture
+def fetcher(stub, tmp_path):
+    return fred_fetcher.FredFetcher(base_url=stub.url, cache_dir=str(tmp_path), source=sources.LiveSource(),
+                                    max_workers=8, timeout=5)
+
+
+def assert_same_frames(actual, expected):
+    assert actual.keys() == expected.keys()
+    for series_id in expected:
+        pd.testing.assert_frame_equal(actual[series_id], expected[series_id])
+
+
+def test_second_fetch_is_all_304_with_same_frames(stub, fetcher):
+    first = fetcher.fetch_many(SERIES)
+    assert {stats["status"] for stats in fetcher.last_stats.values()} == {200}
+    assert first["DGS10"].iloc[:, 0].isna().sum() == 1
+
+    second = fetcher.fetch_many(SERIES)
+    assert_same_frames(second, first)
+    assert set(fetcher.last_stats) == set(SERIES)
+    for series_id, stats in fetcher.last_stats.items():
+        assert stats["status"] == 304
+        assert stats["bytes"] == 0
+        assert stats["error"] is None
+        assert stats["latency"] >= DELAY
+    revalidated = [r for r in stub.requests if r["status"] == 304]
+    assert sorted(r["id"] for r in revalidated) == sorted(SERIES)
+    assert all(r["if_none_match"] == f'"{r["id"]}-v1"' for r in revalidated)
+
+
+def test_requests_overlap(stub, fetcher):
+    started = time.monotonic()
+    fetcher.fetch_many(SERIES)
+    elapsed = time.monotonic() - started
+    requests = sorted(stub.requests, key=lambda r: r["start"])
+    assert len(requests) == len(SERIES)
+    # Yêu cầu cuối bắt đầu trước khi yêu cầu đầu kết thúc: cả lô chạy song song, không tuần tự
+    assert requests[-1]["start"] < requests[0]["end"]
+    assert elapsed < DELAY * len(SERIES)
+
+
+def test_server_error_serves_cached_body(stub, fetcher):
+    cached = fetcher.fetch_many(SERIES)
+    stub.fail = True
+    served = fetcher.fetch_many(SERIES)
+    assert_same_frames(served, cached)
+    for stats in fetcher.last_stats.values():
+        assert stats["error"] and "500" in stats["error"]
+
+
+def test_connection_error_serves_cached_body(stub, fetcher):
+    cached = fetcher.fetch_many(SERIES)
+    stub.stop()
+    served = fetcher.fetch_many(SERIES)
+    assert_same_frames(served, cached)
+    assert all(stats["error"] for stats in fetcher.last_stats.values())
+
+    # Chưa từng tải: không có bản lưu thì trả bảng rỗng
+    assert fetcher.fetch("DGS2_NEW").empty
@@ -0,0 +1,50 @@
+import os
+import signal
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+WRITE = "from macro_bot import instrumentation as i; i.write_metrics(); print(i.METRICS_FILE, flush=True)"
+
+
+def run_worker(data_dir, code=WRITE, worker_id=None, kill=False):
+    env = {**os.environ, "MACRO_BOT_DATA_DIR": str(data_dir), "PYTHONPATH": ROOT}
+    env.pop("MACRO_BOT_METRICS_FILE", None)
+    env.pop("MACRO_BOT_WORKER_ID", None)
+    if worker_id:
+        env["MACRO_BOT_WORKER_ID"] = worker_id
+    if kill:
+        # Tiến trình bị kill không kịp chạy atexit
+        code += "; import os, signal; os.kill(os.getpid(), signal.SIGKILL)"
+    proc = subprocess.run([sys.executable, "-c", code], env=env, capture_output=True, text=True, timeout=60)
+    assert proc.returncode == (-signal.SIGKILL if kill else 0), proc.stderr
+    return proc.stdout.strip()
+
+
+def test_metrics_file_removed_at_exit(tmp_path):
+    path = run_worker(tmp_path)
+    assert os.path.dirname(path) == str(tmp_path / "metrics")
+    assert not os.path.exists(path)
+
+
+def test_files_of_killed_workers_are_pruned(tmp_path):
+    first = run_worker(tmp_path, kill=True)
+    assert os.path.exists(first)
+    # Worker kế tiếp dọn file của PID đã chết ngay lần ghi đầu
+    second = run_worker(tmp_path, kill=True)
+    assert os.listdir(tmp_path / "metrics") == [os.path.basename(second)]
+    run_worker(tmp_path)
+    assert os.listdir(tmp_path / "metrics") == []
+
+
+def test_stable_worker_id_names_the_file_and_labels_metrics(tmp_path):
+    code = ("from macro_bot import instrumentation as i; i._add('app', 'load', 0.5, 10); i.write_metrics(); "
+            "print(i.METRICS_FILE); print(open(i.METRICS_FILE).read(), flush=True)")
+    path, *text = run_worker(tmp_path, code=code, worker_id="web-1").splitlines()
+    assert os.path.basename(path) == "macro_bot-web-1.prom"
+    assert 'macro_bot_stage_seconds_total{worker="web-1",page="app",stage="load"} 0.500000' in text
+
+    # Tên cố định không thuộc PID nào: tiến trình khác không dọn nhầm
+    (tmp_path / "metrics" / "macro_bot-web-2.prom").write_text("")
+    run_worker(tmp_path)
+    assert os.listdir(tmp_path / "metrics") == ["macro_bot-web-2.prom"]
@@ -0,0 +1,59 @@
+import pandas as pd
+import pytest
+
+from macro_bot.data import macro_generator
+
+
+def baseline_frame(start='2005-01-01', end='2026-01-01'):
+    # Bản sao cố định của fetch_comprehensive_data() trong vietnam_macro_analysis.py bản gốc
+    # (chỉ thêm tham số khoảng ngày), không sửa theo bộ sinh mới
+    date_rng = pd.date_range(start=start, end=end, freq='ME')
+    df = pd.DataFrame(index=date_rng)
+
+    df['Credit_Growth'] = [
+        35 if d.year == 2007 else
+        53 if d.year == 2009 else
+        12 if 2011 <= d.year <= 2012 else
+        14.5 if 2015 <= d.year <= 2018 else
+        12.0 for d in date_rng
+    ]
+
+    df['M2_Growth'] = df['Credit_Growth'] * 0.85 + 2
+
+    base_fx = 16000
+    fx_rates = []
+    for d in date_rng:
+        if d.year == 2008: base_fx += 150
+        elif d.year == 2011: base_fx += 200
+        elif d.year >= 2022: base_fx += 100
+        else: base_fx += 20
+        fx_rates.append(base_fx)
+    df['USDVND'] = fx_rates
+
+    vn_val = 200
+    vni_list = []
+    for d in date_rng:
+        if d.year == 2007: vn_val += 80
+        elif d.year == 2008: vn_val -= 70
+        elif 2017 <= d.year <= 2018: vn_val += 40
+        elif 2020 <= d.year <= 2021: vn_val += 55
+        elif d.year == 2022: vn_val -= 45
+        else: vn_val += 1
+        vni_list.append(max(vn_val, 200))
+    df['VNIndex'] = vni_list
+
+    return df
+
+
+def test_default_frame_matches_baseline_exactly():
+    pd.testing.assert_frame_equal(macro_generator.generate_macro_frame(), baseline_frame(), check_exact=True)
+
+
+@pytest.mark.parametrize("start, end", [
+    ("1995-01-01", "2035-12-31"),   # trước và sau mọi bảng chế độ
+    ("2008-06-01", "2009-03-01"),   # bắt đầu giữa năm khủng hoảng: VN-Index nằm ở mức sàn
+    ("2021-12-01", "2023-01-31"),   # bảng tỷ giá không giới hạn năm cuối
+])
+def test_monthly_frames_match_baseline_on_other_windows(start, end):
+    pd.testing.assert_frame_equal(macro_generator.generate_macro_frame(start=start, end=end),
+                                  baseline_frame(start, end), check_exact=True)
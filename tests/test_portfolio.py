@@ -0,0 +1,171 @@
+import numpy as np
+import pandas as pd
+import pytest
+from numpy.testing import assert_allclose
+
+from macro_bot.compute import portfolio
+
+
+def make_closes(n=400, seed=3):
+    rng = np.random.default_rng(seed)
+    idx = pd.bdate_range("2022-01-03", periods=n)
+    closes = pd.DataFrame({
+        "GC=F": 1800 * np.exp(np.cumsum(rng.normal(0, 0.01, n))),
+        "^GSPC": 4500 * np.exp(np.cumsum(rng.normal(0, 0.012, n))),
+        "VND=X": 23000 * np.exp(np.cumsum(rng.normal(0, 0.002, n))),
+    }, index=idx)
+    # Ngày nghỉ lệch nhau giữa các thị trường: giá được lấy phiên gần nhất trước đó
+    for ticker in closes:
+        closes.loc[rng.random(n) < 0.03, ticker] = np.nan
+    closes.iloc[0] = [1800.0, 4500.0, 23000.0]
+    return closes
+
+
+def random_positions(index, n_positions=300, n_accounts=25, seed=0):
+    rng = np.random.default_rng(seed)
+    assets = rng.choice(portfolio.ASSETS, n_positions)
+    quantity = np.where(rng.random(n_positions) < 0.3, rng.uniform(1, 50, n_positions), np.nan)
+    return pd.DataFrame({
+        "account": pd.Series(rng.integers(0, n_accounts, n_positions)).map("TK{:02d}".format),
+        "asset": assets,
+        "quantity": quantity,
+        "amount": np.where(np.isnan(quantity), rng.uniform(1e7, 1e9, n_positions).round(-3), np.nan),
+        # Có cả ngày nghỉ (lịch ngày thường) và ngày trước phiên đầu
+        "entry_date": pd.Timestamp("2021-12-01") + pd.to_timedelta(rng.integers(0, 560, n_positions), unit="D"),
+        "entry_price": np.where(rng.random(n_positions) < 0.2, rng.uniform(1000, 2000, n_positions), np.nan),
+        "rate": np.where(assets == portfolio.DEPOSIT, rng.uniform(4, 9, n_positions).round(1), np.nan),
+    })
+
+
+def reference(closes, positions, currency="VND"):
+    # Định giá từng vị thế một bằng vòng lặp, tính lại từ bảng giá gốc
+    prices = closes[["GC=F", "^GSPC", "VND=X"]].ffill().dropna()
+    fx = prices["VND=X"].to_numpy()
+    unit_vnd = {"gold": prices["GC=F"].to_numpy() * fx, "sp500": prices["^GSPC"].to_numpy() * fx, "fx": fx}
+    days = (prices.index - prices.index[0]).days.to_numpy(dtype=float)
+    values, costs = {}, {}
+    positions = positions.reindex(columns=portfolio.POSITION_COLUMNS).astype(
+        {"quantity": float, "amount": float, "entry_price": float, "rate": float})
+    for row in positions.itertuples(index=False):
+        entry_date = prices.index[0] if pd.isna(row.entry_date) else pd.Timestamp(row.entry_date)
+        entry = prices.index.searchsorted(entry_date)
+        if entry == len(prices):
+            continue
+        if row.asset == "vnd_deposit":
+            quantity = row.quantity if not np.isnan(row.quantity) else row.amount
+            series = quantity * (1 + row.rate / 100 * (days - days[entry]) / 365)
+            cost = quantity
+        else:
+            unit = unit_vnd[row.asset]
+            quantity = row.quantity if not np.isnan(row.quantity) else row.amount / unit[entry]
+            series = quantity * unit
+            if np.isnan(row.entry_price):
+                cost = quantity * unit[entry]
+            else:
+                cost = quantity * row.entry_price * (fx[entry] if row.asset != "fx" else 1.0)
+        series = np.where(np.arange(len(prices)) >= entry, series, 0.0)
+        cost_series = np.where(np.arange(len(prices)) >= entry, cost, 0.0)
+        if currency == "USD":
+            series = series / fx
+            cost_series = cost_series / fx[entry]
+        values[row.account] = values.get(row.account, 0.0) + series
+        costs[row.account] = costs.get(row.account, 0.0) + cost_series
+    return pd.DataFrame(values, index=prices.index), pd.DataFrame(costs, index=prices.index)
+
+
+@pytest.fixture(scope="module")
+def closes():
+    return make_closes()
+
+
+@pytest.fixture(scope="module")
+def engine(closes):
+    return portfolio.PortfolioEngine(closes)
+
+
+@pytest.mark.parametrize("currency", portfolio.CURRENCIES)
+def test_matches_per_position_loop(closes, engine, currency):
+    positions = random_positions(engine.index)
+    result = engine.value(positions, currency)
+    value, cost = reference(closes, positions, currency)
+    value, cost = value.loc[result.index, result.accounts], cost.loc[result.index, result.accounts]
+
+    scale = value.abs().max().max()
+    assert_allclose(result.value, value, rtol=1e-10, atol=scale * 1e-12)
+    assert_allclose(result.cost, cost, rtol=1e-10, atol=scale * 1e-12)
+    assert_allclose(result.final_cost, cost.iloc[-1], rtol=1e-10)
+    assert_allclose(result.total["value"], value.sum(axis=1), rtol=1e-10)
+    assert_allclose(result.total["pnl"], (value - cost).sum(axis=1), rtol=1e-9, atol=scale * 1e-12)
+    assert_allclose(result.positions.groupby("account")["value"].sum()[result.accounts], value.iloc[-1], rtol=1e-10)
+
+
+def test_deposit_accrues_simple_interest_on_calendar_days(engine):
+    entry = engine.index[10]
+    positions = pd.DataFrame({"account": ["TK"], "asset": ["vnd_deposit"], "amount": [100e6],
+                              "entry_date": [entry], "rate": [7.3]})
+    result = engine.value(positions)
+    value = result.value["TK"]
+    elapsed = (value.index - entry).days.to_numpy()
+    assert_allclose(value, 100e6 * (1 + 0.073 * elapsed / 365), rtol=1e-12)
+    one_year = value.index.searchsorted(entry + pd.Timedelta(days=365))
+    assert (value.index[one_year] - entry).days == 365
+    assert value.iloc[one_year] == pytest.approx(107.3e6, rel=1e-12)
+    assert result.final_cost["TK"] == 100e6
+    # Tiền gửi không có giá thị trường: không bao giờ sụt giảm
+    assert (result.drawdown["TK"] == 0).all()
+
+
+def test_entry_before_first_price_and_on_non_trading_days(closes, engine):
+    saturday = engine.index[20] + pd.offsets.Week(weekday=5)
+    positions = pd.DataFrame({
+        "account": ["early", "weekend", "blank"],
+        "asset": ["gold", "sp500", "fx"],
+        "amount": [1e9, 1e9, 1e9],
+        "entry_date": [pd.Timestamp("1999-01-01"), saturday, None],
+    })
+    result = engine.value(positions)
+    # Trước phiên đầu (hoặc bỏ trống): vào ở phiên đầu tiên có giá; ngày nghỉ: vào ở phiên kế tiếp
+    assert result.index[0] == engine.index[0]
+    first_weekend = result.value.index[result.value["weekend"] > 0][0]
+    assert first_weekend == engine.index[engine.index.searchsorted(saturday)]
+    assert first_weekend.weekday() == 0
+    for account in ("early", "blank", "weekend"):
+        first = result.value[account][result.value[account] > 0]
+        assert first.iloc[0] == pytest.approx(1e9, rel=1e-12)
+    value, _ = reference(closes, positions)
+    assert_allclose(result.value, value[result.accounts], rtol=1e-10)
+
+
+def test_usd_report_divides_by_session_fx(engine):
+    positions = random_positions(engine.index, n_positions=60, n_accounts=5, seed=1)
+    vnd, usd = engine.value(positions), engine.value(positions, "USD")
+    fx = pd.Series(engine.fx, index=engine.index).loc[vnd.index]
+    assert_allclose(usd.value, vnd.value.div(fx, axis=0), rtol=1e-12)
+    # Giá vốn quy đổi theo tỷ giá ngày vào, không theo tỷ giá từng phiên
+    entry_fx = engine.fx[engine.index.searchsorted(usd.positions["entry_date"].fillna(engine.index[0]))]
+    assert_allclose(usd.positions["cost"], vnd.positions["cost"] / entry_fx, rtol=1e-12)
+
+    dollars = pd.DataFrame({"account": ["USD"], "asset": ["fx"], "quantity": [5000.0],
+                            "entry_date": [engine.index[5]], "entry_price": [20000.0]})
+    held = engine.value(dollars, "USD")
+    assert_allclose(held.value["USD"], 5000.0)
+    assert (held.returns["USD"] == 0).all()
+    assert held.final_cost["USD"] == pytest.approx(5000 * 20000 / engine.fx[5])
+    with pytest.raises(ValueError):
+        engine.value(dollars, "EUR")
+
+
+def test_single_position_account_tracks_its_price(engine):
+    positions = pd.DataFrame({"account": ["Vàng"], "asset": ["gold"], "quantity": [2.0],
+                              "entry_date": [engine.index[50]], "entry_price": [1500.0]})
+    result = engine.value(positions)
+    unit = engine.unit_vnd["gold"][50:]
+    assert list(result.accounts) == ["Vàng"]
+    assert_allclose(result.value["Vàng"], 2.0 * unit, rtol=1e-12)
+    assert_allclose(result.returns["Vàng"].iloc[1:], unit[1:] / unit[:-1] - 1, rtol=1e-9, atol=1e-15)
+    assert_allclose(result.drawdown["Vàng"], unit / np.maximum.accumulate(unit) - 1, atol=1e-12)
+    assert result.final_cost["Vàng"] == pytest.approx(2.0 * 1500.0 * engine.fx[50])
+    assert_allclose(result.total["value"], result.value["Vàng"])
+    summary = result.summary()
+    assert summary.loc["Vàng", "Số vị thế"] == 1
+    assert summary.loc["Vàng", "Lời / Lỗ"] == pytest.approx(2.0 * unit[-1] - 2.0 * 1500.0 * engine.fx[50])
@@ -0,0 +1,153 @@
+import threading
+import time
+
+import pytest
+
+from macro_bot.data import refresher
+
+TTL = 3600
+
+
+class FakeClock:
+    def __init__(self, now=1_000_000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+    def advance(self, seconds):
+        self.now += seconds
+
+
+class FakeCache:
+    # Cùng cách trả về của SharedCache.fetch_entry, theo đồng hồ giả: làm mới lỗi thì phục vụ bản cũ kèm lỗi
+    def __init__(self, clock):
+        self.clock = clock
+        self.entries = {}
+
+    def fetch_entry(self, key, compute, ttl):
+        entry = self.entries.get(key)
+        if entry is not None and self.clock() - entry[1] < ttl:
+            return entry[0], entry[1], None
+        try:
+            value = compute()
+        except Exception as error:
+            if entry is None:
+                raise
+            return entry[0], entry[1], f"{type(error).__name__}: {error}"
+        self.entries[key] = (value, self.clock())
+        return value, self.clock(), None
+
+
+class ManualRefresher(refresher.BackgroundRefresher):
+    # Không chạy luồng nền: kiểm thử tự gọi run_due() theo đồng hồ giả
+    def start(self):
+        pass
+
+
+class StubFetch:
+    def __init__(self):
+        self.calls = 0
+        self.fail = None
+        self.gate = None
+
+    def __call__(self):
+        self.calls += 1
+        if self.gate is not None:
+            self.gate.wait(timeout=10)
+        if self.fail:
+            raise ConnectionError(self.fail)
+        return f"v{self.calls}"
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def setup(clock):
+    fetch = StubFetch()
+    data_refresher = ManualRefresher(cache=FakeCache(clock), clock=clock)
+    data_refresher.register("prices", fetch, ttl=TTL)
+    assert data_refresher.run_due() == ["prices"]
+    return data_refresher, fetch
+
+
+def test_jobs_rescheduled_at_80_percent_of_ttl(setup, clock):
+    data_refresher, fetch = setup
+    loaded_at = clock()
+    assert data_refresher.status()["prices"]["next_refresh"] == loaded_at + TTL * refresher.REFRESH_AHEAD
+
+    clock.advance(TTL * refresher.REFRESH_AHEAD - 1)
+    assert data_refresher.run_due() == []
+    clock.advance(1)
+    assert data_refresher.run_due() == ["prices"]
+    assert fetch.calls == 2
+    assert data_refresher.read("prices").value == "v2"
+    assert data_refresher.status()["prices"]["next_refresh"] == clock() + TTL * refresher.REFRESH_AHEAD
+
+
+def test_failed_refresh_keeps_old_value_and_reports_age_and_error(setup, clock):
+    data_refresher, fetch = setup
+    clock.advance(TTL * refresher.REFRESH_AHEAD)
+    fetch.fail = "mất mạng"
+    data_refresher.run_due()
+
+    snapshot = data_refresher.read("prices")
+    assert snapshot.value == "v1"
+    assert snapshot.error == "ConnectionError: mất mạng"
+    status = data_refresher.status()["prices"]
+    assert status == {"age": TTL * refresher.REFRESH_AHEAD, "error": "ConnectionError: mất mạng", "failures": 1,
+                      "next_refresh": clock() + refresher.RETRY_BASE}
+
+    # Làm mới thành công lại thì xóa lỗi và bộ đếm lỗi
+    clock.advance(refresher.RETRY_BASE)
+    fetch.fail = None
+    data_refresher.run_due()
+    assert data_refresher.status()["prices"]["age"] == 0
+    assert (data_refresher.read("prices").value, data_refresher.read("prices").error) == ("v3", None)
+    assert data_refresher.status()["prices"]["failures"] == 0
+
+
+def test_retry_backoff_doubles_until_ttl(clock):
+    ttl = 600
+    fetch = StubFetch()
+    data_refresher = ManualRefresher(cache=FakeCache(clock), clock=clock)
+    data_refresher.register("rates", fetch, ttl=ttl)
+    data_refresher.run_due()
+    clock.advance(ttl * refresher.REFRESH_AHEAD)
+    fetch.fail = "503"
+
+    delays = []
+    for failures in range(1, 7):
+        assert data_refresher.run_due() == ["rates"]
+        status = data_refresher.status()["rates"]
+        assert status["failures"] == failures
+        delays.append(status["next_refresh"] - clock())
+        clock.advance(delays[-1])
+    assert delays == [min(refresher.RETRY_BASE * 2 ** (failures - 1), ttl) for failures in range(1, 7)]
+    assert delays == [30, 60, 120, 240, 480, 600]
+    assert data_refresher.read("rates").value == "v1"
+
+
+def test_read_returns_last_snapshot_without_waiting_for_refresh(setup, clock):
+    data_refresher, fetch = setup
+    clock.advance(TTL)
+    fetch.gate = threading.Event()
+    worker = threading.Thread(target=data_refresher.run_due)
+    worker.start()
+    while fetch.calls < 2:
+        time.sleep(0.001)
+
+    # Lần làm mới đang treo: trang vẫn đọc ngay bản chụp cũ
+    started = time.perf_counter()
+    snapshot = data_refresher.read("prices", timeout=5)
+    assert time.perf_counter() - started < 0.01
+    assert snapshot.value == "v1" and snapshot.error is None
+    assert data_refresher.run_due() == []
+
+    fetch.gate.set()
+    worker.join(timeout=5)
+    assert data_refresher.read("prices").value == "v2"
+    assert fetch.calls == 2
@@ -0,0 +1,99 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from macro_bot.compute import regimes
+
+EPS = 1e-9
+
+
+# Bản sao cố định các nhánh nhận định của bản gốc (Gold&DXY Correlation.py, app.py, vietnam_macro_analysis.py),
+# quy về mã chế độ; không sửa theo bộ luật mới
+def baseline_rsi(rsi_val):
+    if rsi_val > 70: return regimes.EXTREME
+    elif rsi_val < 30: return regimes.REVERSAL
+    else: return regimes.NEUTRAL
+
+
+def baseline_ma200_safe(dist):
+    return abs(dist) < 12
+
+
+def baseline_correlation(curr_corr):
+    if curr_corr < -0.5: return regimes.REVERSAL
+    elif curr_corr > 0.5: return regimes.EXTREME
+    else: return regimes.NEUTRAL
+
+
+def baseline_real_ir(real_ir):
+    if real_ir < 0: return regimes.EXTREME
+    elif real_ir > 4: return regimes.REVERSAL
+    else: return regimes.NEUTRAL
+
+
+def baseline_vn(spread, fx_change, opportunity):
+    return (regimes.EXTREME if spread > 2 else regimes.NEUTRAL,
+            regimes.EXTREME if fx_change > 3 else regimes.NEUTRAL,
+            regimes.REVERSAL if opportunity else regimes.NEUTRAL)
+
+
+def around(*thresholds):
+    return [t + d for t in thresholds for d in (-1, -EPS, 0, EPS, 1)]
+
+
+def timeline_codes(rules, frame):
+    # Mã chế độ từng phiên của dòng thời gian (đường ma trận), để so cùng đường classify() từng giá trị
+    timeline = regimes.RegimeTimeline(frame, rules)
+    return {rule.name: timeline.codes[:, j] for j, rule in enumerate(timeline.rules)}
+
+
+def gold_frame(rsi, dist, corr):
+    index = pd.bdate_range("2024-01-01", periods=len(rsi))
+    return pd.DataFrame({"rsi": rsi, "ma200_dev": dist, "correlation": corr, "Gold": 2000.0}, index=index)
+
+
+@pytest.mark.parametrize("dist", around(-12, 12) + [0.0])
+def test_ma200_boundary_is_a_warning_like_the_baseline(dist):
+    rule = regimes.GOLD_RULES[1]
+    assert (rule.classify(dist) == regimes.NEUTRAL) == baseline_ma200_safe(dist)
+
+
+def test_ma200_exactly_at_band_is_extreme_or_reversal():
+    rule = regimes.GOLD_RULES[1]
+    assert rule.classify(12) == regimes.EXTREME
+    assert rule.classify(-12) == regimes.EXTREME
+    assert rule.classify(12 - EPS) == rule.classify(-12 + EPS) == regimes.NEUTRAL
+
+
+def test_gold_timeline_matches_baseline_at_boundaries():
+    rsi = around(30, 70)
+    dist = around(-12, 12)
+    corr = around(-0.5, 0.5)
+    codes = timeline_codes(regimes.GOLD_RULES, gold_frame(rsi, dist, corr))
+    assert list(codes["rsi"]) == [baseline_rsi(v) for v in rsi]
+    assert list(codes["ma200_dev"] == regimes.NEUTRAL) == [baseline_ma200_safe(v) for v in dist]
+    assert list(codes["correlation"]) == [baseline_correlation(v) for v in corr]
+    # Từng giá trị đơn lẻ cho cùng kết quả với dòng thời gian
+    for rule, values in zip(regimes.GOLD_RULES, (rsi, dist, corr)):
+        assert [rule.classify(v) for v in values] == list(codes[rule.name])
+
+
+def test_missing_values_are_neutral():
+    codes = timeline_codes(regimes.GOLD_RULES, gold_frame([np.nan] * 3, [np.nan] * 3, [np.nan] * 3))
+    assert all((code == regimes.NEUTRAL).all() for code in codes.values())
+
+
+@pytest.mark.parametrize("real_ir", around(0, 4))
+def test_real_ir_boundaries_match_baseline(real_ir):
+    assert regimes.REAL_IR_RULE.classify(real_ir) == baseline_real_ir(real_ir)
+
+
+def test_vn_rules_match_baseline_at_boundaries():
+    spread = around(2)
+    fx_change = around(3)
+    opportunity = [0.0, 1.0, 0.0, 1.0, 1.0]
+    frame = pd.DataFrame({"Credit_Spread": spread, "FX_Change_12M": fx_change, "M2_Opportunity": opportunity,
+                          "VNIndex": 1000.0}, index=pd.date_range("2024-01-31", periods=5, freq="ME"))
+    codes = timeline_codes(regimes.VN_RULES, frame)
+    got = list(zip(codes["credit_spread"], codes["fx_change"], codes["m2_opportunity"]))
+    assert got == [baseline_vn(*values) for values in zip(spread, fx_change, opportunity)]
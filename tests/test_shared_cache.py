@@ -0,0 +1,119 @@
+import multiprocessing
+import os
+import time
+
+import pytest
+
+from macro_bot.data import shared_cache
+
+KEYS = ["prices:GC=F", "prices:^GSPC", "fred:DGS10"]
+WORKERS = 6
+# Thời gian giả lập một lần tải (yfinance/FRED), đủ dài để các worker chen nhau
+COMPUTE_SECONDS = 0.3
+
+
+@pytest.fixture(params=["sqlite", "memory"])
+def backend(request, tmp_path):
+    if request.param == "memory":
+        return shared_cache.MemoryBackend()
+    return shared_cache.SQLiteBackend(str(tmp_path / "cache.sqlite3"))
+
+
+def make_cache(backend):
+    return shared_cache.SharedCache(backend, lease=30, wait_timeout=10, poll_interval=0.01)
+
+
+def _worker(path, log_dir, barrier, results):
+    cache = make_cache(shared_cache.SQLiteBackend(path))
+
+    def compute(key):
+        # Ghi lại mỗi lần tính thật sự: một file riêng cho mỗi lần, không phụ thuộc bộ đếm của cache
+        with open(os.path.join(log_dir, f"{key.replace(':', '_')}.{os.getpid()}.{time.time_ns()}"), "w"):
+            pass
+        time.sleep(COMPUTE_SECONDS)
+        return f"{key}-value"
+
+    barrier.wait()
+    for key in KEYS:
+        results.put((key, cache.get_or_refresh(key, lambda: compute(key), ttl=60)))
+
+
+def test_processes_on_one_sqlite_file_compute_each_key_once(tmp_path):
+    path = str(tmp_path / "cache.sqlite3")
+    log_dir = tmp_path / "computes"
+    log_dir.mkdir()
+    shared_cache.SQLiteBackend(path)
+    ctx = multiprocessing.get_context("fork")
+    barrier = ctx.Barrier(WORKERS)
+    results = ctx.Queue()
+    procs = [ctx.Process(target=_worker, args=(path, str(log_dir), barrier, results)) for _ in range(WORKERS)]
+    for proc in procs:
+        proc.start()
+    values = [results.get(timeout=60) for _ in range(WORKERS * len(KEYS))]
+    for proc in procs:
+        proc.join(timeout=60)
+        assert proc.exitcode == 0
+
+    computes = [name.split(".")[0] for name in os.listdir(log_dir)]
+    assert sorted(computes) == sorted(key.replace(":", "_") for key in KEYS)
+    assert all(value == f"{key}-value" for key, value in values)
+    counters = shared_cache.SQLiteBackend(path).counters()
+    assert counters["refreshes"] == len(KEYS)
+    assert counters["hits"] + counters["misses"] == WORKERS * len(KEYS)
+
+
+def test_refresh_rechecks_after_taking_the_lock(backend):
+    # Worker B đọc bản cũ; trước khi B lấy được khóa, worker A đã làm mới xong và trả khóa
+    key = "prices:GC=F"
+    worker_a, worker_b = make_cache(backend), make_cache(backend)
+    backend.set(key, "old")
+    calls = []
+    try_lock = backend.try_lock
+
+    def racing_try_lock(k, owner, lease):
+        if owner == worker_b.owner and not calls:
+            worker_a.get_or_refresh(k, lambda: calls.append("a") or "new", ttl=0.5)
+        return try_lock(k, owner, lease)
+
+    backend.try_lock = racing_try_lock
+    time.sleep(0.6)
+    value, _, error = worker_b.fetch_entry(key, lambda: calls.append("b") or "newer", ttl=0.5)
+    assert value == "new" and error is None
+    assert calls == ["a"]
+    assert backend.counters()["refreshes"] == 1
+
+
+def test_stale_entry_served_while_lock_is_held(backend):
+    key = "fred:DGS10"
+    cache = make_cache(backend)
+    backend.set(key, "old")
+    updated_at = backend.get(key)[1]
+    # Một worker khác đang giữ khóa làm mới
+    assert backend.try_lock(key, "other-worker", lease=30)
+
+    started = time.perf_counter()
+    value, stamp, error = cache.fetch_entry(key, lambda: pytest.fail("không được tính khi đang bị khóa"), ttl=0)
+    assert time.perf_counter() - started < cache.poll_interval * 5
+    assert (value, stamp, error) == ("old", updated_at, None)
+    assert cache.stats()["local"] == {**dict.fromkeys(shared_cache.COUNTERS, 0), "misses": 1, "stale": 1}
+
+
+def test_counters_track_hits_misses_refreshes_and_stale(backend):
+    key = "prices:^GSPC"
+    cache = make_cache(backend)
+
+    assert cache.get_or_refresh(key, lambda: 1, ttl=60) == 1
+    assert cache.get_or_refresh(key, lambda: 2, ttl=60) == 1
+    assert cache.get_or_refresh(key, lambda: 3, ttl=0) == 3
+
+    def broken():
+        raise ConnectionError("mất mạng")
+
+    value, _, error = cache.fetch_entry(key, broken, ttl=0)
+    assert value == 3 and error == "ConnectionError: mất mạng"
+    with pytest.raises(ConnectionError):
+        cache.fetch_entry("missing", broken, ttl=60)
+
+    expected = {"hits": 1, "misses": 4, "refreshes": 2, "stale": 1, "waits": 0, "errors": 2}
+    assert cache.stats() == {"local": expected, "shared": expected}
+    assert cache.summary() == "hits: 1 · misses: 4 · refreshes: 2 · stale: 1"
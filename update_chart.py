@@ -0,0 +1,5 @@
+from macro_bot.build import main
+
+# Giữ lệnh cũ cho GitHub Actions; tương đương python -m macro_bot.build
+if __name__ == "__main__":
+    main()